@@ -37,9 +37,12 @@ __all__ = [
     "KstNT_type_sig",
     "Kst_spec",
     "CO2Class",
+    "SeasonForcingsClass",
     "spec",
     "SoilProfileNT",
-    "SoilProfileNT_typ_sig"
+    "SoilProfileNT_typ_sig",
+    "SOIL_DEPTH_RES",
+    "LOOP_COUNTERS",
 ]
 
 # Cell
@@ -87,6 +90,8 @@ class ClockStructClass:
 
     `SeasonCounter` : `int`: counter to keep track of which season we are currenlty simulating
 
+    `CountLoops` : `bool`: record iterations of data-dependent loops in `Outputs.Loops` (see `LOOP_COUNTERS`)
+
 
         """
 
@@ -107,6 +112,7 @@ class ClockStructClass:
         self.HarvestDates = []  # list of crop planting dates during simulation
         self.nSeasons = 0  # total number of seasons (plant and harvest)
         self.SeasonCounter = -1  # running counter of seasons
+        self.CountLoops = False  # record loop iteration counts in outputs
 
 
 # Cell
@@ -124,6 +130,10 @@ class OutputClass:
 
     `Final` : `pandas.DataFrame` : final stats
 
+    `Loops` : `pandas.DataFrame` : iterations of data-dependent loops on each simulated day (if `ClockStruct.CountLoops`)
+
+    `SeasonLoops` : `pandas.DataFrame` : iterations of data-dependent loops per season (if `ClockStruct.CountLoops`)
+
     """
 
     def __init__(self):
@@ -132,6 +142,8 @@ class OutputClass:
         self.Flux = []
         self.Growth = []
         self.Final = []
+        self.Loops = []
+        self.SeasonLoops = []
 
 
 # Cell
@@ -156,14 +168,22 @@ class ParamStructClass:
 
     `CO2` : `CO2Class` : object containing reference and current co2 concentration
 
+    `SeasonalCO2conc` : `np.array` : CO2 concentration at the start of each season
+
+    `SeasonalfCO2` : `np.array` : CO2 adjustment to water productivity for each season
+
     `WaterTable` : `int` : Water table present (1=yes, 0=no)
 
-    `zGW` : `np.array` : WaterTable depth (mm) for each day of simulation
+    `zGW` : `np.array` : WaterTable depth (m) from each of `zGW_steps` onwards (see `groundwater_depth`); a single value if constant
+
+    `zGW_steps` : `np.array` : Time steps (increasing) at which each zGW value starts
 
     `zGW_dates` : `np.array` : Corresponding dates to the zGW values
 
     `WTMethod` : `str` : 'Constant' or 'Variable'
 
+    `zGW_adjustments` : `dict` : Adjusted field capacity and first compartment below the water table, keyed by water table depth
+
     `CropList` : `list` : List of Crop Objects which contain paramaters for all the differnet crops used in simulations
 
     `python_crop_list` : `list` : List of Crop Objects, one for each season
@@ -178,6 +198,10 @@ class ParamStructClass:
 
     `Fallow_Crop_Name` : `str` : name of fallow crop
 
+    `GDD` : `dict` : Daily growing degree days over the simulation keyed by (Tbase, Tupp, GDDmethod)
+
+    `SeasonForcings` : `SeasonForcingsClass` : Weather-derived daily forcings for the current season
+
         """
 
     def __init__(self):
@@ -196,12 +220,16 @@ class ParamStructClass:
         # calculated Co2 variables
         self.CO2data = []
         self.CO2 = 0
+        self.SeasonalCO2conc = []
+        self.SeasonalfCO2 = []
 
         # water table
         self.WaterTable = 0
         self.zGW = []
+        self.zGW_steps = []
         self.zGW_dates = []
         self.WTMethod = ""
+        self.zGW_adjustments = {}
 
         # crops
         self.CropList = []
@@ -212,6 +240,12 @@ class ParamStructClass:
         self.Fallow_Crop = 0
         self.Fallow_Crop_Name = ""
 
+        # daily GDD series, computed once per crop temperature parameters
+        self.GDD = {}
+
+        # weather-derived forcings for the current season
+        self.SeasonForcings = SeasonForcingsClass()
+
 
 # Cell
 class SoilClass:
@@ -1272,7 +1306,8 @@ spec = [
     ("MaxIrrSeason", float64),
     ("SMT", float64[:]),
     ("IrrInterval", int64),
-    ("Schedule", float64[:]),
+    ("ScheduleDays", int64[:]),
+    ("ScheduleDepths", float64[:]),
     ("NetIrrSMT", float64),
     ("depth", float64),
 ]
@@ -1282,11 +1317,16 @@ spec = [
 class IrrMngtStruct:
 
     """
+    Irrigation management paramaters used in the simulation. A pre-defined
+    schedule (`IrrMethod` 3) is stored as irrigation events:
+
+    `ScheduleDays` : `np.array` : time steps of scheduled irrigation events (increasing)
 
+    `ScheduleDepths` : `np.array` : depth (mm) of each scheduled event
 
     """
 
-    def __init__(self, sim_len):
+    def __init__(self):
         self.IrrMethod = 0
 
         self.WetSurf = 100.0
@@ -1295,7 +1335,8 @@ class IrrMngtStruct:
         self.MaxIrrSeason = 10_000
         self.SMT = np.zeros(4)
         self.IrrInterval = 0
-        self.Schedule = np.zeros(sim_len)
+        self.ScheduleDays = np.zeros(0, dtype=np.int64)
+        self.ScheduleDepths = np.zeros(0)
         self.NetIrrSMT = 80.0
         self.depth = 0.0
 
@@ -1746,6 +1787,12 @@ InitCond_spec = [
     ("Tmin", float64),
     ("Et0", float64),
     ("GDD", float64),
+    ("Kst_PolH", float64),
+    ("Kst_PolC", float64),
+    ("p_up_Et0", float64[:]),
+    ("p_lo_Et0", float64[:]),
+    ("LoopCounts", int64[:]),
+    ("RootZone", types.optional(types.UniTuple(float64, 11))),
     ("Wsurf", float64),
     ("EvapZ", float64),
     ("Wstage2", float64),
@@ -1753,6 +1800,20 @@ InitCond_spec = [
     ("TAW", float64),
 ]
 
+# data-dependent loops of the daily calculation counted in
+# `InitCond.LoopCounts`, reset every day (compiled kernels index the counters
+# by position and always count; `ClockStruct.CountLoops` only saves them):
+# 1 mm expansion steps of the soil evaporation layer, excess redistribution
+# steps in drainage and infiltration, and compartments visited by the
+# capillary rise and transpiration extraction loops
+LOOP_COUNTERS = [
+    "EvapLayerExpansion",
+    "DrainageExcess",
+    "InfiltrationExcess",
+    "CapillaryRise",
+    "TrExtraction",
+]
+
 
 #@jitclass(spec)
 class InitCondClass:
@@ -1852,6 +1913,19 @@ class InitCondClass:
         self.Et0 = 0
         self.GDD = 0
 
+        # weather-derived stress parameters on current day (see SeasonForcingsClass)
+        self.Kst_PolH = 1.0
+        self.Kst_PolC = 1.0
+        self.p_up_Et0 = np.zeros(4)
+        self.p_lo_Et0 = np.zeros(4)
+
+        # iterations of data-dependent loops (see LOOP_COUNTERS)
+        self.LoopCounts = np.zeros(len(LOOP_COUNTERS), dtype=np.int64)
+
+        # root zone water of the current day, shared by the stages that read
+        # it (see root_zone_summary); None when th changed since it was computed
+        self.RootZone = None
+
         self.Wsurf = 0
         self.EvapZ = 0
         self.Wstage2 = 0
@@ -1929,8 +2003,18 @@ SoilProfileNT_spec = [
     ("th_fc_Adj", float64[:]),
     ("aCR", float64[:]),
     ("bCR", float64[:]),
+    ("zIdx", int64[:]),
+    ("Wsat_cum", float64[:]),
+    ("Wfc_cum", float64[:]),
+    ("Wwp_cum", float64[:]),
+    ("Wdry_cum", float64[:]),
+    ("dthdt_sat", float64[:]),
+    ("dthdt_den", float64[:]),
 ]
 
+# spacing (m) of the depth grid used to look up soil compartments
+SOIL_DEPTH_RES = 0.001
+
 
 #@jitclass(spec)
 class SoilProfileClass:
@@ -1952,6 +2036,20 @@ class SoilProfileClass:
 
     `zMid` : `list` :
 
+    `zIdx` : `list` : number of compartments ending above each depth of a `SOIL_DEPTH_RES` grid
+
+    `Wsat_cum` : `list` : water storage (mm) at saturation from the surface to the bottom of each compartment
+
+    `Wfc_cum` : `list` : water storage (mm) at field capacity from the surface to the bottom of each compartment
+
+    `Wwp_cum` : `list` : water storage (mm) at wilting point from the surface to the bottom of each compartment
+
+    `Wdry_cum` : `list` : water storage (mm) at air dry from the surface to the bottom of each compartment
+
+    `dthdt_sat` : `list` : drainage ability at saturation, `tau * (th_s - th_fc)`
+
+    `dthdt_den` : `list` : denominator of the drainage ability curve, `exp(th_s - th_fc) - 1`
+
     """
 
     def __init__(self, length):
@@ -1973,6 +2071,13 @@ class SoilProfileClass:
         self.th_fc_Adj = np.zeros(length, dtype=np.float64)
         self.aCR = np.zeros(length, dtype=np.float64)
         self.bCR = np.zeros(length, dtype=np.float64)
+        self.zIdx = np.zeros(1, dtype=np.int64)
+        self.Wsat_cum = np.zeros(length, dtype=np.float64)
+        self.Wfc_cum = np.zeros(length, dtype=np.float64)
+        self.Wwp_cum = np.zeros(length, dtype=np.float64)
+        self.Wdry_cum = np.zeros(length, dtype=np.float64)
+        self.dthdt_sat = np.zeros(length, dtype=np.float64)
+        self.dthdt_den = np.zeros(length, dtype=np.float64)
 
 
 SoilProfileNT = typing.NamedTuple("SoilProfileNT", SoilProfileNT_spec)
@@ -2193,3 +2298,57 @@ class CO2Class(object):
         self.RefConc = 369.41
         self.CurrentConc = 0.0
 
+
+# Cell
+class SeasonForcingsClass(object):
+
+    """
+    Daily crop forcings and reference growth curves that depend only on
+    weather and crop paramaters, computed once at the start of a growing season
+
+    **Attributes:**\n
+
+
+    `Start` : `int` : time-step counter of the planting day (row 0 of the arrays)
+
+    `GDD` : `np.array` : growing degree days on each day of the season
+
+    `Kst_PolH` : `np.array` : heat stress coefficient for pollination on each day
+
+    `Kst_PolC` : `np.array` : cold stress coefficient for pollination on each day
+
+    `p_up` : `np.array` : upper water stress thresholds (days x 4), adjusted for Et0 if `Crop.ETadj` is 1
+
+    `p_lo` : `np.array` : lower water stress thresholds (days x 4), adjusted for Et0 if `Crop.ETadj` is 1
+
+    `tCC` : `np.array` : canopy development time (days or GDD's) at the end of each day, for germination on the planting day
+
+    `dtCC` : `np.array` : canopy development time step (days or GDD's) of each day
+
+    `CC_NS` : `np.array` : non-stressed canopy cover at the end of each day
+
+    `CCxAct_NS` : `np.array` : non-stressed actual maximum canopy cover at the end of each day
+
+    `CCxW_NS` : `np.array` : non-stressed maximum canopy cover reached at the end of each day
+
+    `HIref` : `np.array` : reference harvest index by days of build-up
+
+    `PctLagPhase` : `np.array` : percentage of lag phase completed by days of build-up
+
+    """
+
+    def __init__(self):
+        self.Start = 0
+        self.GDD = np.zeros(0)
+        self.Kst_PolH = np.ones(0)
+        self.Kst_PolC = np.ones(0)
+        self.p_up = np.zeros((0, 4))
+        self.p_lo = np.zeros((0, 4))
+        self.tCC = np.zeros(0)
+        self.dtCC = np.zeros(0)
+        self.CC_NS = np.zeros(0)
+        self.CCxAct_NS = np.zeros(0)
+        self.CCxW_NS = np.zeros(0)
+        self.HIref = np.zeros(0)
+        self.PctLagPhase = np.zeros(0)
+
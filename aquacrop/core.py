@@ -11,6 +11,8 @@ import sys
 from .initialize import *
 from .timestep import *
 from .classes import *
+from .weather import *
+from .profiling import KernelRecorder, StageProfiler, model_memory
 from aquacrop import data
 
 # Cell
@@ -44,7 +46,7 @@ def get_data(filename, **kwargs):
 
 
 # Cell
-def prepare_weather(weatherFilePath):
+def prepare_weather(weatherFilePath, cache=False, cache_dir=None):
     """
     function to read in weather data and return a dataframe containing
     the weather data
@@ -55,6 +57,11 @@ def prepare_weather(weatherFilePath):
 
     `weatherFilePath` : `str` :  file location of weather data
 
+    `cache` : `bool` :  store a binary `.npy` sidecar of the parsed file and
+    memory-map it on subsequent reads (see `load_weather_array`)
+
+    `cache_dir` : `str` :  directory for the sidecar (default: next to the weather file)
+
 
 
     *Returns:*
@@ -63,27 +70,39 @@ def prepare_weather(weatherFilePath):
 
     """
 
-    weather_df = pd.read_csv(weatherFilePath, header=0, delim_whitespace=True)
+    weather = load_weather_array(weatherFilePath, cache=cache, cache_dir=cache_dir)
 
-    assert len(weather_df.columns) == 7
+    return weather_array_to_df(weather)
 
-    # rename the columns
-    weather_df.columns = str("Day Month Year MinTemp MaxTemp Precipitation ReferenceET").split()
 
-    # put the weather dates into datetime format
-    weather_df["Date"] = pd.to_datetime(weather_df[["Year", "Month", "Day"]])
+# Cell
+class AquaCropModel:
+    """
+    AquaCrop-OS simulation of one field
 
-    # drop the day month year columns
-    weather_df = weather_df.drop(["Day", "Month", "Year"], axis=1)
+    *Arguments:*\n
 
-    # set limit on ET0 to avoid divide by zero errors
-    weather_df.ReferenceET.clip(lower=0.1, inplace=True)
+    `SimStartTime`, `SimEndTime` : `str` : simulation period (YYYY/MM/DD)
 
-    return weather_df
+    `wdf` : `pandas.DataFrame` or `StationWeather` : weather data
 
+    `Soil` : `SoilClass` : soil
+
+    `Crop` : `CropClass` : crop
+
+    `InitWC` : `InitWCClass` : initial water content
+
+    `IrrMngt`, `FieldMngt`, `FallowFieldMngt`, `Groundwater` : management and groundwater (default: none)
+
+    `planting_dates`, `harvest_dates` : `list` : dates of each season (default: from `Crop`)
+
+    `CO2conc` : `float`, `str`, `dict` or `pandas.Series` : CO2 concentration (ppm);
+    `None` for the bundled Mauna Loa record, a number for a constant
+    concentration, or a trajectory: a file in the format of `MaunaLoaCO2.txt`
+    (e.g. an RCP curve) or a mapping of year to ppm (see `co2_concentration`)
+
+    """
 
-# Cell
-class AquaCropModel:
     def __init__(
         self,
         SimStartTime,
@@ -128,18 +147,48 @@ class AquaCropModel:
 
     def initialize(
         self,
+        profile=False,
+        count_loops=False,
     ):
         """
         Initialize variables
 
+        *Arguments:*\n
+
+        `profile` : `bool`, `StageProfiler` or `KernelRecorder` : record time spent in each stage of the
+        daily calculation (see `profile_report`), or run the daily calculation with the instrumented
+        functions of the given profiler or recorder
+
+        `count_loops` : `bool` : record iterations of data-dependent loops per simulated day and per season
+        (`Outputs.Loops`, `Outputs.SeasonLoops`). The compiled kernels always count them (an integer
+        addition per iteration); this only writes the daily counts to the outputs
 
         """
 
+        # per-stage timing (the plain timestep functions are used otherwise)
+        if isinstance(profile, (StageProfiler, KernelRecorder)):
+            self.Profiler = profile
+        else:
+            assert isinstance(profile, (bool, np.bool_)), (
+                f"profile must be a bool, StageProfiler or KernelRecorder, not {type(profile).__name__}"
+            )
+            self.Profiler = StageProfiler() if profile else None
+
         # define model runtime
         self.ClockStruct = read_clock_paramaters(self.SimStartTime, self.SimEndTime)
+        self.ClockStruct.CountLoops = count_loops
 
         # get weather data
-        self.weather_df = read_weather_inputs(self.ClockStruct, self.wdf)
+        if isinstance(self.wdf, StationWeather):
+            # zero-copy view onto a WeatherStore for the simulation period
+            station = self.wdf.clip(
+                self.ClockStruct.SimulationStartDate, self.ClockStruct.SimulationEndDate
+            )
+            self.weather_df = station.to_df()
+            self.weather = station.values
+        else:
+            self.weather_df = read_weather_inputs(self.ClockStruct, self.wdf)
+            self.weather = self.weather_df[WEATHER_COLUMNS].to_numpy(dtype=np.float64)
 
         # read model params
         self.ClockStruct, self.ParamStruct = read_model_parameters(
@@ -172,12 +221,21 @@ class AquaCropModel:
 
         self.ParamStruct = create_soil_profile(self.ParamStruct)
 
+        # forcings for a growing season that starts on the first day
+        # (later seasons are set up by reset_initial_conditions)
+        if self.ClockStruct.SeasonCounter == 0:
+            self.ParamStruct = season_forcings(self.ParamStruct, self.ClockStruct, self.weather)
+
         # self.InitCond.ParamStruct = self.ParamStruct
 
         Outputs = OutputClass()
         Outputs.Water = np.zeros((len(self.ClockStruct.TimeSpan), 3 + len(self.InitCond.th)))
         Outputs.Flux = np.zeros((len(self.ClockStruct.TimeSpan), 16))
         Outputs.Growth = np.zeros((len(self.ClockStruct.TimeSpan), 13))
+        if count_loops:
+            Outputs.Loops = np.zeros((len(self.ClockStruct.TimeSpan), 2 + len(LOOP_COUNTERS)))
+            # days that are not simulated keep TimeStepCounter -1
+            Outputs.Loops[:, 0] = -1
         Outputs.Final = pd.DataFrame(
             columns=[
                 "Season",
@@ -191,9 +249,6 @@ class AquaCropModel:
 
         self.Outputs = Outputs
 
-        # save model weather to InitCond
-        self.weather = self.weather_df.values
-
         # return self.ClockStruct,self.InitCond,self.Outputs
         return
 
@@ -237,6 +292,9 @@ class AquaCropModel:
         # weather_step = weather_df[weather_df.Date==ClockStruct.StepStartTime]
         weather_step = self.weather[self.ClockStruct.TimeStepCounter]
 
+        if self.Profiler is not None:
+            return self.profiled_timestep(weather_step)
+
         #%% Get model solution %%
         NewCond, ParamStruct, Outputs = solution(
             self.InitCond, self.ParamStruct, self.ClockStruct, weather_step, self.Outputs
@@ -251,3 +309,50 @@ class AquaCropModel:
         )
 
         return ClockStruct, InitCond, ParamStruct, Outputs
+
+    def profiled_timestep(self, weather_step):
+        """
+        `perform_timestep` with the instrumented functions of `self.Profiler`
+
+        """
+
+        Profiler = self.Profiler
+
+        NewCond, ParamStruct, Outputs = Profiler.solution(
+            self.InitCond, self.ParamStruct, self.ClockStruct, weather_step, self.Outputs
+        )
+        ClockStruct = Profiler.check_model_termination(self.ClockStruct, NewCond)
+        ClockStruct, InitCond, ParamStruct, Outputs = Profiler.update_time(
+            ClockStruct, NewCond, ParamStruct, Outputs, self.weather
+        )
+
+        return ClockStruct, InitCond, ParamStruct, Outputs
+
+    def profile_report(self):
+        """
+        Time spent in each stage of the daily calculation and in each
+        compiled kernel since `initialize(profile=True)`
+
+        *Returns:*
+
+        `report` : `pandas.DataFrame` : see `StageProfiler.report` (or the
+        `report` of the instrumentation object passed as `profile`)
+
+        """
+
+        assert self.Profiler is not None, "call initialize(profile=True) to record stage times"
+
+        return self.Profiler.report()
+
+    def memory_report(self):
+        """
+        Approximate memory held by the model, by component (weather, soil,
+        crops, parameters, outputs, ...)
+
+        *Returns:*
+
+        `report` : `pandas.DataFrame` : see `model_memory`
+
+        """
+
+        return model_memory(self)
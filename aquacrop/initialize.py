@@ -6,18 +6,38 @@ __all__ = [
     "read_field_management",
     "read_groundwater_table",
     "compute_variables",
+    "load_co2_record",
+    "co2_concentration",
+    "calculate_fCO2",
     "compute_crop_calander",
+    "growing_degree_days",
+    "gdd_calendar_days",
+    "crop_calendar_days",
+    "compute_crop_calendars",
     "calculate_HIGC",
     "calculate_HI_linear",
+    "solve_HIGC",
+    "solve_HI_linear",
     "read_model_initial_conditions",
     "create_soil_profile",
+    "groundwater_depth",
+    "water_table_adjustment",
+    "season_forcings",
 ]
 
 # Cell
+import math
+import numbers
 import numpy as np
 import os
 import pandas as pd
 from .classes import *
+from .solution_aot import (
+    _check_groundwater_table,
+    _reference_harvest_index_curve,
+    _season_potential_canopy,
+    _season_stress_forcings,
+)
 import pathlib
 from copy import deepcopy
 import aquacrop
@@ -91,8 +111,13 @@ def read_weather_inputs(ClockStruct, weather_df):
     assert weather_df.Date.iloc[-1] >= end_date
 
     # remove weather data outside of simulation dates
-    weather_df = weather_df[weather_df.Date >= start_date]
-    weather_df = weather_df[weather_df.Date <= end_date]
+    # (dates are sorted so a binary search replaces the boolean masks)
+    start_idx = weather_df.Date.searchsorted(start_date, side="left")
+    end_idx = weather_df.Date.searchsorted(end_date, side="right")
+    weather_df = weather_df.iloc[start_idx:end_idx]
+
+    # the model indexes weather by time step so it must be a gap-free daily series
+    assert len(weather_df) == ClockStruct.nSteps
 
     return weather_df
 
@@ -288,33 +313,30 @@ def read_irrigation_management(ParamStruct, IrrMngt, ClockStruct):
 
 
     """
-    # If specified, read input irrigation time-series
-    if IrrMngt.IrrMethod == 3:
-
-        df = IrrMngt.Schedule.copy()
-
-        # change the index to the date
-        df.index = pd.DatetimeIndex(df.Date)
-
-        # create a dateframe containing the daily irrigation to
-        # be applied for every day in the simulation
-        df = df.reindex(ClockStruct.TimeSpan, fill_value=0).drop("Date", axis=1)
+    irr_mngt_struct = IrrMngtStruct()
+    for a, v in IrrMngt.__dict__.items():
+        if hasattr(irr_mngt_struct, a):
+            irr_mngt_struct.__setattr__(a, v)
 
-        IrrMngt.Schedule = np.array(df.values, dtype=float).flatten()
+    # If specified, read input irrigation time-series as irrigation events
+    # (time-step counters in increasing order and their depths)
+    if IrrMngt.IrrMethod == 3:
 
-    else:
+        df = IrrMngt.Schedule
 
-        IrrMngt.Schedule = np.zeros(len(ClockStruct.TimeSpan))
+        # time-step of each scheduled date (dates outside the simulation are dropped)
+        days = ClockStruct.TimeSpan.get_indexer(pd.DatetimeIndex(df.Date))
+        depths = np.array(df.Depth.values, dtype=float)[days >= 0]
+        days = days[days >= 0]
 
-    IrrMngt.SMT = np.array(IrrMngt.SMT, dtype=float)
+        order = np.argsort(days, kind="stable")
+        irr_mngt_struct.ScheduleDays = days[order].astype(np.int64)
+        irr_mngt_struct.ScheduleDepths = depths[order]
 
-    irr_mngt_struct = IrrMngtStruct(len(ClockStruct.TimeSpan))
-    for a, v in IrrMngt.__dict__.items():
-        if hasattr(irr_mngt_struct, a):
-            irr_mngt_struct.__setattr__(a, v)
+    irr_mngt_struct.SMT = np.array(IrrMngt.SMT, dtype=float)
 
     ParamStruct.IrrMngt = irr_mngt_struct
-    ParamStruct.FallowIrrMngt = IrrMngtStruct(len(ClockStruct.TimeSpan))
+    ParamStruct.FallowIrrMngt = IrrMngtStruct()
 
     return ParamStruct
 
@@ -381,8 +403,9 @@ def read_groundwater_table(ParamStruct, GwStruct, ClockStruct):
     # check if water table present
     if WT == "N":
         ParamStruct.WaterTable = 0
-        ParamStruct.zGW = 999 * np.ones(len(ClockStruct.TimeSpan))
-        ParamStruct.zGW_dates = ClockStruct.TimeSpan
+        ParamStruct.zGW = np.array([999.0])
+        ParamStruct.zGW_steps = np.zeros(1, dtype=np.int64)
+        ParamStruct.zGW_dates = ClockStruct.TimeSpan[:1].values
         ParamStruct.WTMethod = "None"
     elif WT == "Y":
         ParamStruct.WaterTable = 1
@@ -397,28 +420,44 @@ def read_groundwater_table(ParamStruct, GwStruct, ClockStruct):
 
             # if only 1 watertable depth then set that value to be constant
             # accross whole simulation
-            zGW = df.reindex(ClockStruct.TimeSpan, fill_value=df["Depth(mm)"].iloc[0],).drop(
-                "Date", axis=1
-            )["Depth(mm)"]
+            steps = np.zeros(1, dtype=np.int64)
+            zGW = np.array([df["Depth(mm)"].iloc[0]], dtype=float)
+            dates = ClockStruct.TimeSpan[steps].values
 
         elif len(df) > 1:
             # check water table method
             if WTMethod == "Constant":
 
-                # No interpolation between dates
-
-                # create daily depths for each simulation day
-                zGW = pd.Series(
-                    np.nan * np.ones(len(ClockStruct.TimeSpan)), index=ClockStruct.TimeSpan
+                # No interpolation between dates: depths are piecewise constant,
+                # so store the depth from each day on which it can change.
+                # A date sets the depth on and after it (later rows take
+                # precedence) and the first date also sets it on earlier days.
+                TimeSpan = ClockStruct.TimeSpan
+                steps = np.unique(
+                    np.concatenate(
+                        [
+                            [0],
+                            TimeSpan.searchsorted(df.Date, side="left"),
+                            TimeSpan.searchsorted(df.Date.iloc[:1], side="right"),
+                        ]
+                    )
                 )
+                steps = steps[steps < len(TimeSpan)]
 
-                # assign constant depth for all dates in between
+                zGW = np.nan * np.ones(len(steps))
                 for row in range(len(df)):
                     date = df.Date.iloc[row]
                     depth = df["Depth(mm)"].iloc[row]
-                    zGW.loc[zGW.index >= date] = depth
+                    zGW[TimeSpan[steps] >= date] = depth
                     if row == 0:
-                        zGW.loc[zGW.index <= date] = depth
+                        zGW[TimeSpan[steps] <= date] = depth
+
+                # drop steps where the depth does not change
+                keep = np.ones(len(steps), dtype=bool)
+                keep[1:] = zGW[1:] != zGW[:-1]
+                steps = steps[keep].astype(np.int64)
+                zGW = zGW[keep]
+                dates = TimeSpan[steps].values
 
             elif WTMethod == "Variable":
 
@@ -437,10 +476,14 @@ def read_groundwater_table(ParamStruct, GwStruct, ClockStruct):
 
                 # Interpolate daily groundwater depths
                 zGW = zGW.interpolate()
+                dates = zGW.index.values
+                zGW = zGW.values
+                steps = np.arange(len(zGW), dtype=np.int64)
 
         # assign values to Paramstruct object
-        ParamStruct.zGW = zGW.values
-        ParamStruct.zGW_dates = zGW.index.values
+        ParamStruct.zGW = np.asarray(zGW, dtype=float)
+        ParamStruct.zGW_steps = steps
+        ParamStruct.zGW_dates = dates
         ParamStruct.WTMethod = WTMethod
 
     return ParamStruct
@@ -526,19 +569,20 @@ def compute_variables(
         ParamStruct.CropList[i] = crop
 
     ## Calculate WP adjustment factor for elevation in CO2 concentration ##
-    # Load CO2 data
-    co2Data = pd.read_csv(
-        acfp / "data/MaunaLoaCO2.txt", header=1, delim_whitespace=True, names=["year", "ppm"]
-    )
-
     # Years
     start_year, end_year = pd.DatetimeIndex(
         [ClockStruct.SimulationStartDate, ClockStruct.SimulationEndDate]
     ).year
     sim_years = np.arange(start_year, end_year + 1)
 
-    # Interpolate data
-    CO2conc = np.interp(sim_years, co2Data.year, co2Data.ppm)
+    # CO2 concentration for each year (bundled Mauna Loa record unless a
+    # user trajectory or constant concentration was given). only numbers are
+    # constants: file paths, mappings and series are trajectories
+    constant_CO2 = isinstance(ParamStruct.CO2concAdj, numbers.Real)
+    if ParamStruct.CO2concAdj is None or constant_CO2:
+        CO2conc = co2_concentration(sim_years, acfp=acfp)
+    else:
+        CO2conc = co2_concentration(sim_years, ParamStruct.CO2concAdj, acfp=acfp)
 
     # Store data
     ParamStruct.CO2data = pd.Series(CO2conc, index=sim_years)  # maybe get rid of this
@@ -548,48 +592,19 @@ def compute_variables(
 
     ParamStruct.CO2 = CO2Class()
 
-    if ParamStruct.CO2concAdj != None:
-        CO2conc = ParamStruct.CO2concAdj
+    if constant_CO2:
+        CO2conc = float(ParamStruct.CO2concAdj)
 
     ParamStruct.CO2.CurrentConc = CO2conc
 
     CO2ref = ParamStruct.CO2.RefConc
 
-    # Get CO2 weighting factor for first year
-    if CO2conc <= CO2ref:
-        fw = 0
-    else:
-        if CO2conc >= 550:
-            fw = 1
-        else:
-            fw = 1 - ((550 - CO2conc) / (550 - CO2ref))
-
     # Determine adjustment for each crop in first year of simulation
     for i in range(ParamStruct.NCrops):
         crop = ParamStruct.CropList[i]
-        # Determine initial adjustment
-        fCO2 = (CO2conc / CO2ref) / (
-            1
-            + (CO2conc - CO2ref)
-            * (
-                (1 - fw) * crop.bsted
-                + fw * ((crop.bsted * crop.fsink) + (crop.bface * (1 - crop.fsink)))
-            )
+        crop.fCO2 = float(
+            calculate_fCO2(CO2conc, CO2ref, crop.bsted, crop.bface, crop.fsink, crop.WP)
         )
-
-        # Consider crop type
-        if crop.WP >= 40:
-            # No correction for C4 crops
-            ftype = 0
-        elif crop.WP <= 20:
-            # Full correction for C3 crops
-            ftype = 1
-        else:
-            ftype = (40 - crop.WP) / (40 - 20)
-
-        # Total adjustment
-        crop.fCO2 = 1 + ftype * (fCO2 - 1)
-
         ParamStruct.CropList[i] = crop
 
     # change this later
@@ -620,9 +635,153 @@ def compute_variables(
 
     ParamStruct.Fallow_Crop = fallow_struct
 
+    ## CO2 concentration and WP adjustment at the start of every season ##
+    if constant_CO2:
+        ParamStruct.SeasonalCO2conc = np.full(ClockStruct.nSeasons, float(ParamStruct.CO2concAdj))
+    else:
+        ParamStruct.SeasonalCO2conc = ParamStruct.CO2data.loc[
+            ClockStruct.PlantingDates.year
+        ].values
+
+    crops = ParamStruct.Seasonal_Crop_List[: ClockStruct.nSeasons]
+    ParamStruct.SeasonalfCO2 = calculate_fCO2(
+        ParamStruct.SeasonalCO2conc,
+        CO2ref,
+        np.array([crop.bsted for crop in crops]),
+        np.array([crop.bface for crop in crops]),
+        np.array([crop.fsink for crop in crops]),
+        np.array([crop.WP for crop in crops]),
+    )
+
     return ParamStruct
 
 
+# Cell
+# CO2 records read from disk, cached for the lifetime of the process
+_CO2_records = {}
+
+
+def load_co2_record(filepath=None, acfp=pathlib.Path(os.path.abspath(aquacrop.__file__)).parent):
+    """
+    Function to read a yearly CO2 concentration record
+    (two header lines, then year and concentration in ppm per line).
+    Each file is read once per process.
+
+    *Arguments:*\n
+
+    `filepath` : `str` :  CO2 file (default: bundled Mauna Loa record)
+
+    `acfp` : `Path` :  path to aquacrop directory containing co2 data
+
+    *Returns:*
+
+    `years` : `np.array` : record years
+
+    `ppm` : `np.array` : CO2 concentration (ppm)
+
+
+    """
+
+    if filepath is None:
+        filepath = acfp / "data/MaunaLoaCO2.txt"
+
+    key = os.path.abspath(filepath)
+    mtime = os.path.getmtime(key)
+    if key not in _CO2_records or _CO2_records[key][0] != mtime:
+        record = np.loadtxt(key, skiprows=2, usecols=(0, 1), ndmin=2)
+        _CO2_records[key] = (mtime, record[:, 0], record[:, 1])
+
+    _, years, ppm = _CO2_records[key]
+
+    return years, ppm
+
+
+# Cell
+def co2_concentration(
+    years, trajectory=None, acfp=pathlib.Path(os.path.abspath(aquacrop.__file__)).parent
+):
+    """
+    Function to get CO2 concentrations for a set of years, linearly
+    interpolated from a CO2 trajectory
+
+    *Arguments:*\n
+
+    `years` : `np.array` :  years
+
+    `trajectory` : `None`, `str`, `dict` or `pd.Series` :  CO2 trajectory; `None` for the
+    bundled Mauna Loa record, a file in the same format (e.g. an RCP curve), or a mapping
+    of year to ppm
+
+    `acfp` : `Path` :  path to aquacrop directory containing co2 data
+
+    *Returns:*
+
+    `CO2conc` : `np.array` : CO2 concentration (ppm) for each year
+
+
+    """
+
+    if trajectory is None or isinstance(trajectory, (str, os.PathLike)):
+        record_years, ppm = load_co2_record(trajectory, acfp=acfp)
+    else:
+        trajectory = pd.Series(trajectory).sort_index()
+        record_years = trajectory.index.values.astype(np.float64)
+        ppm = trajectory.values.astype(np.float64)
+
+    return np.interp(years, record_years, ppm)
+
+
+# Cell
+def calculate_fCO2(CO2conc, CO2ref, bsted, bface, fsink, WP):
+    """
+    Function to calculate the water productivity adjustment for elevated CO2
+    (vectorised over concentrations and/or crops)
+
+    *Arguments:*\n
+
+    `CO2conc` : `np.array` :  CO2 concentration (ppm)
+
+    `CO2ref` : `float` :  reference CO2 concentration (ppm)
+
+    `bsted` : `np.array` :  WP co2 adjustment parameter given by Steduto et al. 2007
+
+    `bface` : `np.array` :  WP co2 adjustment parameter given by FACE experiments
+
+    `fsink` : `np.array` :  crop performance under elevated CO2 (%/100)
+
+    `WP` : `np.array` :  normalised water productivity (g/m2)
+
+    *Returns:*
+
+    `fCO2` : `np.array` : WP adjustment factor
+
+
+    """
+
+    CO2conc = np.asarray(CO2conc, dtype=np.float64)
+
+    # Get CO2 weighting factor
+    fw = np.where(
+        CO2conc <= CO2ref,
+        0.0,
+        np.where(CO2conc >= 550, 1.0, 1 - ((550 - CO2conc) / (550 - CO2ref))),
+    )
+
+    # Determine initial adjustment
+    fCO2 = (CO2conc / CO2ref) / (
+        1
+        + (CO2conc - CO2ref)
+        * ((1 - fw) * bsted + fw * ((bsted * fsink) + (bface * (1 - fsink))))
+    )
+
+    # Consider crop type (no correction for C4 crops, full correction for C3 crops)
+    WP = np.asarray(WP, dtype=np.float64)
+    ftype = np.where(WP >= 40, 0.0, np.where(WP <= 20, 1.0, (40 - WP) / (40 - 20)))
+
+    # Total adjustment
+    return 1 + ftype * (fCO2 - 1)
+
+
 # Cell
 def compute_crop_calander(crop, ClockStruct, weather_df):
     """
@@ -716,62 +875,42 @@ def compute_crop_calander(crop, ClockStruct, weather_df):
             #                     idx = -1
             #             assert idx > -1
 
-            date_range = pd.date_range(pl_date, ClockStruct.TimeSpan[-1])
-            wdf = weather_df.copy()
-            wdf.index = wdf.Date
-            wdf = wdf.loc[date_range]
-            Tmin = wdf.MinTemp
-            Tmax = wdf.MaxTemp
-
-            # Calculate GDD's
-            if crop.GDDmethod == 1:
-
-                Tmean = (Tmax + Tmin) / 2
-                Tmean = Tmean.clip(lower=crop.Tbase, upper=crop.Tupp)
-                GDD = Tmean - crop.Tbase
-
-            elif crop.GDDmethod == 2:
-
-                Tmax = Tmax.clip(lower=crop.Tbase, upper=crop.Tupp)
-                Tmin = Tmin.clip(lower=crop.Tbase, upper=crop.Tupp)
-                Tmean = (Tmax + Tmin) / 2
-                GDD = Tmean - crop.Tbase
-
-            elif crop.GDDmethod == 3:
-
-                Tmax = Tmax.clip(lower=crop.Tbase, upper=crop.Tupp)
-                Tmin = Tmin.clip(upper=crop.Tupp)
-                Tmean = (Tmax + Tmin) / 2
-                Tmean = Tmean.clip(lower=crop.Tbase)
-                GDD = Tmean - crop.Tbase
+            plant_idx = weather_df.Date.searchsorted(pd.Timestamp(pl_date))
+            GDD = growing_degree_days(
+                weather_df.MinTemp.values[plant_idx:],
+                weather_df.MaxTemp.values[plant_idx:],
+                crop.Tbase,
+                crop.Tupp,
+                crop.GDDmethod,
+            )
 
             GDDcum = np.cumsum(GDD)
             # Find GDD equivalent for each crop calendar variable
             # 1. GDD's from sowing to emergence
-            crop.Emergence = GDDcum.iloc[int(crop.EmergenceCD)]
+            crop.Emergence = GDDcum[int(crop.EmergenceCD)]
             # 2. GDD's from sowing to 10# canopy cover
-            crop.Canopy10Pct = GDDcum.iloc[int(crop.Canopy10PctCD)]
+            crop.Canopy10Pct = GDDcum[int(crop.Canopy10PctCD)]
             # 3. GDD's from sowing to maximum rooting
-            crop.MaxRooting = GDDcum.iloc[int(crop.MaxRootingCD)]
+            crop.MaxRooting = GDDcum[int(crop.MaxRootingCD)]
             # 4. GDD's from sowing to maximum canopy cover
-            crop.MaxCanopy = GDDcum.iloc[int(crop.MaxCanopyCD)]
+            crop.MaxCanopy = GDDcum[int(crop.MaxCanopyCD)]
             # 5. GDD's from sowing to end of vegetative growth
-            crop.CanopyDevEnd = GDDcum.iloc[int(crop.CanopyDevEndCD)]
+            crop.CanopyDevEnd = GDDcum[int(crop.CanopyDevEndCD)]
             # 6. GDD's from sowing to senescence
-            crop.Senescence = GDDcum.iloc[int(crop.SenescenceCD)]
+            crop.Senescence = GDDcum[int(crop.SenescenceCD)]
             # 7. GDD's from sowing to maturity
-            crop.Maturity = GDDcum.iloc[int(crop.MaturityCD)]
+            crop.Maturity = GDDcum[int(crop.MaturityCD)]
             # 8. GDD's from sowing to start of yield formation
-            crop.HIstart = GDDcum.iloc[int(crop.HIstartCD)]
+            crop.HIstart = GDDcum[int(crop.HIstartCD)]
             # 9. GDD's from sowing to start of yield formation
-            crop.HIend = GDDcum.iloc[int(crop.HIendCD)]
+            crop.HIend = GDDcum[int(crop.HIendCD)]
             # 10. Duration of yield formation (GDD's)
             crop.YldForm = crop.HIend - crop.HIstart
 
             # 11. Duration of flowering (GDD's) - (fruit/grain crops only)
             if crop.CropType == 3:
                 # GDD's from sowing to end of flowering
-                crop.FloweringEnd = GDDcum.iloc[int(crop.FloweringEndCD)]
+                crop.FloweringEnd = GDDcum[int(crop.FloweringEndCD)]
                 # Duration of flowering (GDD's)
                 crop.Flowering = crop.FloweringEnd - crop.HIstart
 
@@ -834,65 +973,331 @@ def compute_crop_calander(crop, ClockStruct, weather_df):
         #             else:
         #                 idx = -1
         #         assert idx> -1
-        date_range = pd.date_range(pl_date, ClockStruct.TimeSpan[-1])
-        wdf = weather_df.copy()
-        wdf.index = wdf.Date
+        # Daily GDD's over the simulation, counted from the planting day
+        plant_idx = weather_df.Date.searchsorted(pd.Timestamp(pl_date))
+        GDD = growing_degree_days(
+            weather_df.MinTemp.values,
+            weather_df.MaxTemp.values,
+            crop.Tbase,
+            crop.Tupp,
+            crop.GDDmethod,
+        )
 
-        wdf = wdf.loc[date_range]
-        Tmin = wdf.MinTemp
-        Tmax = wdf.MaxTemp
+        calendar = crop_calendar_days(crop, GDD, plant_idx)
+        for key, value in calendar.items():
+            setattr(crop, key, int(value[0]))
 
-        # Calculate GDD's
-        if crop.GDDmethod == 1:
+    return crop
 
-            Tmean = (Tmax + Tmin) / 2
-            Tmean = Tmean.clip(lower=crop.Tbase, upper=crop.Tupp)
-            GDD = Tmean - crop.Tbase
 
-        elif crop.GDDmethod == 2:
+# Cell
+def growing_degree_days(Tmin, Tmax, Tbase, Tupp, GDDmethod):
+    """
+    Vectorised daily growing degree days (same methods as `growing_degree_day`)
 
-            Tmax = Tmax.clip(lower=crop.Tbase, upper=crop.Tupp)
-            Tmin = Tmin.clip(lower=crop.Tbase, upper=crop.Tupp)
-            Tmean = (Tmax + Tmin) / 2
-            GDD = Tmean - crop.Tbase
+    *Arguments:*\n
 
-        elif crop.GDDmethod == 3:
+    `Tmin` : `np.array` :  daily minimum temperature
 
-            Tmax = Tmax.clip(lower=crop.Tbase, upper=crop.Tupp)
-            Tmin = Tmin.clip(upper=crop.Tupp)
-            Tmean = (Tmax + Tmin) / 2
-            Tmean = Tmean.clip(lower=crop.Tbase)
-            GDD = Tmean - crop.Tbase
+    `Tmax` : `np.array` :  daily maximum temperature
 
-        GDDcum = np.cumsum(GDD).reset_index(drop=True)
+    `Tbase` : `float` :  base temperature
 
-        assert (
-            GDDcum.values[-1] > crop.Maturity
-        ), f"not enough growing degree days in simulation ({GDDcum.values[-1]}) to reach maturity ({crop.Maturity})"
+    `Tupp` : `float` :  upper temperature threshold
 
-        crop.MaturityCD = (GDDcum > crop.Maturity).idxmax() + 1
+    `GDDmethod` : `int` :  GDD calculation method (1, 2 or 3)
 
-        assert crop.MaturityCD < 365, "crop will take longer than 1 year to mature"
+    *Returns:*
 
-        # 1. GDD's from sowing to maximum canopy cover
-        crop.MaxCanopyCD = (GDDcum > crop.MaxCanopy).idxmax() + 1
-        # 2. GDD's from sowing to end of vegetative growth
-        crop.CanopyDevEndCD = (GDDcum > crop.CanopyDevEnd).idxmax() + 1
-        # 3. Calendar days from sowing to start of yield formation
-        crop.HIstartCD = (GDDcum > crop.HIstart).idxmax() + 1
-        # 4. Calendar days from sowing to end of yield formation
-        crop.HIendCD = (GDDcum > crop.HIend).idxmax() + 1
-        # 5. Duration of yield formation in calendar days
-        crop.YldFormCD = crop.HIendCD - crop.HIstartCD
-        if crop.CropType == 3:
-            # 1. Calendar days from sowing to end of flowering
-            FloweringEnd = (GDDcum > crop.FloweringEnd).idxmax() + 1
-            # 2. Duration of flowering in calendar days
-            crop.FloweringCD = FloweringEnd - crop.HIstartCD
-        else:
-            crop.FloweringCD = -999
+    `GDD` : `np.array` : daily growing degree days
 
-    return crop
+    """
+
+    Tmin = np.asarray(Tmin, dtype=np.float64)
+    Tmax = np.asarray(Tmax, dtype=np.float64)
+
+    if GDDmethod == 1:
+        Tmean = np.clip((Tmax + Tmin) / 2, Tbase, Tupp)
+    elif GDDmethod == 2:
+        Tmean = (np.clip(Tmax, Tbase, Tupp) + np.clip(Tmin, Tbase, Tupp)) / 2
+    elif GDDmethod == 3:
+        Tmean = (np.clip(Tmax, Tbase, Tupp) + np.minimum(Tmin, Tupp)) / 2
+        Tmean = np.maximum(Tmean, Tbase)
+
+    return Tmean - Tbase
+
+
+# Cell
+def gdd_calendar_days(GDD, plant_idx, thresholds):
+    """
+    Calendar days from sowing until cumulative GDD's first exceed each
+    threshold, for many planting days at once
+
+    Uses a single prefix sum of `GDD` and a binary search per planting
+    day/threshold. Planting days where the prefix-sum difference lands
+    within rounding error of a threshold are recomputed with a sequential
+    cumulative sum, so results are identical to
+    `(np.cumsum(GDD[p:]) > threshold).argmax() + 1`.
+
+    *Arguments:*\n
+
+    `GDD` : `np.array` :  daily growing degree days (non-negative)
+
+    `plant_idx` : `np.array` :  index into `GDD` of each planting day
+
+    `thresholds` : `np.array` :  GDD thresholds
+
+    *Returns:*
+
+    `CD` : `np.array` : (planting days, thresholds) calendar days, 0 where
+    the threshold is never exceeded
+
+    """
+
+    GDD = np.asarray(GDD, dtype=np.float64)
+    plant_idx = np.atleast_1d(np.asarray(plant_idx, dtype=np.int64))
+    thresholds = np.atleast_1d(np.asarray(thresholds, dtype=np.float64))
+
+    GDDcum = np.zeros(len(GDD) + 1)
+    np.cumsum(GDD, out=GDDcum[1:])
+
+    # first prefix index whose value exceeds planting prefix + threshold
+    target = GDDcum[plant_idx][:, None] + thresholds[None, :]
+    m = np.searchsorted(GDDcum, target, side="right")
+
+    CD = np.where(m < len(GDDcum), np.maximum(m - plant_idx[:, None], 1), 0)
+
+    # guard against rounding in the prefix-sum differences
+    tol = 4 * len(GDDcum) * np.spacing(max(GDDcum[-1], 1.0))
+    lo = GDDcum[np.clip(m - 1, 0, len(GDD))]
+    hi = GDDcum[np.clip(m, 0, len(GDD))]
+    close = (np.abs(lo - target) <= tol) | (np.abs(hi - target) <= tol)
+
+    for row in np.unique(np.nonzero(close)[0]):
+        cum = np.cumsum(GDD[plant_idx[row] :])
+        for col, threshold in enumerate(thresholds):
+            above = cum > threshold
+            CD[row, col] = above.argmax() + 1 if above.any() else 0
+
+    return CD
+
+
+# Cell
+def crop_calendar_days(crop, GDD, plant_idx):
+    """
+    Calendar-day crop calendar of a GDD mode crop for one or many planting days
+
+    *Arguments:*\n
+
+    `crop` : `CropClass` :  Crop object with calendar thresholds in GDD's
+
+    `GDD` : `np.array` :  daily growing degree days for the crop
+
+    `plant_idx` : `np.array` :  index into `GDD` of each planting day
+
+    *Returns:*
+
+    `calendar` : `dict` : arrays of MaturityCD, MaxCanopyCD, CanopyDevEndCD,
+    HIstartCD, HIendCD, YldFormCD and FloweringCD (one value per planting day)
+
+    """
+
+    thresholds = [crop.Maturity, crop.MaxCanopy, crop.CanopyDevEnd, crop.HIstart, crop.HIend]
+    if crop.CropType == 3:
+        thresholds.append(crop.FloweringEnd)
+
+    CD = gdd_calendar_days(GDD, plant_idx, thresholds)
+
+    assert np.all(
+        CD[:, 0] > 0
+    ), f"not enough growing degree days in simulation to reach maturity ({crop.Maturity})"
+
+    assert np.all(CD[:, 0] < 365), "crop will take longer than 1 year to mature"
+
+    # threshold never exceeded counts as day 1
+    CD[CD == 0] = 1
+
+    calendar = {
+        "MaturityCD": CD[:, 0],
+        "MaxCanopyCD": CD[:, 1],
+        "CanopyDevEndCD": CD[:, 2],
+        "HIstartCD": CD[:, 3],
+        "HIendCD": CD[:, 4],
+        "YldFormCD": CD[:, 4] - CD[:, 3],
+    }
+    if crop.CropType == 3:
+        calendar["FloweringCD"] = CD[:, 5] - CD[:, 3]
+    else:
+        calendar["FloweringCD"] = np.full(len(CD), -999)
+
+    return calendar
+
+
+# Cell
+def compute_crop_calendars(crop, weather_df, planting_dates):
+    """
+    Calendar-day crop calendars for many planting dates in one call,
+    e.g. for sowing date optimisation. Daily GDD's are computed once and
+    each planting date is resolved with prefix sums.
+
+    `crop` must be in GDD mode with its calendar finalised, e.g.
+    `model.ParamStruct.CropList[0]` after `model.initialize()`.
+
+    *Arguments:*\n
+
+    `crop` : `CropClass` :  Crop object with calendar thresholds in GDD's
+
+    `weather_df` : `pd.DataFrame` :  weather data
+
+    `planting_dates` : `list` :  planting dates
+
+    *Returns:*
+
+    `calendars` : `pd.DataFrame` : calendar days per planting date
+
+    """
+
+    assert crop.CalendarType == 2
+
+    planting_dates = pd.DatetimeIndex(pd.to_datetime(planting_dates))
+    plant_idx = weather_df.Date.searchsorted(planting_dates)
+    assert np.all(plant_idx < len(weather_df))
+
+    GDD = growing_degree_days(
+        weather_df.MinTemp.values, weather_df.MaxTemp.values, crop.Tbase, crop.Tupp, crop.GDDmethod
+    )
+
+    return pd.DataFrame(crop_calendar_days(crop, GDD, plant_idx), index=planting_dates)
+
+
+# Cell
+# values taken by HIGC when stepping from 0.001 in increments of 0.001;
+# built with a sequential cumulative sum so each entry carries exactly the
+# rounding of the repeated additions (extended on demand)
+_HIGC_grid = np.cumsum(np.full(8192, 0.001))
+
+
+def _harvest_index_curve(HIini, HI0, HIGC, t):
+    """
+    logistic harvest index build-up after `t` days
+    """
+    return (HIini * HI0) / (HIini + (HI0 - HIini) * np.exp(-HIGC * t))
+
+
+# Cell
+def solve_HIGC(HIini, HI0, tHI):
+    """
+    Harvest index growth coefficient for many crops/seasons at once
+
+    Returns the smallest HIGC on the 0.001 grid for which the logistic
+    build-up reaches more than 98% of HI0 after `tHI` days (stepped back one
+    grid point if it overshoots HI0), i.e. exactly what stepping
+    `HIGC += 0.001` gives. The grid point is located from the closed form
+    solution and then confirmed on the grid.
+
+    *Arguments:*\n
+
+    `HIini` : `np.array` :  initial harvest index
+
+    `HI0` : `np.array` :  reference harvest index
+
+    `tHI` : `np.array` :  yield formation period (calendar days)
+
+    *Returns:*
+
+    `HIGC` : `np.array` : harvest index growth coefficient
+
+    """
+    global _HIGC_grid
+
+    HIini, HI0, tHI = np.broadcast_arrays(
+        np.asarray(HIini, dtype=np.float64),
+        np.asarray(HI0, dtype=np.float64),
+        np.asarray(tHI, dtype=np.float64),
+    )
+    HIlim = 0.98 * HI0
+
+    assert np.all(
+        (tHI > 0) | (HIini > HIlim)
+    ), "yield formation period must be positive to calculate HIGC"
+
+    def reached(k):
+        return _harvest_index_curve(HIini, HI0, _HIGC_grid[k], tHI) > HIlim
+
+    # continuous solution of HIest == 0.98*HI0 gives the grid point to within one step
+    with np.errstate(divide="ignore", invalid="ignore"):
+        HIGC = -np.log((HIini * (HI0 - HIlim)) / (HIlim * (HI0 - HIini))) / tHI
+    k = np.where(np.isfinite(HIGC), np.ceil(HIGC / 0.001) - 1, 1)
+    k = np.clip(k, 1, None).astype(np.int64)
+
+    while True:
+        if k.max() + 2 > len(_HIGC_grid):
+            _HIGC_grid = np.cumsum(np.full(2 * (k.max() + 2), 0.001))
+
+        down = (k > 1) & reached(np.maximum(k - 1, 1))
+        up = ~reached(k)
+        if not (down.any() or up.any()):
+            break
+        k = k - down + up
+
+    HIGC = _HIGC_grid[k]
+    HIest = _harvest_index_curve(HIini, HI0, HIGC, tHI)
+
+    return np.where(HIest >= HI0, HIGC - 0.001, HIGC)
+
+
+# Cell
+def solve_HI_linear(HIini, HI0, HIGC, tmax):
+    """
+    Time to switch to linear harvest index build-up and the linear rate,
+    for many crops/seasons at once
+
+    The switch point is the day before the first day on which linear
+    extrapolation of the logistic curve to the end of yield formation
+    exceeds HI0 (evaluated for all days in one array pass).
+
+    *Arguments:*\n
+
+    `HIini` : `np.array` :  initial harvest index
+
+    `HI0` : `np.array` :  reference harvest index
+
+    `HIGC` : `np.array` :  harvest index growth coefficient
+
+    `tmax` : `np.array` :  yield formation period (calendar days)
+
+    *Returns:*
+
+    `tSwitch` : `np.array` : days to linear switch point
+
+    `dHILinear` : `np.array` : linear rate of harvest index build-up
+
+    """
+
+    HIini, HI0, HIGC, tmax = np.broadcast_arrays(
+        np.asarray(HIini, dtype=np.float64),
+        np.asarray(HI0, dtype=np.float64),
+        np.asarray(HIGC, dtype=np.float64),
+        np.asarray(tmax, dtype=np.int64),
+    )
+    HIini, HI0, HIGC, tmax = [np.atleast_1d(x)[:, None] for x in (HIini, HI0, HIGC, tmax)]
+
+    # logistic curve on days 1..max(tmax), previous day value on day 1 is HIini
+    ti = np.arange(1, max(tmax.max(), 1) + 1)[None, :]
+    HInew = _harvest_index_curve(HIini, HI0, HIGC, ti)
+    HIprev = np.concatenate([HIini, HInew[:, :-1]], axis=1)
+    HIest = HInew + (tmax - ti) * (HInew - HIprev)
+
+    # first day the extrapolation exceeds HI0, otherwise the end of yield formation
+    exceeds = (HIest > HI0) & (ti <= tmax)
+    tSwitch = np.where(exceeds.any(axis=1), exceeds.argmax(axis=1) + 1, tmax[:, 0]) - 1
+
+    HIest = np.where(
+        tSwitch > 0, _harvest_index_curve(HIini[:, 0], HI0[:, 0], HIGC[:, 0], tSwitch), 0
+    )
+    dHILinear = (HI0[:, 0] - HIest) / (tmax[:, 0] - tSwitch)
+
+    return tSwitch, dHILinear
 
 
 # Cell
@@ -911,22 +1316,8 @@ def calculate_HIGC(crop):
 
 
     """
-    # Determine HIGC
-    # Total yield formation days
-    tHI = crop.YldFormCD
-    # Iteratively estimate HIGC
-    HIGC = 0.001
-    HIest = 0
-    while HIest <= (0.98 * crop.HI0):
-        HIGC = HIGC + 0.001
-        HIest = (crop.HIini * crop.HI0) / (
-            crop.HIini + (crop.HI0 - crop.HIini) * np.exp(-HIGC * tHI)
-        )
-
-    if HIest >= crop.HI0:
-        HIGC = HIGC - 0.001
-
-    crop.HIGC = HIGC
+    # Determine HIGC on the 0.001 grid for the total yield formation days
+    crop.HIGC = float(solve_HIGC(crop.HIini, crop.HI0, crop.YldFormCD))
 
     return crop
 
@@ -949,35 +1340,10 @@ def calculate_HI_linear(crop):
 
 
     """
-    # Determine linear switch point
-    # Initialise variables
-    ti = 0
-    tmax = crop.YldFormCD
-    HIest = 0
-    HIprev = crop.HIini
-    # Iterate to find linear switch point
-    while (HIest <= crop.HI0) and (ti < tmax):
-        ti = ti + 1
-        HInew = (crop.HIini * crop.HI0) / (
-            crop.HIini + (crop.HI0 - crop.HIini) * np.exp(-crop.HIGC * ti)
-        )
-        HIest = HInew + (tmax - ti) * (HInew - HIprev)
-        HIprev = HInew
-
-    tSwitch = ti - 1
+    tSwitch, dHILin = solve_HI_linear(crop.HIini, crop.HI0, crop.HIGC, crop.YldFormCD)
 
-    # Determine linear build-up rate
-    if tSwitch > 0:
-        HIest = (crop.HIini * crop.HI0) / (
-            crop.HIini + (crop.HI0 - crop.HIini) * np.exp(-crop.HIGC * tSwitch)
-        )
-    else:
-        HIest = 0
-
-    dHILin = (crop.HI0 - HIest) / (tmax - tSwitch)
-
-    crop.tLinSwitch = tSwitch
-    crop.dHILinear = dHILin
+    crop.tLinSwitch = int(tSwitch[0])
+    crop.dHILinear = float(dHILin[0])
 
     return crop
 
@@ -1068,7 +1434,7 @@ def read_model_initial_conditions(ParamStruct, ClockStruct, InitWC):
         InitCond.th_fc_Adj = profile.th_fc.values
     elif ParamStruct.WaterTable == 1:  # Water table is present
         # Set initial groundwater level
-        InitCond.zGW = float(ParamStruct.zGW[ClockStruct.TimeStepCounter])
+        InitCond.zGW = float(groundwater_depth(ParamStruct, ClockStruct.TimeStepCounter))
         # Find compartment mid-points
         zMid = profile.zMid
         # Check if water table is within modelled soil profile
@@ -1325,6 +1691,22 @@ def create_soil_profile(ParamStruct):
         Profile.aCR = pdf.dz.values*0.
         Profile.bCR = pdf.dz.values*0.
 
+    # lookup table from depth to compartment: number of compartments whose
+    # bottom lies above each depth of a fine grid
+    zGrid = np.arange(int(np.ceil(Profile.dzsum[-1] / SOIL_DEPTH_RES)) + 2) * SOIL_DEPTH_RES
+    Profile.zIdx = np.searchsorted(Profile.dzsum, zGrid, side="left").astype(np.int64)
+
+    # cumulative water storage (mm) to the bottom of each compartment
+    Profile.Wsat_cum = np.cumsum(1000 * Profile.th_s * Profile.dz)
+    Profile.Wfc_cum = np.cumsum(1000 * Profile.th_fc * Profile.dz)
+    Profile.Wwp_cum = np.cumsum(1000 * Profile.th_wp * Profile.dz)
+    Profile.Wdry_cum = np.cumsum(1000 * Profile.th_dry * Profile.dz)
+
+    # drainage ability at saturation and denominator of the drainage curve
+    Profile.dthdt_sat = Profile.tau * (Profile.th_s - Profile.th_fc)
+    # (scalar exp so values match the compiled drainage routine bit for bit)
+    Profile.dthdt_den = np.array([math.exp(x) - 1 for x in Profile.th_s - Profile.th_fc])
+
     # ParamStruct.Soil.Profile = Profile
 
 
@@ -1345,9 +1727,179 @@ def create_soil_profile(ParamStruct):
                                             th_fc_Adj=Profile.th_fc_Adj,
                                             aCR=Profile.aCR,
                                             bCR=Profile.bCR,
+                                            zIdx=Profile.zIdx,
+                                            Wsat_cum=Profile.Wsat_cum,
+                                            Wfc_cum=Profile.Wfc_cum,
+                                            Wwp_cum=Profile.Wwp_cum,
+                                            Wdry_cum=Profile.Wdry_cum,
+                                            dthdt_sat=Profile.dthdt_sat,
+                                            dthdt_den=Profile.dthdt_den,
                                             )
 
 
 
 
+    # adjustments for every water table depth of the run
+    if ParamStruct.WaterTable == 1:
+        ParamStruct.zGW_adjustments = {}
+        for zGW in np.unique(ParamStruct.zGW):
+            water_table_adjustment(ParamStruct, zGW)
+
+    return ParamStruct
+
+
+# Cell
+def groundwater_depth(ParamStruct, TimeStepCounter):
+    """
+    water table depth on a time step
+
+    `ParamStruct.zGW` holds the depth from each time step in
+    `ParamStruct.zGW_steps` onwards (a single value when the depth is
+    constant over the simulation).
+
+    *Arguments:*\n
+
+    `ParamStruct` : `ParamStructClass` :  Contains model paramaters
+
+    `TimeStepCounter` : `int` :  time step
+
+    *Returns:*
+
+    `zGW` : `float` :  water table depth (m)
+
+    """
+
+    if len(ParamStruct.zGW) == 1:
+        return ParamStruct.zGW[0]
+
+    return ParamStruct.zGW[np.searchsorted(ParamStruct.zGW_steps, TimeStepCounter, side="right") - 1]
+
+
+# Cell
+def water_table_adjustment(ParamStruct, zGW):
+    """
+    adjusted field capacity and the first compartment below the water table
+    for a water table depth, cached in `ParamStruct.zGW_adjustments`
+
+    Both depend only on `zGW` and the soil profile, so they are calculated
+    once per depth (all depths of the run are precomputed by
+    `create_soil_profile`) instead of on every day.
+
+    *Arguments:*\n
+
+    `ParamStruct` : `ParamStructClass` :  Contains model paramaters (with soil profile)
+
+    `zGW` : `float` :  water table depth (m)
+
+    *Returns:*
+
+    `th_fc_Adj` : `numpy.ndarray` :  adjusted water content at field capacity (read-only)
+
+    `comp` : `int` :  index of first compartment with its mid-point below the water table
+    (number of compartments if the water table is below the profile)
+
+    """
+
+    adjustment = ParamStruct.zGW_adjustments.get(zGW)
+    if adjustment is None:
+        zGW = float(zGW)
+        prof = ParamStruct.Soil.Profile
+        th = prof.th_s.copy()
+        th_fc_Adj, _ = _check_groundwater_table(prof, zGW, th, prof.th_fc_Adj.copy(), 1, zGW)
+        th_fc_Adj.flags.writeable = False
+
+        comp = int(np.sum(prof.zMid < zGW)) if zGW >= 0 else len(prof.zMid)
+        adjustment = (th_fc_Adj, comp)
+        ParamStruct.zGW_adjustments[zGW] = adjustment
+
+    return adjustment
+
+
+# Cell
+def season_forcings(ParamStruct, ClockStruct, weather):
+    """
+    compute the daily crop forcings that depend only on weather and crop
+    paramaters (growing degree days, temperature stress on pollination,
+    Et0-adjusted water stress thresholds, non-stressed canopy cover and
+    reference harvest index) for the current growing season
+
+    Called once at the start of each season; the daily time step then indexes
+    `ParamStruct.SeasonForcings` by days after planting.
+
+    *Arguments:*\n
+
+    `ParamStruct` : `ParamStructClass` :  Contains model paramaters
+
+    `ClockStruct` : `ClockStructClass` :  model time paramaters (`SeasonCounter` is the new season)
+
+    `weather`: `np.array` :  daily weather for simulation period (columns ordered as `WEATHER_COLUMNS`)
+
+    *Returns:*
+
+    `ParamStruct` : `ParamStructClass` :  with updated `SeasonForcings`
+
+    """
+
+    season = ClockStruct.SeasonCounter
+    Crop = ParamStruct.Seasonal_Crop_List[season]
+
+    # daily GDD's over the simulation, shared by all seasons with the same
+    # crop temperature paramaters
+    key = (Crop.Tbase, Crop.Tupp, Crop.GDDmethod)
+    if key not in ParamStruct.GDD:
+        ParamStruct.GDD[key] = growing_degree_days(weather[:, 0], weather[:, 1], *key)
+
+    # season runs from the planting day up to and including the harvest day
+    start = ClockStruct.TimeSpan.searchsorted(ClockStruct.PlantingDates[season])
+    end = ClockStruct.TimeSpan.searchsorted(ClockStruct.HarvestDates[season]) + 1
+    days = weather[start:end]
+
+    class_args = {
+        name: value
+        for name, value in Crop.__dict__.items()
+        if not name.startswith("__") and not callable(value)
+    }
+    Crop_ = CropStructNT(**class_args)
+    Kst_PolH, Kst_PolC, p_up, p_lo = _season_stress_forcings(
+        Crop_,
+        np.ascontiguousarray(days[:, 1]),
+        np.ascontiguousarray(days[:, 0]),
+        np.ascontiguousarray(days[:, 3]),
+    )
+
+    # non-stressed canopy development assuming germination on the planting
+    # day; entry k is the end of the k'th day after planting (entry 0 is
+    # planting). the exponential growth term is evaluated here to match the
+    # daily calculation exactly
+    GDD = ParamStruct.GDD[key][start:end]
+    ndays = len(days) + 1
+    if Crop.CalendarType == 1:
+        dtCC = np.ones(ndays)
+        tCC = np.arange(ndays, dtype=np.float64)
+    else:
+        dtCC = np.concatenate(([0.0], GDD))
+        tCC = np.cumsum(dtCC)
+    CC_NS, CCxAct_NS, CCxW_NS = _season_potential_canopy(
+        Crop_, tCC, Crop.CC0 * np.exp(Crop.CGC * dtCC)
+    )
+
+    # reference harvest index by days of build-up
+    HIref, PctLagPhase = _reference_harvest_index_curve(Crop_, ndays)
+
+    forcings = SeasonForcingsClass()
+    forcings.Start = int(start)
+    forcings.GDD = GDD
+    forcings.Kst_PolH = Kst_PolH
+    forcings.Kst_PolC = Kst_PolC
+    forcings.p_up = p_up
+    forcings.p_lo = p_lo
+    forcings.tCC = tCC
+    forcings.dtCC = dtCC
+    forcings.CC_NS = CC_NS
+    forcings.CCxAct_NS = CCxAct_NS
+    forcings.CCxW_NS = CCxW_NS
+    forcings.HIref = HIref
+    forcings.PctLagPhase = PctLagPhase
+    ParamStruct.SeasonForcings = forcings
+
     return ParamStruct
@@ -1,4 +1,4 @@
-__all__ = ["prepare_lars_weather", "select_lars_wdf"]
+__all__ = ["prepare_lars_weather", "select_lars_wdf", "read_lars_co2"]
 
 # Cell
 import sys
@@ -99,3 +99,16 @@ def prepare_lars_weather(
 def select_lars_wdf(df, simyear):
     temp = df[df.simyear == simyear][["MinTemp", "MaxTemp", "Precipitation", "ReferenceET", "Date"]]
     return temp.reset_index(drop=True)
+
+
+# Cell
+def read_lars_co2(file):
+    """
+    Reads the scenario CO2 concentration (ppm) from a LARS site file (.st),
+    for use as `CO2conc` in `AquaCropModel`.
+
+    """
+    with open(file) as f:
+        lines = [line.strip() for line in f]
+
+    return float(lines[lines.index("[CO2]") + 1])
@@ -0,0 +1,259 @@
+__all__ = ["profile_model", "write_collapsed", "write_speedscope", "main"]
+
+# Cell
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+import warnings
+from collections import Counter
+
+from .profiling import StageProfiler
+from .validation import REFERENCE_CASES, reference_model
+
+
+# Cell
+# code of the wrappers `StageProfiler` puts around stages and kernels; their
+# frames are labelled with the stage or kernel they time
+_TIMED_CODE = next(
+    const
+    for const in StageProfiler.timed.__code__.co_consts
+    if getattr(const, "co_name", None) == "wrapper"
+)
+
+
+def _frame_label(frame):
+    """
+    name of a python frame in a stack: `[section] name` for timed stages and
+    kernels, `module:function` otherwise
+    """
+    code = frame.f_code
+    if code is _TIMED_CODE:
+        section, name = frame.f_locals["key"]
+        return f"[{section}] {name}"
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _stack(frame, root):
+    """
+    labels of the frames called by the frame of code `root` down to `frame`
+    (empty outside `root`)
+    """
+    labels = []
+    while frame is not None and frame.f_code is not root:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    if frame is None:
+        return ()
+    return tuple(reversed(labels))
+
+
+def _sampled(run, interval):
+    """
+    call `run()` sampling the python stack every `interval` s of cpu time;
+    returns the cpu time (s) of each stack below `run`
+    """
+    assert hasattr(signal, "setitimer"), "sampling needs signal.setitimer (not available on windows)"
+
+    stacks = Counter()
+    root = run.__code__
+    last = [time.process_time()]
+
+    def sample(signum, frame):
+        now = time.process_time()
+        stacks[_stack(frame, root)] += now - last[0]
+        last[0] = now
+
+    previous = signal.signal(signal.SIGPROF, sample)
+    signal.setitimer(signal.ITIMER_PROF, interval, interval)
+    try:
+        run()
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, previous)
+
+    return stacks
+
+
+def _traced(run):
+    """
+    call `run()` recording every python and builtin call; returns the
+    wall time (s) spent in each stack below `run`, excluding calls it makes
+    """
+    stacks = Counter()
+    stack = []
+    clock = time.perf_counter
+    last = [clock()]
+
+    def trace(frame, event, arg):
+        now = clock()
+        stacks[tuple(stack)] += now - last[0]
+        if event == "call":
+            stack.append(_frame_label(frame))
+        elif event == "c_call":
+            stack.append(f"{getattr(arg, '__module__', None) or 'builtins'}:{arg.__name__}")
+        elif stack:
+            # return, c_return and c_exception
+            stack.pop()
+        last[0] = clock()
+
+    sys.setprofile(trace)
+    try:
+        run()
+    finally:
+        sys.setprofile(None)
+
+    # stacks start with the frame of `run` (setprofile itself is outside)
+    return Counter({stack[1:]: seconds for stack, seconds in stacks.items() if len(stack) > 1})
+
+
+# Cell
+def profile_model(model, mode="sampling", interval=0.001):
+    """
+    run a model to termination under a profiler and return its call stacks
+
+    The model is initialized with a `StageProfiler`, so stacks show the
+    stages of the daily calculation (`[stage] 4. drainage`) and the compiled
+    kernels (`[kernel] _drainage`) as frames, and `model.profile_report()`
+    gives the stage times of the same run.
+
+    *Arguments:*\n
+
+    `model` : `AquaCropModel` : model to run (initialized here)
+
+    `mode` : `str` : `"sampling"` (sample the stack every `interval` s of cpu
+    time, low overhead) or `"deterministic"` (record every call, exact stacks
+    but much slower)
+
+    `interval` : `float` : sampling interval (s)
+
+    *Returns:*
+
+    `stacks` : `collections.Counter` : time (s) spent in each stack (tuple of
+    frame labels, outermost first), excluding time in the frames it calls
+
+    """
+
+    assert mode in ["sampling", "deterministic"], f"unknown profiler mode {mode}"
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        model.initialize(profile=StageProfiler())
+
+    def run():
+        model.step(till_termination=True)
+
+    if mode == "sampling":
+        return _sampled(run, interval)
+    return _traced(run)
+
+
+def write_collapsed(path, stacks):
+    """
+    write stacks in the collapsed format of flamegraph.pl, inferno and
+    speedscope (`frame;frame;frame weight`, weights in microseconds)
+
+    *Arguments:*\n
+
+    `path` : `str` : output file
+
+    `stacks` : `dict` : time (s) of each stack (see `profile_model`)
+
+    """
+
+    with open(path, "w") as f:
+        for stack, seconds in sorted(stacks.items()):
+            weight = int(round(1e6 * seconds))
+            if stack and weight > 0:
+                # ';' separates frames
+                f.write(";".join(label.replace(";", ",") for label in stack) + f" {weight}\n")
+
+
+def write_speedscope(path, stacks, name="aquacrop"):
+    """
+    write stacks as a speedscope (https://www.speedscope.app) sampled profile
+
+    *Arguments:*\n
+
+    `path` : `str` : output file (`.speedscope.json`)
+
+    `stacks` : `dict` : time (s) of each stack (see `profile_model`)
+
+    `name` : `str` : name of the profile
+
+    """
+
+    frames = {}
+    samples = []
+    weights = []
+    for stack, seconds in sorted(stacks.items()):
+        if not stack or seconds <= 0:
+            continue
+        samples.append([frames.setdefault(label, len(frames)) for label in stack])
+        weights.append(seconds)
+
+    document = {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": [{"name": label} for label in frames]},
+        "profiles": [
+            {
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }
+        ],
+        "name": name,
+        "exporter": "aquacrop.profile",
+    }
+    with open(path, "w") as f:
+        json.dump(document, f)
+
+
+# Cell
+def main(argv=None):
+    """
+    `python -m aquacrop.profile <case>`: profile a bundled reference case and
+    write its stacks for a flame graph viewer
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="python -m aquacrop.profile",
+        description="profile a simulation and write flame graph stacks",
+    )
+    parser.add_argument("case", choices=list(REFERENCE_CASES), help="bundled reference case")
+    parser.add_argument("--end", help="end the simulation at this date (YYYY/MM/DD)")
+    parser.add_argument("--mode", choices=["sampling", "deterministic"], default="sampling")
+    parser.add_argument("--interval", type=float, default=0.001, help="sampling interval (s)")
+    parser.add_argument("--format", choices=["collapsed", "speedscope"], default="speedscope")
+    parser.add_argument("-o", "--output", help="output file (default: <case>.<mode>.<format>)")
+    args = parser.parse_args(argv)
+
+    model = reference_model(args.case)
+    if args.end is not None:
+        model.SimEndTime = args.end
+
+    stacks = profile_model(model, args.mode, args.interval)
+
+    extension = "speedscope.json" if args.format == "speedscope" else "collapsed"
+    output = args.output or f"{args.case}.{args.mode}.{extension}"
+    if args.format == "speedscope":
+        write_speedscope(output, stacks, f"{args.case} ({args.mode})")
+    else:
+        write_collapsed(output, stacks)
+
+    report = model.profile_report()
+    print(report[report.Section == "stage"].to_string(index=False))
+    print(f"\n{sum(stacks.values()):.3f} s profiled, saved {os.path.abspath(output)}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,506 @@
+__all__ = [
+    "SOLUTION_STAGES",
+    "StageProfiler",
+    "object_nbytes",
+    "model_memory",
+    "KernelRecorder",
+    "save_kernel_calls",
+    "load_kernel_calls",
+    "calibration_time",
+]
+
+# Cell
+import sys
+import time
+import types
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+from numba.core.registry import CPUDispatcher
+
+from . import classes as _classes_module
+from . import solution as _solution_module
+from . import timestep as _timestep_module
+
+
+# Cell
+# numbered stages of `timestep.solution`: name of the function called -> stage
+# (stage 18, crop yield, is computed in place and counted with the rest of
+# the daily bookkeeping)
+SOLUTION_STAGES = {
+    "water_table_adjustment": "1. groundwater table",
+    "_root_development": "2. root development",
+    "pre_irrigation": "3. pre-irrigation",
+    "_drainage": "4. drainage",
+    "_rainfall_partition": "5. surface runoff",
+    "irrigation": "6. irrigation",
+    "_infiltration": "7. infiltration",
+    "capillary_rise": "8. capillary rise",
+    "germination": "9. germination",
+    "growth_stage": "10. growth stage",
+    "canopy_cover": "11. canopy cover",
+    "_soil_evaporation": "12. soil evaporation",
+    "transpiration": "13. transpiration",
+    "groundwater_inflow": "14. groundwater inflow",
+    "_HIref_current_day": "15. reference harvest index",
+    "_biomass_accumulation": "16. biomass accumulation",
+    "harvest_index": "17. harvest index",
+    "root_zone_summary": "19. root zone water",
+}
+
+
+# Cell
+def _is_kernel(value):
+    """
+    compiled function callable from python (ahead-of-time export or jit dispatcher)
+    """
+    return isinstance(value, CPUDispatcher) or (
+        isinstance(value, types.BuiltinFunctionType)
+        and getattr(value, "__module__", None) == "aquacrop.solution_aot"
+    )
+
+
+def _rebind(func, namespace):
+    """
+    copy of python function `func` that looks up global names in `namespace`
+    """
+    return types.FunctionType(
+        func.__code__, namespace, func.__name__, func.__defaults__, func.__closure__
+    )
+
+
+# Cell
+class StageProfiler:
+    """
+    Records cumulative wall time and call counts of each stage of the daily
+    calculation and of each compiled kernel called from python.
+
+    Instrumented copies of `solution`, `check_model_termination` and
+    `update_time` are built with timed versions of the functions they call;
+    the module functions themselves are not changed, so models that are not
+    profiled run at full speed. Stage times include the kernels they call.
+
+    **Attributes:**\n
+
+    `solution`, `check_model_termination`, `update_time` : `function` : instrumented versions of the `timestep` functions
+
+    `calls` : `dict` : number of calls by (section, name)
+
+    `times` : `dict` : cumulative time (s) by (section, name)
+
+    """
+
+    def __init__(self):
+        self.calls = defaultdict(int)
+        self.times = defaultdict(float)
+
+        # solution module: every python function calls timed kernels
+        solution_ns = dict(vars(_solution_module))
+        for name, value in vars(_solution_module).items():
+            if _is_kernel(value):
+                solution_ns[name] = self.timed("kernel", name, value)
+        for name, value in vars(_solution_module).items():
+            if isinstance(value, types.FunctionType) and value.__module__ == _solution_module.__name__:
+                solution_ns[name] = _rebind(value, solution_ns)
+
+        # timestep module: stages are timed (kernels called directly are
+        # stages and kernels)
+        timestep_ns = dict(vars(_timestep_module))
+        for name, stage in SOLUTION_STAGES.items():
+            func = solution_ns.get(name, timestep_ns[name])
+            if _is_kernel(timestep_ns[name]):
+                func = self.timed("kernel", name, timestep_ns[name])
+            timestep_ns[name] = self.timed("stage", stage, func)
+
+        timestep_ns["reset_initial_conditions"] = self.timed(
+            "season", "reset_initial_conditions",
+            _rebind(_timestep_module.reset_initial_conditions, timestep_ns),
+        )
+        for name in ["solution", "check_model_termination", "update_time"]:
+            setattr(
+                self, name, self.timed("step", name, _rebind(getattr(_timestep_module, name), timestep_ns))
+            )
+
+    def timed(self, section, name, func):
+        """
+        wrap `func` to add its call count and wall time to (`section`, `name`)
+        """
+        key = (section, name)
+        calls, times = self.calls, self.times
+        clock = time.perf_counter
+
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                times[key] += clock() - start
+                calls[key] += 1
+
+        return wrapper
+
+    def report(self):
+        """
+        time spent in each stage, kernel and step function
+
+        *Returns:*
+
+        `report` : `pandas.DataFrame` : one row per timed function with columns
+        `Section` (`step`, `stage`, `kernel` or `season`), `Name`, `Calls`,
+        `Time` (s), `TimePerCall` (us) and `Share` (% of total step time)
+
+        """
+
+        keys = list(self.calls)
+        total = sum(self.times[key] for key in keys if key[0] == "step")
+
+        # daily bookkeeping of `solution` outside the numbered stages
+        stages = sum(self.times[key] for key in keys if key[0] == "stage")
+        other = ("stage", "other (inputs, crop yield, outputs)")
+        calls = dict(self.calls)
+        times = dict(self.times)
+        if ("step", "solution") in calls:
+            calls[other] = calls[("step", "solution")]
+            times[other] = times[("step", "solution")] - stages
+            keys.append(other)
+
+        order = {"step": 0, "season": 1, "stage": 2, "kernel": 3}
+        keys.sort(key=lambda key: (order[key[0]], -times[key]))
+
+        report = pd.DataFrame(
+            {
+                "Section": [key[0] for key in keys],
+                "Name": [key[1] for key in keys],
+                "Calls": [calls[key] for key in keys],
+                "Time": [times[key] for key in keys],
+            }
+        )
+        report["TimePerCall"] = 1e6 * report.Time / np.maximum(report.Calls, 1)
+        report["Share"] = 100 * report.Time / total if total > 0 else 0.0
+
+        return report
+
+
+# Cell
+def object_nbytes(obj, seen=None):
+    """
+    approximate memory (bytes) held by `obj` and the objects it refers to
+
+    numpy arrays count their data buffer (views count the array they view),
+    pandas objects their deep memory usage. Objects already in `seen` (a set
+    of ids) are not counted again. Functions, classes and modules count only
+    their own size.
+
+    *Arguments:*\n
+
+    `obj` : `object` : object to measure
+
+    `seen` : `set` : ids of objects already counted (updated)
+
+    *Returns:*
+
+    `nbytes` : `int` : approximate size in bytes
+
+    """
+
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        # includes the data buffer if the array owns it
+        nbytes = sys.getsizeof(obj)
+        if isinstance(obj.base, np.ndarray):
+            nbytes += object_nbytes(obj.base, seen)
+        elif not obj.flags.owndata:
+            # e.g. memory-mapped data
+            nbytes += obj.nbytes
+        return nbytes
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, (types.ModuleType, types.FunctionType, types.BuiltinFunctionType, type)):
+        return sys.getsizeof(obj)
+
+    nbytes = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            nbytes += object_nbytes(key, seen) + object_nbytes(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for value in obj:
+            nbytes += object_nbytes(value, seen)
+    elif hasattr(obj, "__dict__"):
+        nbytes += object_nbytes(vars(obj), seen)
+
+    return nbytes
+
+
+def model_memory(model):
+    """
+    memory held by an `AquaCropModel`, by component
+
+    Components are measured in order and objects shared between them are
+    counted once, with the first component that refers to them. Objects
+    shared with other models (e.g. the `wdf` weather data of an ensemble)
+    are counted in full.
+
+    *Arguments:*\n
+
+    `model` : `AquaCropModel` : initialized model
+
+    *Returns:*
+
+    `report` : `pandas.DataFrame` : `Component` and `Bytes` for each component
+
+    """
+
+    ParamStruct = model.ParamStruct
+    Soil = ParamStruct.Soil
+    Outputs = model.Outputs
+    components = [
+        ("weather input (wdf)", model.wdf),
+        ("weather_df", model.weather_df),
+        ("weather", model.weather),
+        ("soil profile", Soil.profile),
+        ("soil hydrology", Soil.Hydrology),
+        ("soil compartments", Soil.Profile),
+        ("seasonal crops", [ParamStruct.Seasonal_Crop_List, ParamStruct.Fallow_Crop]),
+        ("GDD", ParamStruct.GDD),
+        ("season forcings", ParamStruct.SeasonForcings),
+        ("water table", [ParamStruct.zGW, ParamStruct.zGW_steps, ParamStruct.zGW_adjustments]),
+        ("other parameters", ParamStruct),
+        ("initial conditions", model.InitCond),
+        ("clock", model.ClockStruct),
+        ("outputs (Water)", Outputs.Water),
+        ("outputs (Flux)", Outputs.Flux),
+        ("outputs (Growth)", Outputs.Growth),
+        ("outputs (other)", Outputs),
+        ("profiler", model.Profiler),
+        ("model inputs", vars(model)),
+    ]
+
+    seen = set()
+    # model attributes are measured through their components
+    seen.add(id(model))
+    report = pd.DataFrame(
+        {
+            "Component": [name for name, _ in components],
+            "Bytes": [object_nbytes(obj, seen) for _, obj in components],
+        }
+    )
+
+    return report
+
+
+# Cell
+def _snapshot(value):
+    """
+    copy of a kernel argument or result that later in-place updates cannot change
+    """
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    if isinstance(value, tuple) and not hasattr(value, "_fields"):
+        return tuple(_snapshot(v) for v in value)
+    return value
+
+
+class KernelRecorder:
+    """
+    Records the arguments and results of the compiled kernels called by
+    `timestep.solution`, e.g. to benchmark or test a kernel on the inputs it
+    gets in real simulations (see `save_kernel_calls`).
+
+    Like `StageProfiler`, instrumented copies of `solution`,
+    `check_model_termination` and `update_time` are built; pass the
+    recorder as `profile` to `AquaCropModel.initialize` to use them.
+
+    **Attributes:**\n
+
+    `calls` : `dict` : list of `(args, result)` for each recorded kernel
+
+    """
+
+    def __init__(self, kernels=None):
+        if kernels is None:
+            kernels = [name for name, value in vars(_timestep_module).items() if _is_kernel(value)]
+        self.calls = {name: [] for name in kernels}
+
+        timestep_ns = dict(vars(_timestep_module))
+        for name in kernels:
+            timestep_ns[name] = self.recorded(name, timestep_ns[name])
+        for name in ["solution", "check_model_termination", "update_time"]:
+            setattr(self, name, _rebind(getattr(_timestep_module, name), timestep_ns))
+
+    def recorded(self, name, func):
+        """
+        wrap kernel `func` to append its arguments and result to `self.calls[name]`
+        """
+        calls = self.calls[name]
+
+        def wrapper(*args):
+            # kernels may update array arguments in place
+            inputs = _snapshot(args)
+            result = func(*args)
+            calls.append((inputs, _snapshot(result)))
+            return result
+
+        return wrapper
+
+    def report(self):
+        """
+        number of recorded calls of each kernel
+
+        *Returns:*
+
+        `report` : `pandas.DataFrame` : `Name` and `Calls` for each kernel
+
+        """
+
+        return pd.DataFrame(
+            {"Name": list(self.calls), "Calls": [len(calls) for calls in self.calls.values()]}
+        )
+
+
+# Cell
+def _encode(values, key, arrays):
+    """
+    store one argument (or result) of every call in `arrays`
+
+    named tuples are stored field by field, values that are the same in all
+    calls once (`<key>.const`) and others stacked along a first axis (or
+    concatenated, if their lengths differ)
+    """
+    first = values[0]
+    if hasattr(first, "_fields"):
+        arrays[key + ".type"] = np.array(type(first).__name__)
+        for i, field in enumerate(first._fields):
+            _encode([value[i] for value in values], f"{key}.{field}", arrays)
+        return
+
+    values = [np.asarray(value) for value in values]
+    if all(
+        (value.dtype == values[0].dtype) and np.array_equal(value, values[0], equal_nan=True)
+        for value in values[1:]
+    ):
+        arrays[key + ".const"] = values[0]
+    elif all(value.shape == values[0].shape for value in values):
+        arrays[key] = np.stack(values)
+    else:
+        # arrays whose length differs between calls are concatenated
+        arrays[key + ".ragged"] = np.concatenate(values)
+        arrays[key + ".offsets"] = np.cumsum([0] + [len(value) for value in values])
+
+
+def _decode(arrays, key, call):
+    if key + ".type" in arrays:
+        NT = getattr(_classes_module, str(arrays[key + ".type"]))
+        return NT(*[_decode(arrays, f"{key}.{field}", call) for field in NT._fields])
+
+    if key + ".const" in arrays:
+        value = arrays[key + ".const"]
+    elif key + ".ragged" in arrays:
+        offsets = arrays[key + ".offsets"]
+        value = arrays[key + ".ragged"][offsets[call] : offsets[call + 1]]
+    else:
+        value = arrays[key][call]
+    # scalars are passed as numpy scalars
+    return value[()] if value.ndim == 0 else value.copy()
+
+
+def save_kernel_calls(path, calls):
+    """
+    save recorded calls of one kernel to a compressed `.npz` file
+
+    *Arguments:*\n
+
+    `path` : `str` : file name
+
+    `calls` : `list` : `(args, result)` of each call (see `KernelRecorder`)
+
+    """
+
+    assert len(calls) > 0, "no calls to save"
+    arrays = {"ncalls": np.array(len(calls)), "nargs": np.array(len(calls[0][0]))}
+    single = not isinstance(calls[0][1], tuple)
+    arrays["single_result"] = np.array(single)
+    for i in range(len(calls[0][0])):
+        _encode([args[i] for args, _ in calls], f"arg{i}", arrays)
+    results = [(result,) if single else result for _, result in calls]
+    arrays["nresults"] = np.array(len(results[0]))
+    for i in range(len(results[0])):
+        _encode([result[i] for result in results], f"result{i}", arrays)
+
+    np.savez_compressed(path, **arrays)
+
+
+def load_kernel_calls(path):
+    """
+    load calls of a kernel saved by `save_kernel_calls`
+
+    *Arguments:*\n
+
+    `path` : `str` : file name
+
+    *Returns:*
+
+    `calls` : `list` : `(args, result)` of each call; arrays are fresh copies
+
+    """
+
+    with np.load(path) as npz:
+        arrays = {key: npz[key] for key in npz.files}
+
+    calls = []
+    for call in range(int(arrays["ncalls"])):
+        args = tuple(_decode(arrays, f"arg{i}", call) for i in range(int(arrays["nargs"])))
+        result = tuple(_decode(arrays, f"result{i}", call) for i in range(int(arrays["nresults"])))
+        calls.append((args, result[0] if arrays["single_result"] else result))
+
+    return calls
+
+
+# Cell
+class _CalibrationState:
+    pass
+
+
+def calibration_time(repeat=7, n=100_000):
+    """
+    best time of a fixed workload that scales with the machine like the
+    simulation does: python scalar arithmetic, attribute access, small numpy
+    array operations and a pandas lookup. Dividing run times by it gives
+    scores that can be compared across machines.
+
+    *Arguments:*\n
+
+    `repeat` : `int` : number of timed repeats
+
+    `n` : `int` : size of the workload
+
+    *Returns:*
+
+    `time` : `float` : best time (s)
+
+    """
+
+    dates = pd.date_range("2000/01/01", periods=366)
+
+    times = []
+    for _ in range(repeat):
+        state = _CalibrationState()
+        state.th = np.linspace(0.1, 0.4, 12)
+        state.total = 0.0
+
+        start = time.perf_counter()
+        for i in range(n):
+            state.total += (i % 7) * 0.5 - state.total * 1e-6
+            if i % 50 == 0:
+                state.th = np.minimum(state.th * 1.0001, 0.45)
+                state.total += state.th.sum() + dates[i % 366].month
+        times.append(time.perf_counter() - start)
+
+    return min(times)
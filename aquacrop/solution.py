@@ -8,6 +8,7 @@
 
 # remove functions from __all__ as they become replace by compiled equivalent
 __all__ = [
+    "root_zone_summary",
     "pre_irrigation",
     "capillary_rise",
     "irrigation",
@@ -45,11 +46,12 @@ if __name__ != "__main__":
         _water_stress,
         _evap_layer_water_content,
         _root_zone_water,
+        _comp_above_depth,
         _cc_development,
+        _potential_canopy_cover,
         _update_CCx_CDC,
         _cc_required_time,
         _aeration_stress, 
-        _temperature_stress, 
         _HIadj_pre_anthesis,                      
         _HIadj_post_anthesis, 
         _HIadj_pollination
@@ -118,6 +120,86 @@ def growing_degree_day(GDDmethod, Tupp, Tbase, Tmax, Tmin):
 
     return GDD
 
+# Cell
+@njit
+@cc.export("_comp_above_depth", (SoilProfileNT_typ_sig,f8))
+def comp_above_depth(prof, z):
+    """
+    Function to count soil compartments whose bottom lies above depth `z`,
+    i.e. `np.sum(prof.dzsum < z)`, using the depth lookup table of the profile
+
+    The table gives the count at the grid depth just above `z`, which is then
+    corrected by comparing with the compartment boundaries directly, so the
+    result is exact for any depth.
+
+
+    *Arguments:*
+
+
+    `prof`: `SoilProfileClass` : Soil object containing soil paramaters
+
+    `z`: `float` : depth (m)
+
+
+    *Returns:*
+
+
+    `n`: `int` : number of compartments with `dzsum < z`
+
+
+    """
+
+    k = int(z / SOIL_DEPTH_RES) - 1
+    if k < 0:
+        k = 0
+    elif k >= prof.zIdx.shape[0]:
+        k = prof.zIdx.shape[0] - 1
+
+    n = prof.zIdx[k]
+    while (n < prof.dzsum.shape[0]) and (prof.dzsum[n] < z):
+        n = n + 1
+
+    return n
+
+
+# Cell
+@njit
+@cc.export("_comp_within_depth", (SoilProfileNT_typ_sig,f8))
+def comp_within_depth(prof, z):
+    """
+    Function to count soil compartments whose bottom lies at or above depth `z`,
+    i.e. `np.sum(prof.dzsum <= z)`, using the depth lookup table of the profile
+
+
+    *Arguments:*
+
+
+    `prof`: `SoilProfileClass` : Soil object containing soil paramaters
+
+    `z`: `float` : depth (m)
+
+
+    *Returns:*
+
+
+    `n`: `int` : number of compartments with `dzsum <= z`
+
+
+    """
+
+    k = int(z / SOIL_DEPTH_RES) - 1
+    if k < 0:
+        k = 0
+    elif k >= prof.zIdx.shape[0]:
+        k = prof.zIdx.shape[0] - 1
+
+    n = prof.zIdx[k]
+    while (n < prof.dzsum.shape[0]) and (prof.dzsum[n] <= z):
+        n = n + 1
+
+    return n
+
+
 # Cell
 @njit
 @cc.export("_root_zone_water", (SoilProfileNT_typ_sig,f8,f8[:],f8,f8,f8))
@@ -167,7 +249,7 @@ def root_zone_water(
     ## Calculate root zone water content and available water ##
     # Compartments covered by the root zone
     rootdepth = round(np.maximum(InitCond_Zroot, Crop_Zmin), 2)
-    comp_sto = np.argwhere(prof.dzsum >= rootdepth).flatten()[0]
+    comp_sto = comp_above_depth(prof, rootdepth)
 
     # Initialise counters
     WrAct = 0
@@ -239,7 +321,7 @@ def root_zone_water(
     if rootdepth > Soil_zTop:
         # Determine compartments covered by the top soil
         ztopdepth = round(Soil_zTop, 2)
-        comp_sto = np.sum(prof.dzsum <= ztopdepth)
+        comp_sto = comp_within_depth(prof, ztopdepth)
         # Initialise counters
         WrAct_Zt = 0
         WrFC_Zt = 0
@@ -291,6 +373,51 @@ def root_zone_water(
     )
 
 
+# Cell
+def root_zone_summary(prof, Soil_zTop, Crop, NewCond):
+    """
+    Function to get the root zone water of the current day
+
+    The result of `_root_zone_water` is kept in `NewCond.RootZone` and
+    shared by the stages that read it. Every stage that changes `NewCond.th`
+    resets it to None (as does the start of each day), so it is computed
+    again on the next read.
+
+
+    *Arguments:*
+
+
+    `prof`: `SoilProfileClass` : Soil profile object
+
+    `Soil_zTop`: `float` : top soil depth
+
+    `Crop`: `CropStruct` : Crop paramaters
+
+    `NewCond`: `InitCondClass` : InitCond object containing model paramaters
+
+
+    *Returns:*
+
+
+    `RootZone`: `tuple` : `WrAct`, `Dr_Zt`, `Dr_Rz`, `TAW_Zt`, `TAW_Rz`, `thRZ_Act`, `thRZ_S`, `thRZ_FC`, `thRZ_WP`, `thRZ_Dry`, `thRZ_Aer` (see `root_zone_water`)
+
+
+
+    """
+
+    if NewCond.RootZone is None:
+        NewCond.RootZone = _root_zone_water(
+            prof,
+            float(NewCond.Zroot),
+            NewCond.th,
+            Soil_zTop,
+            float(Crop.Zmin),
+            Crop.Aer,
+        )
+
+    return NewCond.RootZone
+
+
 # Cell
 @cc.export("_check_groundwater_table", (SoilProfileNT_typ_sig,f8,f8[:],f8[:],i8,f8))
 def check_groundwater_table(
@@ -555,7 +682,7 @@ def root_development(Crop,
             ZiTmp = float(Zroot_init + dZr)
             # Find compartment that root zone will expand in to
             # compi_index = prof.dzsum[prof.dzsum>=ZiTmp].index[0] # have changed to index
-            idx = np.argwhere(prof.dzsum >= ZiTmp).flatten()[0]
+            idx = comp_above_depth(prof, ZiTmp)
             prof = prof
             # Get TAW in compartment
             layeri = prof.Layer[idx]
@@ -666,7 +793,7 @@ def pre_irrigation(prof, Crop, InitCond, GrowingSeason, IrrMngt):
             # Determine compartments covered by the root zone
             rootdepth = round(max(NewCond.Zroot, Crop.Zmin), 2)
 
-            compRz = np.argwhere(prof.dzsum >= rootdepth).flatten()[0]
+            compRz = _comp_above_depth(prof, rootdepth)
 
             PreIrr = 0
             for ii in range(int(compRz)):
@@ -680,6 +807,7 @@ def pre_irrigation(prof, Crop, InitCond, GrowingSeason, IrrMngt):
                 if NewCond.th[ii] < thCrit:
                     PreIrr = PreIrr + ((thCrit - NewCond.th[ii]) * 1000 * prof.dz[ii])
                     NewCond.th[ii] = thCrit
+                    NewCond.RootZone = None
 
     else:
         PreIrr = 0
@@ -687,11 +815,64 @@ def pre_irrigation(prof, Crop, InitCond, GrowingSeason, IrrMngt):
     return NewCond, PreIrr
 
 
+# Cell
+@njit
+@cc.export("_drainage_ability", (f8,f8,f8,f8,f8,f8))
+def drainage_ability(th, th_fc_Adj, th_fc, th_s, dthdt_sat, dthdt_den):
+    """
+    Function to calculate the drainage ability (m3/m3/day) of a compartment
+    at water content `th`
+
+    <a href="../pdfs/ac_ref_man_3.pdf#page=51" target="_blank">Reference Manual: drainage calculations</a> (pg. 42-65)
+
+
+    *Arguments:*
+
+
+    `th`: `float` : water content
+
+    `th_fc_Adj`: `float` : adjusted water content at field capacity
+
+    `th_fc`: `float` : water content at field capacity
+
+    `th_s`: `float` : water content at saturation
+
+    `dthdt_sat`: `float` : drainage ability at saturation, `tau * (th_s - th_fc)`
+
+    `dthdt_den`: `float` : `exp(th_s - th_fc) - 1`
+
+
+    *Returns:*
+
+
+    `dthdt`: `float` : drainage ability
+
+
+    """
+
+    if th <= th_fc_Adj:
+        dthdt = 0
+
+    elif th >= th_s:
+        dthdt = dthdt_sat
+
+        if (th - dthdt) < th_fc_Adj:
+            dthdt = th - th_fc_Adj
+
+    else:
+        dthdt = dthdt_sat * ((np.exp(th - th_fc) - 1) / dthdt_den)
+
+        if (th - dthdt) < th_fc_Adj:
+            dthdt = th - th_fc_Adj
+
+    return dthdt
+
+
 # Cell
 # @njit()
-@cc.export("_drainage", (SoilProfileNT_typ_sig,f8[:],f8[:]))
+@cc.export("_drainage", (SoilProfileNT_typ_sig,f8[:],f8[:],i8[:]))
 def drainage(
-    prof, th_init, th_fc_Adj_init
+    prof, th_init, th_fc_Adj_init, LoopCounts
 ):
     """
     Function to redistribute stored soil water
@@ -711,6 +892,8 @@ def drainage(
 
     `th_fc_Adj_init`: `np.array` : adjusted water content at field capacity
 
+    `LoopCounts`: `np.array` : loop iteration counters (see `LOOP_COUNTERS`); excess redistribution steps are added
+
 
     *Returns:*
 
@@ -749,26 +932,13 @@ def drainage(
         cdz = prof.dz[ii]
         cdzsum = prof.dzsum[ii]
         cKsat = prof.Ksat[ii]
+        cdthdt_sat = prof.dthdt_sat[ii]
+        cdthdt_den = prof.dthdt_den[ii]
 
         # Calculate drainage ability of compartment ii
-        if th_init[ii] <= th_fc_Adj_init[ii]:
-            dthdt = 0
-
-        elif th_init[ii] >= cth_s:
-            dthdt = ctau * (cth_s - cth_fc)
-
-            if (th_init[ii] - dthdt) < th_fc_Adj_init[ii]:
-                dthdt = th_init[ii] - th_fc_Adj_init[ii]
-
-        else:
-            dthdt = (
-                ctau
-                * (cth_s - cth_fc)
-                * ((np.exp(th_init[ii] - cth_fc) - 1) / (np.exp(cth_s - cth_fc) - 1))
-            )
-
-            if (th_init[ii] - dthdt) < th_fc_Adj_init[ii]:
-                dthdt = th_init[ii] - th_fc_Adj_init[ii]
+        dthdt = drainage_ability(
+            th_init[ii], th_fc_Adj_init[ii], cth_fc, cth_s, cdthdt_sat, cdthdt_den
+        )
 
         # Drainage from compartment ii (mm)
         draincomp = dthdt * cdz * 1000
@@ -806,7 +976,7 @@ def drainage(
             if dthdt <= 0:
                 thX = th_fc_Adj_init[ii]
             elif ctau > 0:
-                A = 1 + ((dthdt * (np.exp(cth_s - cth_fc) - 1)) / (ctau * (cth_s - cth_fc)))
+                A = 1 + ((dthdt * cdthdt_den) / cdthdt_sat)
                 thX = cth_fc + np.log(A)
                 if thX < th_fc_Adj_init[ii]:
                     thX = th_fc_Adj_init[ii]
@@ -826,22 +996,9 @@ def drainage(
                     # at theta_x.
                     drainsum = (thnew[ii] - thX) * 1000 * cdz
                     # Calculate drainage ability for thX
-                    if thX <= th_fc_Adj_init[ii]:
-                        dthdt = 0
-                    elif thX >= cth_s:
-                        dthdt = ctau * (cth_s - cth_fc)
-                        if (thX - dthdt) < th_fc_Adj_init[ii]:
-                            dthdt = thX - th_fc_Adj_init[ii]
-
-                    else:
-                        dthdt = (
-                            ctau
-                            * (cth_s - cth_fc)
-                            * ((np.exp(thX - cth_fc) - 1) / (np.exp(cth_s - cth_fc) - 1))
-                        )
-
-                        if (thX - dthdt) < th_fc_Adj_init[ii]:
-                            dthdt = thX - th_fc_Adj_init[ii]
+                    dthdt = drainage_ability(
+                        thX, th_fc_Adj_init[ii], cth_fc, cth_s, cdthdt_sat, cdthdt_den
+                    )
 
                     # Update drainage total
                     drainsum = drainsum + (dthdt * 1000 * cdz)
@@ -856,21 +1013,9 @@ def drainage(
 
                 elif thnew[ii] > th_fc_Adj_init[ii]:
                     # Calculate drainage ability for updated water content
-                    if thnew[ii] <= th_fc_Adj_init[ii]:
-                        dthdt = 0
-                    elif thnew[ii] >= cth_s:
-                        dthdt = ctau * (cth_s - cth_fc)
-                        if (thnew[ii] - dthdt) < th_fc_Adj_init[ii]:
-                            dthdt = thnew[ii] - th_fc_Adj_init[ii]
-
-                    else:
-                        dthdt = (
-                            ctau
-                            * (cth_s - cth_fc)
-                            * ((np.exp(thnew[ii] - cth_fc) - 1) / (np.exp(cth_s - cth_fc) - 1))
-                        )
-                        if (thnew[ii] - dthdt) < th_fc_Adj_init[ii]:
-                            dthdt = thnew[ii] - th_fc_Adj_init[ii]
+                    dthdt = drainage_ability(
+                        thnew[ii], th_fc_Adj_init[ii], cth_fc, cth_s, cdthdt_sat, cdthdt_den
+                    )
 
                     # Update water content in compartment ii
                     thnew[ii] = thnew[ii] - dthdt
@@ -897,21 +1042,9 @@ def drainage(
                 if thnew[ii] <= cth_s:
                     if thnew[ii] > th_fc_Adj_init[ii]:
                         # Calculate new drainage ability
-                        if thnew[ii] <= th_fc_Adj_init[ii]:
-                            dthdt = 0
-                        elif thnew[ii] >= cth_s:
-                            dthdt = ctau * (cth_s - cth_fc)
-                            if (thnew[ii] - dthdt) < th_fc_Adj_init[ii]:
-                                dthdt = thnew[ii] - th_fc_Adj_init[ii]
-
-                        else:
-                            dthdt = (
-                                ctau
-                                * (cth_s - cth_fc)
-                                * ((np.exp(thnew[ii] - cth_fc) - 1) / (np.exp(cth_s - cth_fc) - 1))
-                            )
-                            if (thnew[ii] - dthdt) < th_fc_Adj_init[ii]:
-                                dthdt = thnew[ii] - th_fc_Adj_init[ii]
+                        dthdt = drainage_ability(
+                            thnew[ii], th_fc_Adj_init[ii], cth_fc, cth_s, cdthdt_sat, cdthdt_den
+                        )
 
                         # Update water content in compartment ii
                         thnew[ii] = thnew[ii] - dthdt
@@ -930,21 +1063,9 @@ def drainage(
                     # Calculate excess drainage above saturation
                     excess = (thnew[ii] - cth_s) * 1000 * cdz
                     # Calculate drainage ability for updated water content
-                    if thnew[ii] <= th_fc_Adj_init[ii]:
-                        dthdt = 0
-                    elif thnew[ii] >= cth_s:
-                        dthdt = ctau * (cth_s - cth_fc)
-                        if (thnew[ii] - dthdt) < th_fc_Adj_init[ii]:
-                            dthdt = thnew[ii] - th_fc_Adj_init[ii]
-
-                    else:
-                        dthdt = (
-                            ctau
-                            * (cth_s - cth_fc)
-                            * ((np.exp(thnew[ii] - cth_fc) - 1) / (np.exp(cth_s - cth_fc) - 1))
-                        )
-                        if (thnew[ii] - dthdt) < th_fc_Adj_init[ii]:
-                            dthdt = thnew[ii] - th_fc_Adj_init[ii]
+                    dthdt = drainage_ability(
+                        thnew[ii], th_fc_Adj_init[ii], cth_fc, cth_s, cdthdt_sat, cdthdt_den
+                    )
 
                     # Update water content in compartment ii
                     thnew[ii] = cth_s - dthdt
@@ -973,6 +1094,7 @@ def drainage(
         if excess > 0:
             precomp = ii + 1
             while (excess > 0) and (precomp != 0):
+                LoopCounts[1] += 1
                 # Update compartment counter
                 precomp = precomp - 1
                 # Update layer counter
@@ -1089,11 +1211,7 @@ def rainfall_partition(
             )
             # Check which compartment cover depth of top soil used to adjust
             # curve number
-            comp_sto_array = prof.dzsum[prof.dzsum >= Soil_zCN]
-            if comp_sto_array.shape[0] == 0:
-                comp_sto = int(Soil_nComp)
-            else:
-                comp_sto = int(Soil_nComp - comp_sto_array.shape[0])
+            comp_sto = int(comp_above_depth(prof, Soil_zCN))
 
             # Calculate weighting factors by compartment
             xx = 0
@@ -1157,7 +1275,8 @@ def irrigation(
     IrrMngt_AppEff,
     IrrMngt_MaxIrr,
     IrrMngt_IrrInterval,
-    IrrMngt_Schedule,
+    IrrMngt_ScheduleDays,
+    IrrMngt_ScheduleDepths,
     IrrMngt_depth,
     IrrMngt_MaxIrrSeason,
     NewCond_GrowthStage,
@@ -1165,7 +1284,7 @@ def irrigation(
     NewCond_Epot,
     NewCond_Tpot,
     NewCond_Zroot,
-    NewCond_th,
+    NewCond,
     NewCond_DAP,
     NewCond_TimeStepCounter,
     Crop, prof, Soil_zTop, GrowingSeason, Rain, Runoff):
@@ -1180,7 +1299,7 @@ def irrigation(
     *Arguments:*
 
 
-    `InitCond`: `InitCondClass` : InitCond object containing model paramaters
+    `NewCond`: `InitCondClass` : InitCond object containing model paramaters (root zone water, see `root_zone_summary`)
 
     `IrrMngt`: `IrrMngtStruct`: jit class object containing irrigation management paramaters
 
@@ -1224,14 +1343,7 @@ def irrigation(
             thRZ_WP,
             thRZ_Dry,
             thRZ_Aer,
-        ) = _root_zone_water(
-            prof,
-            float(NewCond_Zroot),
-            NewCond_th,
-            Soil_zTop,
-            float(Crop.Zmin),
-            Crop.Aer,
-        )
+        ) = root_zone_summary(prof, Soil_zTop, Crop, NewCond)
         # WrAct,Dr_,TAW_,thRZ = root_zone_water(prof,float(NewCond.Zroot),NewCond.th,Soil_zTop,float(Crop.Zmin),Crop.Aer)
         # Use root zone depletions and TAW only for triggering irrigation
         Dr = Dr_Rz
@@ -1295,8 +1407,12 @@ def irrigation(
         elif IrrMngt_IrrMethod == 3:  # Irrigation - pre-defined schedule
             # Get current date
             idx = NewCond_TimeStepCounter
-            # Find irrigation value corresponding to current date
-            Irr = IrrMngt_Schedule[idx]
+            # Find irrigation event on current date (no irrigation if none)
+            k = np.searchsorted(IrrMngt_ScheduleDays, idx)
+            if (k < len(IrrMngt_ScheduleDays)) and (IrrMngt_ScheduleDays[k] == idx):
+                Irr = IrrMngt_ScheduleDepths[k]
+            else:
+                Irr = 0.0
 
             assert Irr >= 0
 
@@ -1336,7 +1452,7 @@ def irrigation(
 
 # Cell
 # @njit()
-@cc.export("_infiltration", (SoilProfileNT_typ_sig,f8,f8[:],f8[:],f8,f8,f8,b1,f8,f8[:],f8,f8,b1))
+@cc.export("_infiltration", (SoilProfileNT_typ_sig,f8,f8[:],f8[:],f8,f8,f8,b1,f8,f8[:],f8,f8,b1,i8[:]))
 def infiltration(
      prof,
      NewCond_SurfaceStorage, 
@@ -1350,7 +1466,8 @@ def infiltration(
      FluxOut, 
      DeepPerc0, 
      Runoff0, 
-     GrowingSeason
+     GrowingSeason,
+     LoopCounts
 ):
     """
     Function to infiltrate incoming water (rainfall and irrigation)
@@ -1383,6 +1500,8 @@ def infiltration(
 
     `GrowingSeason`:: `bool` : is growing season (True or Flase)
 
+    `LoopCounts`: `np.array` : loop iteration counters (see `LOOP_COUNTERS`); excess redistribution steps are added
+
 
     *Returns:*
 
@@ -1554,6 +1673,7 @@ def infiltration(
             if excess > 0:
                 precomp = ii + 1
                 while (excess > 0) and (precomp != 0):
+                    LoopCounts[2] += 1
                     # Keep storing in compartments above until soil surface is
                     # reached
                     # Update compartment counter
@@ -1790,8 +1910,13 @@ def capillary_rise(prof, Soil_nLayer, Soil_fshape_cr, NewCond, FluxOut, water_ta
                 if MaxCR > LimCR:
                     MaxCR = LimCR
 
+        # compartments visited by the capillary rise loop
+        NewCond.LoopCounts[3] += len(prof.Comp) - 1 - compi
+
         # Store total depth of capillary rise
         CrTot = WCr
+        if CrTot > 0:
+            NewCond.RootZone = None
 
     return NewCond, CrTot
 
@@ -1845,7 +1970,7 @@ def germination(InitCond, Soil_zGerm, prof, Crop_GermThr, Crop_PlantMethod, GDD,
 
         if (NewCond.Germination == False):
             # Find compartments covered by top soil layer affecting germination
-            comp_sto = np.argwhere(prof.dzsum >= Soil_zGerm).flatten()[0]
+            comp_sto = _comp_above_depth(prof, Soil_zGerm)
             # Calculate water content in top soil layer
             Wr = 0
             WrFC = 0
@@ -1959,6 +2084,46 @@ def growth_stage(Crop, InitCond, GrowingSeason):
 
 
 # Cell
+@njit
+@cc.export("_et0_stress_thresholds", "(f8[:],f8[:],f8,f8)")
+def et0_stress_thresholds(Crop_p_up, Crop_p_lo, Crop_ETadj, Et0):
+    """
+    Function to adjust water stress thresholds for reference evapotranspiration
+
+    *Arguments:*
+
+    `Crop_p_up`: `np.array` : upper soil water depletion thresholds
+
+    `Crop_p_lo`: `np.array` : lower soil water depletion thresholds
+
+    `Crop_ETadj`: `float` : adjust thresholds for Et0 (1) or not (0)
+
+    `Et0`: `float` : Reference Evapotranspiration
+
+
+    *Returns:*
+
+    `p_up`: `np.array` : adjusted upper thresholds
+
+    `p_lo`: `np.array` : adjusted lower thresholds
+
+    """
+
+    nstress = len(Crop_p_up)
+
+    p_up = np.ones(nstress) * Crop_p_up
+    p_lo = np.ones(nstress) * Crop_p_lo
+    if Crop_ETadj == 1:
+        # Adjust stress thresholds for Et0 on currentbeta day (don't do this for
+        # pollination water stress coefficient)
+
+        for ii in range(3):
+            p_up[ii] = p_up[ii] + (0.04 * (5 - Et0)) * (np.log10(10 - 9 * p_up[ii]))
+            p_lo[ii] = p_lo[ii] + (0.04 * (5 - Et0)) * (np.log10(10 - 9 * p_lo[ii]))
+
+    return p_up, p_lo
+
+
 @njit
 @cc.export("_water_stress", "(f8[:],f8[:],f8,f8,f8[:],f8,f8,f8,f8,f8)")
 def water_stress(
@@ -2006,15 +2171,7 @@ def water_stress(
     nstress = len(Crop_p_up)
 
     # Store stress thresholds
-    p_up = np.ones(nstress) * Crop_p_up
-    p_lo = np.ones(nstress) * Crop_p_lo
-    if Crop_ETadj == 1:
-        # Adjust stress thresholds for Et0 on currentbeta day (don't do this for
-        # pollination water stress coefficient)
-
-        for ii in range(3):
-            p_up[ii] = p_up[ii] + (0.04 * (5 - Et0)) * (np.log10(10 - 9 * p_up[ii]))
-            p_lo[ii] = p_lo[ii] + (0.04 * (5 - Et0)) * (np.log10(10 - 9 * p_lo[ii]))
+    p_up, p_lo = et0_stress_thresholds(Crop_p_up, Crop_p_lo, Crop_ETadj, Et0)
 
     # Adjust senescence threshold if early sensescence is triggered
     if (beta == True) and (InitCond_tEarlySen > 0):
@@ -2061,7 +2218,7 @@ def water_stress(
 
 
 # Cell
-# @njit()
+@njit
 @cc.export("_cc_development", "f8(f8,f8,f8,f8,f8,unicode_type,f8)")
 def cc_development(CCo, CCx, CGC, CDC, dt, Mode, CCx0):
     """
@@ -2283,9 +2440,125 @@ def update_CCx_CDC(CCprev, CDC, CCx, dt):
     return CCXadj, CDCadj
 
 
+# Cell
+@njit
+@cc.export("_potential_canopy_cover", (CropStructNT_type_sig,f8,f8,f8,f8,f8))
+def potential_canopy_cover(Crop, tCCadj, CCgrow0, CC_NS, CCxAct_NS, CCxW_NS):
+    """
+    Function to calculate potential (non-stressed) canopy cover on current day,
+    as in `canopy_cover`
+
+    *Arguments:*
+
+    `Crop`: `CropStruct` : Crop object
+
+    `tCCadj`: `float` : canopy growth time (days or GDD after planting, less any delay)
+
+    `CCgrow0`: `float` : canopy cover after a day of exponential growth from `Crop.CC0`
+
+    `CC_NS`: `float` : potential canopy cover on previous day
+
+    `CCxAct_NS`: `float` : maximum potential canopy cover so far
+
+    `CCxW_NS`: `float` : maximum potential canopy cover for withered canopy effects
+
+
+    *Returns:*
+
+    `CC_NS`: `float` : potential canopy cover
+
+    `CCxAct_NS`: `float` : maximum potential canopy cover so far
+
+    `CCxW_NS`: `float` : maximum potential canopy cover for withered canopy effects
+
+    """
+
+    InitCond_CC_NS = CC_NS
+
+    if (tCCadj < Crop.Emergence) or (round(tCCadj) > Crop.Maturity):
+        # No canopy development before emergence/germination or after
+        # maturity
+        CC_NS = 0
+    elif tCCadj < Crop.CanopyDevEnd:
+        # Canopy growth can occur
+        if InitCond_CC_NS <= Crop.CC0:
+            # Very small initial CC.
+            CC_NS = CCgrow0
+        else:
+            # Canopy growing
+            tmp_tCC = tCCadj - Crop.Emergence
+            CC_NS = cc_development(
+                Crop.CC0, 0.98 * Crop.CCx, Crop.CGC, Crop.CDC, tmp_tCC, "Growth", Crop.CCx
+            )
+
+        # Update maximum canopy cover size in growing season
+        CCxAct_NS = CC_NS
+    elif tCCadj > Crop.CanopyDevEnd:
+        # No more canopy growth is possible or canopy in decline
+        # Set CCx for calculation of withered canopy effects
+        CCxW_NS = CCxAct_NS
+        if tCCadj < Crop.Senescence:
+            # Mid-season stage - no canopy growth
+            CC_NS = InitCond_CC_NS
+            # Update maximum canopy cover size in growing season
+            CCxAct_NS = CC_NS
+        else:
+            # Late-season stage - canopy decline
+            tmp_tCC = tCCadj - Crop.Senescence
+            CC_NS = cc_development(
+                Crop.CC0,
+                CCxAct_NS,
+                Crop.CGC,
+                Crop.CDC,
+                tmp_tCC,
+                "Decline",
+                CCxAct_NS,
+            )
+
+    return CC_NS, CCxAct_NS, CCxW_NS
+
+
+# Cell
+@cc.export("_season_potential_canopy", (CropStructNT_type_sig,f8[:],f8[:]))
+def season_potential_canopy(Crop, tCC, CCgrow0):
+    """
+    Function to calculate the potential (non-stressed) canopy cover trajectory
+    over a growing season, for germination on the day of planting
+
+    *Arguments:*
+
+    `Crop`: `CropStruct` : Crop object
+
+    `tCC`: `np.array` : canopy growth time on each day after planting (entry 0 is planting)
+
+    `CCgrow0`: `np.array` : canopy cover after a day of exponential growth from `Crop.CC0` on each day
+
+
+    *Returns:*
+
+    `CC_NS`: `np.array` : potential canopy cover (entry 0 is the state at planting)
+
+    `CCxAct_NS`: `np.array` : maximum potential canopy cover so far
+
+    `CCxW_NS`: `np.array` : maximum potential canopy cover for withered canopy effects
+
+    """
+
+    ndays = len(tCC)
+    CC_NS = np.zeros(ndays)
+    CCxAct_NS = np.zeros(ndays)
+    CCxW_NS = np.zeros(ndays)
+    for k in range(1, ndays):
+        CC_NS[k], CCxAct_NS[k], CCxW_NS[k] = potential_canopy_cover(
+            Crop, tCC[k], CCgrow0[k], CC_NS[k - 1], CCxAct_NS[k - 1], CCxW_NS[k - 1]
+        )
+
+    return CC_NS, CCxAct_NS, CCxW_NS
+
+
 # Cell
 # @njit()
-def canopy_cover(Crop, prof, Soil_zTop, InitCond, GDD, Et0, GrowingSeason):
+def canopy_cover(Crop, prof, Soil_zTop, InitCond, GDD, Et0, GrowingSeason, Forcings):
     # def canopy_cover(Crop,Soil_Profile,Soil_zTop,InitCond,GDD,Et0,GrowingSeason):
 
     """
@@ -2311,6 +2584,8 @@ def canopy_cover(Crop, prof, Soil_zTop, InitCond, GDD, Et0, GrowingSeason):
 
     `GrowingSeason`:: `bool` : is it currently within the growing season (True, Flase)
 
+    `Forcings`: `SeasonForcingsClass` : precomputed potential canopy cover for the season
+
     *Returns:*
 
 
@@ -2339,14 +2614,7 @@ def canopy_cover(Crop, prof, Soil_zTop, InitCond, GDD, Et0, GrowingSeason):
         TAW = TAWClass()
         Dr = DrClass()
         # thRZ = thRZClass()
-        _, Dr.Zt, Dr.Rz, TAW.Zt, TAW.Rz, _,_,_,_,_,_ = _root_zone_water(
-            prof,
-            float(NewCond.Zroot),
-            NewCond.th,
-            Soil_zTop,
-            float(Crop.Zmin),
-            Crop.Aer,
-        )
+        _, Dr.Zt, Dr.Rz, TAW.Zt, TAW.Rz, _,_,_,_,_,_ = root_zone_summary(prof, Soil_zTop, Crop, NewCond)
 
         # _,Dr,TAW,_ = root_zone_water(Soil_Profile,float(NewCond.Zroot),NewCond.th,Soil_zTop,float(Crop.Zmin),Crop.Aer)
         # Check whether to use root zone or top soil depletions for calculating
@@ -2364,9 +2632,10 @@ def canopy_cover(Crop, prof, Soil_zTop, InitCond, GDD, Et0, GrowingSeason):
         beta = True
         Ksw = KswClass()
         Ksw.Exp, Ksw.Sto, Ksw.Sen, Ksw.Pol, Ksw.StoLin = _water_stress(
-            Crop.p_up,
-            Crop.p_lo,
-            Crop.ETadj,
+            # thresholds are already adjusted for Et0 (see SeasonForcingsClass)
+            NewCond.p_up_Et0,
+            NewCond.p_lo_Et0,
+            0,
             Crop.beta,
             Crop.fshape_w,
             NewCond.tEarlySen,
@@ -2387,46 +2656,29 @@ def canopy_cover(Crop, prof, Soil_zTop, InitCond, GDD, Et0, GrowingSeason):
             tCCadj = NewCond.GDDcum - NewCond.DelayedGDDs
 
         ## Canopy development (potential) ##
-        if (tCCadj < Crop.Emergence) or (round(tCCadj) > Crop.Maturity):
-            # No canopy development before emergence/germination or after
-            # maturity
-            NewCond.CC_NS = 0
-        elif tCCadj < Crop.CanopyDevEnd:
-            # Canopy growth can occur
-            if InitCond_CC_NS <= Crop.CC0:
-                # Very small initial CC.
-                NewCond.CC_NS = Crop.CC0 * np.exp(Crop.CGC * dtCC)
-                # print(Crop.CC0,np.exp(Crop.CGC*dtCC))
-            else:
-                # Canopy growing
-                tmp_tCC = tCCadj - Crop.Emergence
-                NewCond.CC_NS = _cc_development(
-                    Crop.CC0, 0.98 * Crop.CCx, Crop.CGC, Crop.CDC, tmp_tCC, "Growth", Crop.CCx
-                )
-
-            # Update maximum canopy cover size in growing season
-            NewCond.CCxAct_NS = NewCond.CC_NS
-        elif tCCadj > Crop.CanopyDevEnd:
-            # No more canopy growth is possible or canopy in decline
-            # Set CCx for calculation of withered canopy effects
-            NewCond.CCxW_NS = NewCond.CCxAct_NS
-            if tCCadj < Crop.Senescence:
-                # Mid-season stage - no canopy growth
-                NewCond.CC_NS = InitCond_CC_NS
-                # Update maximum canopy cover size in growing season
-                NewCond.CCxAct_NS = NewCond.CC_NS
-            else:
-                # Late-season stage - canopy decline
-                tmp_tCC = tCCadj - Crop.Senescence
-                NewCond.CC_NS = _cc_development(
-                    Crop.CC0,
-                    NewCond.CCxAct_NS,
-                    Crop.CGC,
-                    Crop.CDC,
-                    tmp_tCC,
-                    "Decline",
-                    NewCond.CCxAct_NS,
-                )
+        # Use the trajectory precomputed for the season (see
+        # SeasonForcingsClass) while the potential canopy is still on it
+        k = NewCond.DAP - NewCond.DelayedCDs
+        if (
+            (0 < k < len(Forcings.tCC))
+            and (tCCadj == Forcings.tCC[k])
+            and (dtCC == Forcings.dtCC[k])
+            and (InitCond_CC_NS == Forcings.CC_NS[k - 1])
+            and (NewCond.CCxAct_NS == Forcings.CCxAct_NS[k - 1])
+            and (NewCond.CCxW_NS == Forcings.CCxW_NS[k - 1])
+        ):
+            NewCond.CC_NS = Forcings.CC_NS[k]
+            NewCond.CCxAct_NS = Forcings.CCxAct_NS[k]
+            NewCond.CCxW_NS = Forcings.CCxW_NS[k]
+        else:
+            NewCond.CC_NS, NewCond.CCxAct_NS, NewCond.CCxW_NS = _potential_canopy_cover(
+                Crop,
+                tCCadj,
+                Crop.CC0 * np.exp(Crop.CGC * dtCC),
+                InitCond_CC_NS,
+                NewCond.CCxAct_NS,
+                NewCond.CCxW_NS,
+            )
 
         ## Canopy development (actual) ##
         if (tCCadj < Crop.Emergence) or (round(tCCadj) > Crop.Maturity):
@@ -2589,9 +2841,9 @@ def canopy_cover(Crop, prof, Soil_zTop, InitCond, GDD, Et0, GrowingSeason):
 
                     Ksw = KswClass()
                     Ksw.Exp, Ksw.Sto, Ksw.Sen, Ksw.Pol, Ksw.StoLin = _water_stress(
-                        Crop.p_up,
-                        Crop.p_lo,
-                        Crop.ETadj,
+                        NewCond.p_up_Et0,
+                        NewCond.p_lo_Et0,
+                        0,
                         Crop.beta,
                         Crop.fshape_w,
                         NewCond.tEarlySen,
@@ -2760,32 +3012,42 @@ def _evap_layer_water_content(
     """
 
     # Find soil compartments covered by evaporation layer
-    comp_sto = np.sum(prof.dzsum < InitCond_EvapZ) + 1
+    comp_sto = comp_above_depth(prof, InitCond_EvapZ) + 1
+    # Last compartment (partly) covered by evaporation layer
+    ii = comp_sto - 1
+
+    # Water storage (mm) in compartments fully above the last one
+    if ii > 0:
+        Wevap_Sat = prof.Wsat_cum[ii - 1]
+        Wevap_Fc = prof.Wfc_cum[ii - 1]
+        Wevap_Wp = prof.Wwp_cum[ii - 1]
+        Wevap_Dry = prof.Wdry_cum[ii - 1]
+    else:
+        Wevap_Sat = 0
+        Wevap_Fc = 0
+        Wevap_Wp = 0
+        Wevap_Dry = 0
 
-    Wevap_Sat = 0
-    Wevap_Fc = 0
-    Wevap_Wp = 0
-    Wevap_Dry = 0
+    # Actual water storage in evaporation layer (mm)
     Wevap_Act = 0
+    for jj in range(ii):
+        Wevap_Act += 1000 * InitCond_th[jj] * prof.dz[jj]
 
-    for ii in range(int(comp_sto)):
-
-        # Determine fraction of soil compartment covered by evaporation layer
-        if prof.dzsum[ii] > InitCond_EvapZ:
-            factor = 1 - ((prof.dzsum[ii] - InitCond_EvapZ) / prof.dz[ii])
-        else:
-            factor = 1
-
-        # Actual water storage in evaporation layer (mm)
-        Wevap_Act += factor * 1000 * InitCond_th[ii] * prof.dz[ii]
-        # Water storage in evaporation layer at saturation (mm)
-        Wevap_Sat += factor * 1000 * prof.th_s[ii] * prof.dz[ii]
-        # Water storage in evaporation layer at field capacity (mm)
-        Wevap_Fc += factor * 1000 * prof.th_fc[ii] * prof.dz[ii]
-        # Water storage in evaporation layer at permanent wilting point (mm)
-        Wevap_Wp += factor * 1000 * prof.th_wp[ii] * prof.dz[ii]
-        # Water storage in evaporation layer at air dry (mm)
-        Wevap_Dry += factor * 1000 * prof.th_dry[ii] * prof.dz[ii]
+    # Determine fraction of last compartment covered by evaporation layer
+    if prof.dzsum[ii] > InitCond_EvapZ:
+        factor = 1 - ((prof.dzsum[ii] - InitCond_EvapZ) / prof.dz[ii])
+    else:
+        factor = 1
+
+    Wevap_Act += factor * 1000 * InitCond_th[ii] * prof.dz[ii]
+    # Water storage in evaporation layer at saturation (mm)
+    Wevap_Sat += factor * 1000 * prof.th_s[ii] * prof.dz[ii]
+    # Water storage in evaporation layer at field capacity (mm)
+    Wevap_Fc += factor * 1000 * prof.th_fc[ii] * prof.dz[ii]
+    # Water storage in evaporation layer at permanent wilting point (mm)
+    Wevap_Wp += factor * 1000 * prof.th_wp[ii] * prof.dz[ii]
+    # Water storage in evaporation layer at air dry (mm)
+    Wevap_Dry += factor * 1000 * prof.th_dry[ii] * prof.dz[ii]
 
     if Wevap_Act < 0:
         Wevap_Act = 0
@@ -2793,12 +3055,144 @@ def _evap_layer_water_content(
     return Wevap_Sat, Wevap_Fc, Wevap_Wp, Wevap_Dry, Wevap_Act
 
 
+# Cell
+@njit
+@cc.export("_expand_evap_layer", (f8[:],f8,f8,f8,f8,SoilProfileNT_typ_sig,f8,f8,f8,f8))
+def _expand_evap_layer(
+    NewCond_th,
+    NewCond_EvapZ,
+    NewCond_Wstage2,
+    Wrel,
+    Wcheck,
+    prof,
+    Soil_EvapZmin,
+    Soil_EvapZmax,
+    Soil_REW,
+    Soil_fWrelExp,
+):
+    """
+    Function to expand the evaporation layer in 1 mm increments while the
+    relative water content is below the expansion threshold
+
+    <a href="../pdfs/ac_ref_man_3.pdf#page=82" target="_blank">Reference Manual: evaporation equations</a> (pg. 73-81)
+
+    Water storage in the evaporation layer is piecewise linear in its depth
+    (linear within each compartment), so each 1 mm candidate depth is first
+    screened with running sums over the compartment breakpoints at O(1)
+    cost. Only the last few depths near the stopping point are evaluated
+    with `_evap_layer_water_content`, so results are identical to stepping
+    with a full profile scan at every millimetre.
+
+
+    *Arguments:*
+
+
+    `NewCond_th`: `np.array` : current water content
+
+    `NewCond_EvapZ`: `float` : current evaporation depth
+
+    `NewCond_Wstage2`: `float` : relative water content at start of stage 2 evaporation
+
+    `Wrel`: `float` : relative depletion of evaporation storage at current depth
+
+    `Wcheck`: `float` : expansion threshold at current depth
+
+    `prof`: `SoilProfileClass` : Soil object containing soil paramaters
+
+    `Soil params`: `float` : soil evaporation parameters
+
+
+    *Returns:*
+
+
+    `NewCond_EvapZ`: `float` : updated evaporation depth
+
+    `Wrel`: `float` : relative depletion of evaporation storage at updated depth
+
+
+
+    """
+
+    if not ((Wrel < Wcheck) and (NewCond_EvapZ < Soil_EvapZmax)):
+        return NewCond_EvapZ, Wrel
+
+    ## Screen candidate depths with running sums ##
+    # water storage (mm) of compartments fully above compartment c
+    Sat_above = 0.0
+    Fc_above = 0.0
+    Dry_above = 0.0
+    Act_above = 0.0
+    c = 0
+    ncomp = prof.dzsum.shape[0]
+    z = NewCond_EvapZ
+    while True:
+        z_next = z + 0.001
+        if not (z_next < Soil_EvapZmax):
+            break
+
+        # move to compartment containing new depth
+        while (c < ncomp - 1) and (prof.dzsum[c] < z_next):
+            Sat_above += 1000 * prof.th_s[c] * prof.dz[c]
+            Fc_above += 1000 * prof.th_fc[c] * prof.dz[c]
+            Dry_above += 1000 * prof.th_dry[c] * prof.dz[c]
+            Act_above += 1000 * NewCond_th[c] * prof.dz[c]
+            c += 1
+
+        # depth of evaporation layer within compartment c
+        dzc = prof.dz[c] - (prof.dzsum[c] - z_next)
+        Wevap_Sat = Sat_above + 1000 * prof.th_s[c] * dzc
+        Wevap_Fc = Fc_above + 1000 * prof.th_fc[c] * dzc
+        Wevap_Dry = Dry_above + 1000 * prof.th_dry[c] * dzc
+        Wevap_Act = Act_above + 1000 * NewCond_th[c] * dzc
+        if Wevap_Act < 0:
+            Wevap_Act = 0
+
+        Wupper = NewCond_Wstage2 * (Wevap_Sat - (Wevap_Fc - Soil_REW)) + (Wevap_Fc - Soil_REW)
+        Wlower = Wevap_Dry
+        if Wupper - Wlower < 1e-6:
+            break
+
+        Wrel_est = (Wevap_Act - Wlower) / (Wupper - Wlower)
+        Wcheck_next = Soil_fWrelExp * (
+            (Soil_EvapZmax - z_next) / (Soil_EvapZmax - Soil_EvapZmin)
+        )
+        # stop screening once expansion might end here (allowing for
+        # rounding differences to the full calculation)
+        if Wrel_est > Wcheck_next - 1e-8:
+            break
+
+        z = z_next
+
+    ## Expand by 1 mm steps from the last depth known to need expansion ##
+    NewCond_EvapZ = z
+    while True:
+        # Expand evaporation layer by 1 mm
+        NewCond_EvapZ = NewCond_EvapZ + 0.001
+        # Update water storage (mm) in evaporation layer
+        Wevap_Sat, Wevap_Fc, Wevap_Wp, Wevap_Dry, Wevap_Act = _evap_layer_water_content(
+            NewCond_th,
+            NewCond_EvapZ,
+            prof,
+        )
+        Wupper = NewCond_Wstage2 * (Wevap_Sat - (Wevap_Fc - Soil_REW)) + (Wevap_Fc - Soil_REW)
+        Wlower = Wevap_Dry
+        # Update relative depletion of evaporation storage
+        Wrel = (Wevap_Act - Wlower) / (Wupper - Wlower)
+        Wcheck = Soil_fWrelExp * (
+            (Soil_EvapZmax - NewCond_EvapZ) / (Soil_EvapZmax - Soil_EvapZmin)
+        )
+        if not ((Wrel < Wcheck) and (NewCond_EvapZ < Soil_EvapZmax)):
+            break
+
+    return NewCond_EvapZ, Wrel
+
+
 # Cell
 # @njit()
 @cc.export(
     "_soil_evaporation", (i8,i8,i8,SoilProfileNT_typ_sig,
     f8,f8,f8,f8,f8,f8,f8,i8,f8,i8,f8,b1,f8,f8,i8,f8,f8,f8,f8[:],f8,f8,f8,f8,f8,f8,
-        f8,b1,f8,f8,f8,f8,f8,f8,f8,b1),
+        f8,b1,f8,f8,f8,f8,f8,f8,f8,b1,i8[:]),
 )
 def soil_evaporation(
     ClockStruct_EvapTimeSteps,
@@ -2840,6 +3234,7 @@ def soil_evaporation(
     Rain,
     Irr,
     GrowingSeason,
+    LoopCounts,
 ):
 
     """
@@ -2874,6 +3269,8 @@ def soil_evaporation(
 
     `GrowingSeason`:: `bool` : is growing season (True or Flase)
 
+    `LoopCounts`: `np.array` : loop iteration counters (see `LOOP_COUNTERS`); 1 mm evaporation layer expansion steps are added
+
 
     *Returns:*
 
@@ -3047,7 +3444,7 @@ def soil_evaporation(
     # Extract water
     if ExtractPotStg1 > 0:
         # Find soil compartments covered by evaporation layer
-        comp_sto = np.sum(prof.dzsum < Soil_EvapZmin) + 1
+        comp_sto = comp_above_depth(prof, Soil_EvapZmin) + 1
         comp = -1
         # prof = Soil_Profile
         while (ExtractPotStg1 > 0) and (comp < comp_sto):
@@ -3137,24 +3534,22 @@ def soil_evaporation(
                 Wcheck = Soil_fWrelExp * (
                     (Soil_EvapZmax - NewCond_EvapZ) / (Soil_EvapZmax - Soil_EvapZmin)
                 )
-                while (Wrel < Wcheck) and (NewCond_EvapZ < Soil_EvapZmax):
-                    # Expand evaporation layer by 1 mm
-                    NewCond_EvapZ = NewCond_EvapZ + 0.001
-                    # Update water storage (mm) in evaporation layer
-                    Wevap_Sat, Wevap_Fc, Wevap_Wp, Wevap_Dry, Wevap_Act = _evap_layer_water_content(
-                        NewCond_th,
-                        NewCond_EvapZ,
-                        prof,
-                    )
-                    Wupper = NewCond_Wstage2 * (Wevap_Sat - (Wevap_Fc - Soil_REW)) + (
-                        Wevap_Fc - Soil_REW
-                    )
-                    Wlower = Wevap_Dry
-                    # Update relative depletion of evaporation storage
-                    Wrel = (Wevap_Act - Wlower) / (Wupper - Wlower)
-                    Wcheck = Soil_fWrelExp * (
-                        (Soil_EvapZmax - NewCond_EvapZ) / (Soil_EvapZmax - Soil_EvapZmin)
-                    )
+                # Expand evaporation layer (1 mm resolution) while depleted
+                EvapZ_prev = NewCond_EvapZ
+                NewCond_EvapZ, Wrel = _expand_evap_layer(
+                    NewCond_th,
+                    NewCond_EvapZ,
+                    NewCond_Wstage2,
+                    Wrel,
+                    Wcheck,
+                    prof,
+                    Soil_EvapZmin,
+                    Soil_EvapZmax,
+                    Soil_REW,
+                    Soil_fWrelExp,
+                )
+                # number of 1 mm expansion steps
+                LoopCounts[0] += round((NewCond_EvapZ - EvapZ_prev) * 1000)
 
             # Get stage 2 evaporation reduction coefficient
             Kr = (np.exp(Soil_fevap * Wrel) - 1) / (np.exp(Soil_fevap) - 1)
@@ -3165,7 +3560,7 @@ def soil_evaporation(
             ToExtractStg2 = Kr * Edt
 
             # Extract water from compartments
-            comp_sto = np.sum(prof.dzsum < NewCond_EvapZ) + 1
+            comp_sto = comp_above_depth(prof, NewCond_EvapZ) + 1
             comp = -1
             # prof = Soil_Profile
             while (ToExtractStg2 > 0) and (comp < comp_sto):
@@ -3492,14 +3887,7 @@ def transpiration(
             thRZ.WP,
             thRZ.Dry,
             thRZ.Aer,
-        ) = _root_zone_water(
-            prof,
-            float(NewCond.Zroot),
-            NewCond.th,
-            Soil_zTop,
-            float(Crop.Zmin),
-            Crop.Aer,
-        )
+        ) = root_zone_summary(prof, Soil_zTop, Crop, NewCond)
 
         class_args = {key:value for key, value in thRZ.__dict__.items() if not key.startswith('__') and not callable(key)}
         thRZ = thRZNT(**class_args)
@@ -3520,9 +3908,10 @@ def transpiration(
         beta = True
         Ksw = KswClass()
         Ksw.Exp, Ksw.Sto, Ksw.Sen, Ksw.Pol, Ksw.StoLin = _water_stress(
-            Crop.p_up,
-            Crop.p_lo,
-            Crop.ETadj,
+            # thresholds are already adjusted for Et0 (see SeasonForcingsClass)
+            NewCond.p_up_Et0,
+            NewCond.p_lo_Et0,
+            0,
             Crop.beta,
             Crop.fshape_w,
             NewCond.tEarlySen,
@@ -3545,7 +3934,7 @@ def transpiration(
         ## Determine compartments covered by root zone ##
         # Compartments covered by the root zone
         rootdepth = round(max(float(NewCond.Zroot), float(Crop.Zmin)), 2)
-        comp_sto = min(np.sum(Soil_Profile.dzsum < rootdepth) + 1, int(Soil_nComp))
+        comp_sto = min(_comp_above_depth(Soil_Profile, rootdepth) + 1, int(Soil_nComp))
         RootFact = np.zeros(int(Soil_nComp))
         # Determine fraction of each compartment covered by root zone
         for ii in range(comp_sto):
@@ -3588,9 +3977,8 @@ def transpiration(
 
             # Determine TAW (m3/m3) for compartment
             thTAW = prof.th_fc[comp] - prof.th_wp[comp]
-            if Crop.ETadj == 1:
-                # Adjust stomatal stress threshold for Et0 on current day
-                p_up_sto = Crop.p_up[1] + (0.04 * (5 - Et0)) * (np.log10(10 - 9 * Crop.p_up[1]))
+            # Stomatal stress threshold (adjusted for Et0 on current day)
+            p_up_sto = NewCond.p_up_Et0[1]
 
             # Determine critical water content at which stomatal closure will
             # occur in compartment
@@ -3686,6 +4074,11 @@ def transpiration(
             # Update actual transpiration
             TrAct = TrAct + (Sink * 1000 * prof.dz[comp])
 
+        # compartments visited by the extraction loop
+        NewCond.LoopCounts[4] += comp + 1
+        if TrAct > 0:
+            NewCond.RootZone = None
+
         ## Add net irrigation water requirement (if this mode is specified) ##
         if (IrrMngt_IrrMethod == 4) and (TrPot > 0):
             # Initialise net irrigation counter
@@ -3707,14 +4100,7 @@ def transpiration(
                 thRZ.WP,
                 thRZ.Dry,
                 thRZ.Aer,
-            ) = _root_zone_water(
-                prof,
-                float(NewCond.Zroot),
-                NewCond.th,
-                Soil_zTop,
-                float(Crop.Zmin),
-                Crop.Aer,
-            )
+            ) = root_zone_summary(prof, Soil_zTop, Crop, NewCond)
 
             # _,_Dr,_TAW,thRZ = root_zone_water(Soil_Profile,float(NewCond.Zroot),NewCond.th,Soil_zTop,float(Crop.Zmin),Crop.Aer)
             NewCond.Depletion = Dr.Rz
@@ -3744,6 +4130,7 @@ def transpiration(
                     NewCond.th[ii] = NewCond.th[ii] + (dWC / (1000 * prof.dz[ii]))
                     # Update net irrigation counter
                     IrrNet = IrrNet + dWC
+                NewCond.RootZone = None
 
             # Update net irrigation counter for the growing season
             NewCond.IrrNetCum = NewCond.IrrNetCum + IrrNet
@@ -3840,6 +4227,7 @@ def groundwater_inflow(prof, NewCond):
                 # Update water content
                 dth = prof.th_s[ii] - NewCond.th[ii]
                 NewCond.th[ii] = prof.th_s[ii]
+                NewCond.RootZone = None
                 # Update groundwater inflow
                 GwIn = GwIn + (dth * 1000 * prof.dz[ii])
 
@@ -3848,7 +4236,111 @@ def groundwater_inflow(prof, NewCond):
 
 # Cell
 # @njit()
-@cc.export("_HIref_current_day", (f8,i8,i8,b1,f8,f8,CropStructNT_type_sig,b1))
+@njit
+@cc.export("_reference_harvest_index", (CropStructNT_type_sig,f8))
+def reference_harvest_index(Crop, HIt):
+    """
+    Function to calculate reference harvest index and percentage of lag phase
+    completed after `HIt` days of harvest index build-up
+
+    *Arguments:*
+
+    `Crop`: `CropStruct` : Crop object containing Crop paramaters
+
+    `HIt`: `float` : days of harvest index build-up (> 0)
+
+
+    *Returns:*
+
+    `HIref`: `float` : reference harvest index
+
+    `PctLagPhase`: `float` : percentage of lag phase completed
+
+    """
+
+    NewCond_HIref = 0.
+    NewCond_PctLagPhase = 0.
+
+    # Check crop type
+    if (Crop.CropType == 1) or (Crop.CropType == 2):
+        # If crop type is leafy vegetable or root/tuber, then proceed with
+        # logistic growth (i.e. no linear switch)
+        NewCond_PctLagPhase = 100  # No lag phase
+        # Calculate reference harvest index for current day
+        NewCond_HIref = (Crop.HIini * Crop.HI0) / (
+            Crop.HIini + (Crop.HI0 - Crop.HIini) * np.exp(-Crop.HIGC * HIt)
+        )
+        # Harvest index apprAOSP_hing maximum limit
+        if NewCond_HIref >= (0.9799 * Crop.HI0):
+            NewCond_HIref = Crop.HI0
+
+    elif Crop.CropType == 3:
+        # If crop type is fruit/grain producing, check for linear switch
+        if HIt < Crop.tLinSwitch:
+            # Not yet reached linear switch point, therefore proceed with
+            # logistic build-up
+            NewCond_PctLagPhase = 100 * (HIt / Crop.tLinSwitch)
+            # Calculate reference harvest index for current day
+            # (logistic build-up)
+            NewCond_HIref = (Crop.HIini * Crop.HI0) / (
+                Crop.HIini + (Crop.HI0 - Crop.HIini) * np.exp(-Crop.HIGC * HIt)
+            )
+        else:
+            # Linear switch point has been reached
+            NewCond_PctLagPhase = 100
+            # Calculate reference harvest index for current day
+            # (logistic portion)
+            NewCond_HIref = (Crop.HIini * Crop.HI0) / (
+                Crop.HIini
+                + (Crop.HI0 - Crop.HIini) * np.exp(-Crop.HIGC * Crop.tLinSwitch)
+            )
+            # Calculate reference harvest index for current day
+            # (total - logistic portion + linear portion)
+            NewCond_HIref = NewCond_HIref + (Crop.dHILinear * (HIt - Crop.tLinSwitch))
+
+    # Limit HIref and round off computed value
+    if NewCond_HIref > Crop.HI0:
+        NewCond_HIref = Crop.HI0
+    elif NewCond_HIref <= (Crop.HIini + 0.004):
+        NewCond_HIref = 0
+    elif (Crop.HI0 - NewCond_HIref) < 0.004:
+        NewCond_HIref = Crop.HI0
+
+    return NewCond_HIref, NewCond_PctLagPhase
+
+
+# Cell
+@cc.export("_reference_harvest_index_curve", (CropStructNT_type_sig,i8))
+def reference_harvest_index_curve(Crop, ndays):
+    """
+    Function to calculate the reference harvest index for each day of harvest
+    index build-up in a growing season
+
+    *Arguments:*
+
+    `Crop`: `CropStruct` : Crop object containing Crop paramaters
+
+    `ndays`: `int` : number of days (entry `HIt` is for `HIt` days of build-up; entry 0 is unused)
+
+
+    *Returns:*
+
+    `HIref`: `np.array` : reference harvest index
+
+    `PctLagPhase`: `np.array` : percentage of lag phase completed
+
+    """
+
+    HIref = np.zeros(ndays)
+    PctLagPhase = np.zeros(ndays)
+    for HIt in range(1, ndays):
+        HIref[HIt], PctLagPhase[HIt] = reference_harvest_index(Crop, HIt)
+
+    return HIref, PctLagPhase
+
+
+# Cell
+@cc.export("_HIref_current_day", (f8,i8,i8,b1,f8,f8,CropStructNT_type_sig,b1,f8[:],f8[:]))
 def HIref_current_day(
     NewCond_HIref,
     NewCond_DAP,
@@ -3857,7 +4349,9 @@ def HIref_current_day(
     NewCond_PctLagPhase,
     NewCond_CCprev,
     Crop,
-    GrowingSeason):
+    GrowingSeason,
+    HIref_curve,
+    PctLagPhase_curve):
     """
     Function to calculate reference (no adjustment for stress effects)
     harvest index on current day
@@ -3876,6 +4370,10 @@ def HIref_current_day(
 
     `GrowingSeason`: `bool` : is growing season (True or Flase)
 
+    `HIref_curve`: `np.array` : reference harvest index precomputed for the season by days of build-up
+
+    `PctLagPhase_curve`: `np.array` : lag phase completed precomputed for the season by days of build-up
+
 
     *Returns:*
 
@@ -3915,51 +4413,12 @@ def HIref_current_day(
             if NewCond_CCprev <= (Crop.CCmin * Crop.CCx):
                 # HI cannot develop further as canopy cover is too small
                 NewCond_HIref = InitCond_HIref
+            elif HIt < len(HIref_curve):
+                # Reference curve precomputed for the season
+                NewCond_HIref = HIref_curve[HIt]
+                NewCond_PctLagPhase = PctLagPhase_curve[HIt]
             else:
-                # Check crop type
-                if (Crop.CropType == 1) or (Crop.CropType == 2):
-                    # If crop type is leafy vegetable or root/tuber, then proceed with
-                    # logistic growth (i.e. no linear switch)
-                    NewCond_PctLagPhase = 100  # No lag phase
-                    # Calculate reference harvest index for current day
-                    NewCond_HIref = (Crop.HIini * Crop.HI0) / (
-                        Crop.HIini + (Crop.HI0 - Crop.HIini) * np.exp(-Crop.HIGC * HIt)
-                    )
-                    # Harvest index apprAOSP_hing maximum limit
-                    if NewCond_HIref >= (0.9799 * Crop.HI0):
-                        NewCond_HIref = Crop.HI0
-
-                elif Crop.CropType == 3:
-                    # If crop type is fruit/grain producing, check for linear switch
-                    if HIt < Crop.tLinSwitch:
-                        # Not yet reached linear switch point, therefore proceed with
-                        # logistic build-up
-                        NewCond_PctLagPhase = 100 * (HIt / Crop.tLinSwitch)
-                        # Calculate reference harvest index for current day
-                        # (logistic build-up)
-                        NewCond_HIref = (Crop.HIini * Crop.HI0) / (
-                            Crop.HIini + (Crop.HI0 - Crop.HIini) * np.exp(-Crop.HIGC * HIt)
-                        )
-                    else:
-                        # Linear switch point has been reached
-                        NewCond_PctLagPhase = 100
-                        # Calculate reference harvest index for current day
-                        # (logistic portion)
-                        NewCond_HIref = (Crop.HIini * Crop.HI0) / (
-                            Crop.HIini
-                            + (Crop.HI0 - Crop.HIini) * np.exp(-Crop.HIGC * Crop.tLinSwitch)
-                        )
-                        # Calculate reference harvest index for current day
-                        # (total - logistic portion + linear portion)
-                        NewCond_HIref = NewCond_HIref + (Crop.dHILinear * (HIt - Crop.tLinSwitch))
-
-                # Limit HIref and round off computed value
-                if NewCond_HIref > Crop.HI0:
-                    NewCond_HIref = Crop.HI0
-                elif NewCond_HIref <= (Crop.HIini + 0.004):
-                    NewCond_HIref = 0
-                elif (Crop.HI0 - NewCond_HIref) < 0.004:
-                    NewCond_HIref = Crop.HI0
+                NewCond_HIref, NewCond_PctLagPhase = reference_harvest_index(Crop, HIt)
 
     else:
         # Reference harvest index is zero outside of growing season
@@ -4068,7 +4527,7 @@ def biomass_accumulation(
 
 
 # Cell
-# @njit()
+@njit
 @cc.export("_temperature_stress", (CropStructNT_type_sig,f8,f8))
 def temperature_stress(Crop, Tmax, Tmin):
     # Function to calculate temperature stress coefficients
@@ -4145,6 +4604,49 @@ def temperature_stress(Crop, Tmax, Tmin):
     return (Kst_PolH,Kst_PolC)
 
 
+# Cell
+@cc.export("_season_stress_forcings", (CropStructNT_type_sig,f8[:],f8[:],f8[:]))
+def season_stress_forcings(Crop, Tmax, Tmin, Et0):
+    """
+    Function to calculate the temperature stress coefficients and Et0-adjusted
+    water stress thresholds for every day of a growing season
+
+    *Arguments:*
+
+    `Crop`: `CropStruct` : Crop object containing Crop paramaters
+
+    `Tmax`: `np.array` : daily max tempature (celcius)
+
+    `Tmin`: `np.array` : daily min tempature (celcius)
+
+    `Et0`: `np.array` : daily reference evapotranspiration
+
+
+    *Returns:*
+
+    `Kst_PolH`: `np.array` : heat stress coefficient for pollination on each day
+
+    `Kst_PolC`: `np.array` : cold stress coefficient for pollination on each day
+
+    `p_up`: `np.array` : upper water stress thresholds on each day (days x 4)
+
+    `p_lo`: `np.array` : lower water stress thresholds on each day (days x 4)
+
+    """
+
+    ndays = len(Tmax)
+    nstress = len(Crop.p_up)
+    Kst_PolH = np.ones(ndays)
+    Kst_PolC = np.ones(ndays)
+    p_up = np.zeros((ndays, nstress))
+    p_lo = np.zeros((ndays, nstress))
+    for ii in range(ndays):
+        Kst_PolH[ii], Kst_PolC[ii] = temperature_stress(Crop, Tmax[ii], Tmin[ii])
+        p_up[ii], p_lo[ii] = et0_stress_thresholds(Crop.p_up, Crop.p_lo, Crop.ETadj, Et0[ii])
+
+    return Kst_PolH, Kst_PolC, p_up, p_lo
+
+
 # Cell
 # @njit()
 @cc.export("_HIadj_pre_anthesis", (f8,f8,f8,f8))
@@ -4426,7 +4928,7 @@ def HIadj_post_anthesis(
 
 # Cell
 # @njit()
-def harvest_index(prof, Soil_zTop, Crop, InitCond, Et0, Tmax, Tmin, GrowingSeason):
+def harvest_index(prof, Soil_zTop, Crop, InitCond, Et0, GrowingSeason):
 
     """
     Function to simulate build up of harvest index
@@ -4445,10 +4947,6 @@ def harvest_index(prof, Soil_zTop, Crop, InitCond, Et0, Tmax, Tmin, GrowingSeaso
 
     `Et0`: `float` : reference evapotranspiration on current day
 
-    `Tmax`: `float` : maximum tempature on current day (celcius)
-
-    `Tmin`: `float` : minimum tempature on current day (celcius)
-
     `GrowingSeason`:: `bool` : is growing season (True or Flase)
 
 
@@ -4475,14 +4973,7 @@ def harvest_index(prof, Soil_zTop, Crop, InitCond, Et0, Tmax, Tmin, GrowingSeaso
         TAW = TAWClass()
         Dr = DrClass()
         # thRZ = thRZClass()
-        _, Dr.Zt, Dr.Rz, TAW.Zt, TAW.Rz, _,_,_,_,_,_, = _root_zone_water(
-            prof,
-            float(NewCond.Zroot),
-            NewCond.th,
-            Soil_zTop,
-            float(Crop.Zmin),
-            Crop.Aer,
-        )
+        _, Dr.Zt, Dr.Rz, TAW.Zt, TAW.Rz, _,_,_,_,_,_, = root_zone_summary(prof, Soil_zTop, Crop, NewCond)
 
         # _,Dr,TAW,_ = root_zone_water(Soil_Profile,float(NewCond.Zroot),NewCond.th,Soil_zTop,float(Crop.Zmin),Crop.Aer)
         # Check whether to use root zone or top soil depletions for calculating
@@ -4501,9 +4992,10 @@ def harvest_index(prof, Soil_zTop, Crop, InitCond, Et0, Tmax, Tmin, GrowingSeaso
         # Ksw = water_stress(Crop, NewCond, Dr, TAW, Et0, beta)
         # Ksw = KswClass()
         Ksw_Exp, Ksw_Sto, Ksw_Sen, Ksw_Pol, Ksw_StoLin = _water_stress(
-            Crop.p_up,
-            Crop.p_lo,
-            Crop.ETadj,
+            # thresholds are already adjusted for Et0 (see SeasonForcingsClass)
+            NewCond.p_up_Et0,
+            NewCond.p_lo_Et0,
+            0,
             Crop.beta,
             Crop.fshape_w,
             NewCond.tEarlySen,
@@ -4514,8 +5006,7 @@ def harvest_index(prof, Soil_zTop, Crop, InitCond, Et0, Tmax, Tmin, GrowingSeaso
         )
         Ksw = KswNT(Exp=Ksw_Exp, Sto=Ksw_Sto, Sen=Ksw_Sen, Pol=Ksw_Pol, StoLin=Ksw_StoLin )
         # Calculate temperature stress
-        (Kst_PolH,Kst_PolC) = _temperature_stress(Crop, Tmax, Tmin)
-        Kst = KstNT(PolH=Kst_PolH,PolC=Kst_PolC)
+        Kst = KstNT(PolH=NewCond.Kst_PolH,PolC=NewCond.Kst_PolC)
         # Get reference harvest index on current day
         HIi = NewCond.HIref
 
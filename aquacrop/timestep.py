@@ -2,7 +2,15 @@ __all__ = ["solution", "check_model_termination", "reset_initial_conditions", "u
 
 # Cell
 from .solution import *
-from .initialize import calculate_HI_linear, calculate_HIGC
+from .initialize import (
+    calculate_HI_linear,
+    calculate_HIGC,
+    crop_calendar_days,
+    groundwater_depth,
+    growing_degree_days,
+    season_forcings,
+    water_table_adjustment,
+)
 from .classes import *
 import numpy as np
 import pandas as pd
@@ -12,11 +20,8 @@ import pandas as pd
 
 # compiled functions
 from .solution_aot import (
-    _growing_degree_day, 
     _drainage, 
-    _root_zone_water, 
     _rainfall_partition, 
-    _check_groundwater_table, 
     _soil_evaporation,
     _root_development, 
     _infiltration, 
@@ -55,13 +60,11 @@ def solution(InitCond, ParamStruct, ClockStruct, weather_step, Outputs):
     Soil = ParamStruct.Soil
     CO2 = ParamStruct.CO2
     if ParamStruct.WaterTable == 1:
-        Groundwater = ParamStruct.zGW[ClockStruct.TimeStepCounter]
+        Groundwater = groundwater_depth(ParamStruct, ClockStruct.TimeStepCounter)
     else:
         Groundwater = 0
 
     P = weather_step[2]
-    Tmax = weather_step[1]
-    Tmin = weather_step[0]
     Et0 = weather_step[3]
 
     # Store initial conditions in structure for updating %%
@@ -114,9 +117,16 @@ def solution(InitCond, ParamStruct, ClockStruct, weather_step, Outputs):
     if GrowingSeason == True:
         # Calendar days after planting
         NewCond.DAP = NewCond.DAP + 1
-        # Growing degree days after planting
+        # Weather-derived forcings precomputed at the start of the season
+        Forcings = ParamStruct.SeasonForcings
+        day = ClockStruct.TimeStepCounter - Forcings.Start
 
-        GDD = _growing_degree_day(Crop_.GDDmethod, Crop_.Tupp, Crop_.Tbase, Tmax, Tmin)
+        # Growing degree days after planting
+        GDD = Forcings.GDD[day]
+        NewCond.Kst_PolH = Forcings.Kst_PolH[day]
+        NewCond.Kst_PolC = Forcings.Kst_PolC[day]
+        NewCond.p_up_Et0 = Forcings.p_up[day]
+        NewCond.p_lo_Et0 = Forcings.p_lo[day]
 
         ## Update cumulative GDD counter ##
         NewCond.GDD = GDD
@@ -139,6 +149,12 @@ def solution(InitCond, ParamStruct, ClockStruct, weather_step, Outputs):
     NewCond.Tmin = weather_step[0]
     NewCond.Et0 = weather_step[3]
 
+    # loop iterations are counted for each day (the kernels always count;
+    # they are only written to the outputs with `ClockStruct.CountLoops`)
+    NewCond.LoopCounts[:] = 0
+    # root zone water is computed on its first read of the day and shared
+    # until a stage changes th (see root_zone_summary)
+    NewCond.RootZone = None
 
     
 
@@ -149,17 +165,12 @@ def solution(InitCond, ParamStruct, ClockStruct, weather_step, Outputs):
 
     # Run simulations %%
     # 1. Check for groundwater table
-    (
-        NewCond.th_fc_Adj,
-        _
-    ) = _check_groundwater_table(
-        Soil.Profile,
-        NewCond.zGW,
-        NewCond.th,
-        NewCond.th_fc_Adj,
-        ParamStruct.WaterTable,
-        Groundwater,
-    )
+    if ParamStruct.WaterTable == 1:
+        # adjusted field capacity depends only on the water table depth
+        NewCond.th_fc_Adj, comp = water_table_adjustment(ParamStruct, Groundwater)
+        # saturate compartments below the water table
+        NewCond.th[comp:] = Soil.Profile.th_s[comp:]
+        NewCond.RootZone = None
 
     # 2. Root development
     NewCond.Zroot = _root_development(
@@ -192,7 +203,9 @@ def solution(InitCond, ParamStruct, ClockStruct, weather_step, Outputs):
         Soil.Profile,
         NewCond.th,
         NewCond.th_fc_Adj,
+        NewCond.LoopCounts,
     )
+    NewCond.RootZone = None
 
     # 5. Surface runoff
     Runoff, Infl, NewCond.DaySubmerged = _rainfall_partition(
@@ -218,7 +231,8 @@ def solution(InitCond, ParamStruct, ClockStruct, weather_step, Outputs):
         IrrMngt.AppEff,
         IrrMngt.MaxIrr,
         IrrMngt.IrrInterval,
-        IrrMngt.Schedule,
+        IrrMngt.ScheduleDays,
+        IrrMngt.ScheduleDepths,
         IrrMngt.depth,
         IrrMngt.MaxIrrSeason,
         NewCond.GrowthStage,
@@ -226,7 +240,7 @@ def solution(InitCond, ParamStruct, ClockStruct, weather_step, Outputs):
         NewCond.Epot,
         NewCond.Tpot,
         NewCond.Zroot,
-        NewCond.th,
+        NewCond,
         NewCond.DAP,
         NewCond.TimeStepCounter, Crop, Soil.Profile, Soil.zTop, GrowingSeason, P, Runoff
     )
@@ -246,7 +260,10 @@ def solution(InitCond, ParamStruct, ClockStruct, weather_step, Outputs):
         DeepPerc,
         Runoff,
         GrowingSeason,
+        NewCond.LoopCounts,
     )
+    NewCond.RootZone = None
+
     # 8. Capillary Rise
     NewCond, CR = capillary_rise(
         Soil.Profile, Soil.nLayer, Soil.fshape_cr, NewCond, FluxOut, ParamStruct.WaterTable
@@ -261,7 +278,9 @@ def solution(InitCond, ParamStruct, ClockStruct, weather_step, Outputs):
     NewCond = growth_stage(Crop, NewCond, GrowingSeason)
 
     # 11. Canopy cover development
-    NewCond = canopy_cover(Crop, Soil.Profile, Soil.zTop, NewCond, GDD, Et0, GrowingSeason)
+    NewCond = canopy_cover(
+        Crop, Soil.Profile, Soil.zTop, NewCond, GDD, Et0, GrowingSeason, ParamStruct.SeasonForcings
+    )
 
     # 12. Soil evaporation
     NewCond.Epot,NewCond.th,NewCond.Stage2,NewCond.Wstage2,NewCond.Wsurf,NewCond.SurfaceStorage,NewCond.EvapZ, Es, EsPot = _soil_evaporation(
@@ -304,7 +323,9 @@ def solution(InitCond, ParamStruct, ClockStruct, weather_step, Outputs):
         P,
         Irr,
         GrowingSeason,
+        NewCond.LoopCounts,
     )
+    NewCond.RootZone = None
 
     # 13. Crop transpiration
     Tr, TrPot_NS, TrPot, NewCond, IrrNet = transpiration(
@@ -335,7 +356,9 @@ def solution(InitCond, ParamStruct, ClockStruct, weather_step, Outputs):
                         NewCond.PctLagPhase,
                         NewCond.CCprev,
                         Crop,
-                        GrowingSeason)
+                        GrowingSeason,
+                        ParamStruct.SeasonForcings.HIref,
+                        ParamStruct.SeasonForcings.PctLagPhase)
 
     # 16. Biomass accumulation
     (NewCond.B, NewCond.B_NS) = _biomass_accumulation(Crop,
@@ -351,7 +374,7 @@ def solution(InitCond, ParamStruct, ClockStruct, weather_step, Outputs):
                             GrowingSeason)
 
     # 17. Harvest index
-    NewCond = harvest_index(Soil.Profile, Soil.zTop, Crop, NewCond, Et0, Tmax, Tmin, GrowingSeason)
+    NewCond = harvest_index(Soil.Profile, Soil.zTop, Crop, NewCond, Et0, GrowingSeason)
 
     # 18. Crop yield
     if GrowingSeason == True:
@@ -374,13 +397,8 @@ def solution(InitCond, ParamStruct, ClockStruct, weather_step, Outputs):
     _Dr = DrClass()
     # thRZ = thRZClass()
 
-    Wr, _Dr.Zt, _Dr.Rz, _TAW.Zt, _TAW.Rz, _, _, _, _, _, _ = _root_zone_water(
-        Soil.Profile,
-        float(NewCond.Zroot),
-        NewCond.th,
-        Soil.zTop,
-        float(Crop.Zmin),
-        Crop.Aer,
+    Wr, _Dr.Zt, _Dr.Rz, _TAW.Zt, _TAW.Rz, _, _, _, _, _, _ = root_zone_summary(
+        Soil.Profile, Soil.zTop, Crop, NewCond
     )
 
     # Wr, _Dr, _TAW, _thRZ = root_zone_water(
@@ -454,6 +472,11 @@ def solution(InitCond, ParamStruct, ClockStruct, weather_step, Outputs):
         NewCond.Y,
     ]
 
+    # Iterations of data-dependent loops
+    if ClockStruct.CountLoops:
+        Outputs.Loops[row_day, :2] = [ClockStruct.TimeStepCounter, ClockStruct.SeasonCounter]
+        Outputs.Loops[row_day, 2:] = NewCond.LoopCounts
+
     # Final output (if at end of growing season)
     if ClockStruct.SeasonCounter > -1:
         if (
@@ -527,7 +550,7 @@ def reset_initial_conditions(ClockStruct, InitCond, ParamStruct, weather):
 
     `InitCond` : `InitCondClass` :  containing current model paramaters
 
-    `weather`: `np.array` :  weather data for simulation period
+    `weather`: `np.array` :  daily weather for simulation period (columns ordered as `WEATHER_COLUMNS`)
 
 
     *Returns:*
@@ -546,7 +569,6 @@ def reset_initial_conditions(ClockStruct, InitCond, ParamStruct, weather):
     Crop = ParamStruct.Seasonal_Crop_List[ClockStruct.SeasonCounter]
     FieldMngt = ParamStruct.FieldMngt
     CO2 = ParamStruct.CO2
-    CO2_data = ParamStruct.CO2data
 
     ## Reset counters ##
     InitCond.AgeDays = 0
@@ -613,46 +635,9 @@ def reset_initial_conditions(ClockStruct, InitCond, ParamStruct, weather):
     InitCond.ProtectedSeed = 0
 
     ## Update CO2 concentration ##
-    # Get CO2 concentration
-
-    if ParamStruct.CO2concAdj != None:
-        CO2.CurrentConc = ParamStruct.CO2concAdj
-    else:
-        Yri = pd.DatetimeIndex([ClockStruct.StepStartTime]).year[0]
-        CO2.CurrentConc = CO2_data.loc[Yri]
-    # Get CO2 weighting factor for first year
-    CO2conc = CO2.CurrentConc
-    CO2ref = CO2.RefConc
-    if CO2conc <= CO2ref:
-        fw = 0
-    else:
-        if CO2conc >= 550:
-            fw = 1
-        else:
-            fw = 1 - ((550 - CO2conc) / (550 - CO2ref))
-
-    # Determine initial adjustment
-    fCO2 = (CO2conc / CO2ref) / (
-        1
-        + (CO2conc - CO2ref)
-        * (
-            (1 - fw) * Crop.bsted
-            + fw * ((Crop.bsted * Crop.fsink) + (Crop.bface * (1 - Crop.fsink)))
-        )
-    )
-
-    # Consider crop type
-    if Crop.WP >= 40:
-        # No correction for C4 crops
-        ftype = 0
-    elif Crop.WP <= 20:
-        # Full correction for C3 crops
-        ftype = 1
-    else:
-        ftype = (40 - Crop.WP) / (40 - 20)
-
-    # Total adjustment
-    Crop.fCO2 = 1 + ftype * (fCO2 - 1)
+    # (concentration and WP adjustment for each season are precomputed in compute_variables)
+    CO2.CurrentConc = ParamStruct.SeasonalCO2conc[ClockStruct.SeasonCounter]
+    Crop.fCO2 = ParamStruct.SeasonalfCO2[ClockStruct.SeasonCounter]
 
     ## Reset soil water conditions (if not running off-season) ##
     if ClockStruct.SimOffSeason == False:
@@ -668,60 +653,17 @@ def reset_initial_conditions(ClockStruct, InitCond, ParamStruct, weather):
 
     ## Update crop parameters (if in GDD mode) ##
     if Crop.CalendarType == 2:
-        # Extract weather data for upcoming growing season
-        wdf = weather[weather[:, 4] >= ClockStruct.PlantingDates[ClockStruct.SeasonCounter]]
-        # wdf = wdf[wdf[:,4]<=ClockStruct.HarvestDates[ClockStruct.SeasonCounter]]
-        Tmin = wdf[:, 0]
-        Tmax = wdf[:, 1]
-
-        # Calculate GDD's
-        if Crop.GDDmethod == 1:
-            Tmean = (Tmax + Tmin) / 2
-            Tmean[Tmean > Crop.Tupp] = Crop.Tupp
-            Tmean[Tmean < Crop.Tbase] = Crop.Tbase
-            GDD = Tmean - Crop.Tbase
-        elif Crop.GDDmethod == 2:
-            Tmax[Tmax > Crop.Tupp] = Crop.Tupp
-            Tmax[Tmax < Crop.Tbase] = Crop.Tbase
-            Tmin[Tmin > Crop.Tupp] = Crop.Tupp
-            Tmin[Tmin < Crop.Tbase] = Crop.Tbase
-            Tmean = (Tmax + Tmin) / 2
-            GDD = Tmean - Crop.Tbase
-        elif Crop.GDDmethod == 3:
-            Tmax[Tmax > Crop.Tupp] = Crop.Tupp
-            Tmax[Tmax < Crop.Tbase] = Crop.Tbase
-            Tmin[Tmin > Crop.Tupp] = Crop.Tupp
-            Tmean = (Tmax + Tmin) / 2
-            Tmean[Tmean < Crop.Tbase] = Crop.Tbase
-            GDD = Tmean - Crop.Tbase
-
-        GDDcum = np.cumsum(GDD)
-
-        assert (
-            GDDcum[-1] > Crop.Maturity
-        ), f"not enough growing degree days in simulation ({GDDcum[-1]}) to reach maturity ({Crop.Maturity})"
-
-        Crop.MaturityCD = np.argmax((GDDcum > Crop.Maturity)) + 1
-
-        assert Crop.MaturityCD < 365, "crop will take longer than 1 year to mature"
-
-        # 1. GDD's from sowing to maximum canopy cover
-        Crop.MaxCanopyCD = (GDDcum > Crop.MaxCanopy).argmax() + 1
-        # 2. GDD's from sowing to end of vegetative growth
-        Crop.CanopyDevEndCD = (GDDcum > Crop.CanopyDevEnd).argmax() + 1
-        # 3. Calendar days from sowing to start of yield formation
-        Crop.HIstartCD = (GDDcum > Crop.HIstart).argmax() + 1
-        # 4. Calendar days from sowing to end of yield formation
-        Crop.HIendCD = (GDDcum > Crop.HIend).argmax() + 1
-        # 5. Duration of yield formation in calendar days
-        Crop.YldFormCD = Crop.HIendCD - Crop.HIstartCD
-        if Crop.CropType == 3:
-            # 1. Calendar days from sowing to end of flowering
-            FloweringEnd = (GDDcum > Crop.FloweringEnd).argmax() + 1
-            # 2. Duration of flowering in calendar days
-            Crop.FloweringCD = FloweringEnd - Crop.HIstartCD
-        else:
-            Crop.FloweringCD = -999
+        # daily GDD's over the simulation for this crop's temperature
+        # parameters (weather rows are aligned with the time span)
+        key = (Crop.Tbase, Crop.Tupp, Crop.GDDmethod)
+        if key not in ParamStruct.GDD:
+            ParamStruct.GDD[key] = growing_degree_days(weather[:, 0], weather[:, 1], *key)
+        start = ClockStruct.TimeSpan.searchsorted(ClockStruct.PlantingDates[ClockStruct.SeasonCounter])
+
+        # Calendar days to reach each GDD threshold from the planting day
+        calendar = crop_calendar_days(Crop, ParamStruct.GDD[key], start)
+        for name, value in calendar.items():
+            setattr(Crop, name, int(value[0]))
 
         # Update harvest index growth coefficient
         Crop = calculate_HIGC(Crop)
@@ -740,6 +682,9 @@ def reset_initial_conditions(ClockStruct, InitCond, ParamStruct, weather):
     ParamStruct.Seasonal_Crop_List[ClockStruct.SeasonCounter] = Crop
     ParamStruct.CO2 = CO2
 
+    ## Daily forcings and reference curves for the season ##
+    ParamStruct = season_forcings(ParamStruct, ClockStruct, weather)
+
     return InitCond, ParamStruct
 
 
@@ -754,7 +699,7 @@ def update_time(ClockStruct, InitCond, ParamStruct, Outputs, weather):
 
     `InitCond` : `InitCondClass` :  containing current model paramaters
 
-    `weather`: `np.array` :  weather data for simulation period
+    `weather`: `np.array` :  daily weather for simulation period (columns ordered as `WEATHER_COLUMNS`)
 
 
     *Returns:*
@@ -790,6 +735,45 @@ def update_time(ClockStruct, InitCond, ParamStruct, Outputs, weather):
                     ClockStruct, InitCond, ParamStruct, weather
                 )
 
+        elif (
+            (ClockStruct.SeasonCounter == -1)
+            and (ClockStruct.SimOffSeason == False)
+            and (ClockStruct.nSeasons > 0)
+            and not (
+                ParamStruct.FallowFieldMngt.Mulches
+                and ParamStruct.FallowFieldMngt.Bunds
+                and (ParamStruct.FallowFieldMngt.zBund > 0.001)
+            )
+        ):
+            # First growing season has not started and not simulating
+            # off-season soil water balance. Soil water is reset at planting,
+            # so advance time straight to the first planting date (outputs
+            # for the fallow days are left as zeros, as between seasons).
+            ClockStruct.SeasonCounter = 0
+            ClockStruct.TimeStepCounter = ClockStruct.TimeSpan.get_loc(
+                ClockStruct.PlantingDates[0]
+            )
+            ClockStruct.StepStartTime = ClockStruct.TimeSpan[ClockStruct.TimeStepCounter]
+            ClockStruct.StepEndTime = ClockStruct.TimeSpan[ClockStruct.TimeStepCounter + 1]
+
+            # Potential soil evaporation on the last fallow day (used for
+            # irrigation on the planting day): no canopy cover or irrigation,
+            # and without bunds there is no surface storage, so only mulches
+            # reduce it
+            FallowFieldMngt = ParamStruct.FallowFieldMngt
+            EsPot = ParamStruct.Soil.Kex * weather[ClockStruct.TimeStepCounter - 1, 3]
+            if FallowFieldMngt.Mulches:
+                EsPot = min(
+                    EsPot,
+                    EsPot * (1 - FallowFieldMngt.fMulch * (FallowFieldMngt.MulchPct / 100)),
+                )
+            InitCond.Epot = EsPot
+
+            # Reset initial conditions for start of growing season
+            InitCond, ParamStruct = reset_initial_conditions(
+                ClockStruct, InitCond, ParamStruct, weather
+            )
+
         else:
             # Simulation considers off-season, so progress by one time-step
             # (one day)
@@ -865,4 +849,18 @@ def update_time(ClockStruct, InitCond, ParamStruct, Outputs, weather):
             ],
         )
 
+        if ClockStruct.CountLoops:
+            Outputs.Loops = pd.DataFrame(
+                Outputs.Loops, columns=["TimeStepCounter", "SeasonCounter"] + LOOP_COUNTERS
+            ).astype(np.int64)
+            # rows of days that were not simulated (skipped fallow days) keep
+            # their TimeStepCounter of -1; fallow days before the first season
+            # are not part of a season
+            Outputs.Loops = Outputs.Loops[Outputs.Loops.TimeStepCounter >= 0].reset_index(drop=True)
+            Outputs.SeasonLoops = (
+                Outputs.Loops[Outputs.Loops.SeasonCounter >= 0]
+                .groupby("SeasonCounter")[LOOP_COUNTERS]
+                .sum()
+            )
+
     return ClockStruct, InitCond, ParamStruct, Outputs
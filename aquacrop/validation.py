@@ -0,0 +1,416 @@
+__all__ = [
+    "REFERENCE_CASES",
+    "reference_model",
+    "read_reference_yields",
+    "run_reference",
+    "validate_case",
+    "validate_all",
+    "check_validation",
+]
+
+# Cell
+import argparse
+import sys
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from .core import *
+from .classes import *
+from .profiling import calibration_time
+
+
+# Cell
+def _tunis_wheat():
+    return CropClass("Wheat", PlantingDate="10/15")
+
+
+def _tunis_iwc():
+    return InitWCClass("Num", "Depth", [0.3, 0.9], [0.3, 0.15])
+
+
+def _tunis_local_wheat():
+    return CropClass(
+        "Wheat",
+        PlantingDate="10/15",
+        Emergence=289,
+        MaxRooting=1322,
+        Senescence=2835,
+        Maturity=3390,
+        HIstart=2252,
+        Flowering=264,
+        YldForm=1073,
+        PlantPop=3_500_000,
+        CCx=0.9,
+        CDC=0.003888,
+        CGC=0.002734,
+    )
+
+
+def _paddy_fm():
+    return FieldMngtClass(Bunds=True, zBund=0.2)
+
+
+# bundled reference simulations (see 05_comparison): name -> (weather file, model inputs).
+# each has `<name>_matlab.txt` and `<name>_windows.OUT` outputs in `aquacrop/data`
+REFERENCE_CASES = {
+    "tunis_test_1": (
+        "tunis_climate.txt",
+        lambda wdf: AquaCropModel(
+            "1979/10/15",
+            "2002/05/31",
+            wdf,
+            SoilClass("ac_TunisLocal"),
+            _tunis_wheat(),
+            InitWC=_tunis_iwc(),
+        ),
+    ),
+    "tunis_test_1_SandyLoam": (
+        "tunis_climate.txt",
+        lambda wdf: AquaCropModel(
+            "1979/01/01",
+            "2002/05/31",
+            wdf,
+            SoilClass("SandyLoam"),
+            _tunis_wheat(),
+            InitWC=_tunis_iwc(),
+        ),
+    ),
+    "tunis_test_2_long": (
+        "tunis_climate.txt",
+        lambda wdf: AquaCropModel(
+            "1979/01/01",
+            "2002/05/31",
+            wdf,
+            SoilClass("SandyLoam"),
+            _tunis_local_wheat(),
+            InitWC=_tunis_iwc(),
+        ),
+    ),
+    "tunis_test_3_30taw": (
+        "tunis_climate.txt",
+        lambda wdf: AquaCropModel(
+            "1979/01/01",
+            "2002/05/31",
+            wdf,
+            SoilClass("SandyLoam"),
+            _tunis_wheat(),
+            InitWC=InitWCClass("Pct", "Layer", [1], [30]),
+        ),
+    ),
+    "tunis_test_6": (
+        "tunis_climate.txt",
+        lambda wdf: AquaCropModel(
+            "1979/08/15",
+            "2001/07/30",
+            wdf,
+            SoilClass("SandyLoam"),
+            CropClass("Wheat", PlantingDate="12/01", HarvestDate="07/30"),
+            InitWC=InitWCClass(value=["WP"]),
+            IrrMngt=IrrMngtClass(IrrMethod=4, NetIrrSMT=78.26),
+        ),
+    ),
+    # soil for the groundwater case is not recorded with the outputs;
+    # Loam is the closest match among the built-in soils
+    "tunis_wheat_gw15": (
+        "tunis_climate.txt",
+        lambda wdf: AquaCropModel(
+            "1979/10/15",
+            "2002/05/31",
+            wdf,
+            SoilClass("Loam"),
+            _tunis_wheat(),
+            InitWC=_tunis_iwc(),
+            Groundwater=GwClass("Y", dates=["1979/10/15"], values=[1.5]),
+        ),
+    ),
+    "paddyrice_hyderabad": (
+        "hyderabad_climate.txt",
+        lambda wdf: AquaCropModel(
+            "2000/01/01",
+            "2010/12/31",
+            wdf,
+            SoilClass("Paddy"),
+            CropClass("Rice", PlantingDate="08/01"),
+            InitWC=InitWCClass(depth_layer=[1, 2], value=["FC", "FC"]),
+            FieldMngt=_paddy_fm(),
+            FallowFieldMngt=_paddy_fm(),
+        ),
+    ),
+    "potato": (
+        "brussels_climate.txt",
+        lambda wdf: AquaCropModel(
+            "1976/01/01",
+            "2005/12/31",
+            wdf,
+            SoilClass("Loam"),
+            CropClass("Potato", PlantingDate="04/25"),
+            InitWCClass(),
+        ),
+    ),
+}
+
+
+# Cell
+def reference_model(name, wdf=None):
+    """
+    build (but do not initialize) the model for a bundled reference case
+
+    *Arguments:*\n
+
+    `name` : `str` : key of `REFERENCE_CASES`
+
+    `wdf` : `pandas.DataFrame` : weather data (default: read the case's weather file)
+
+    *Returns:*
+
+    `model` : `AquaCropModel` : model for the reference case
+
+    """
+
+    weather_file, build = REFERENCE_CASES[name]
+    if wdf is None:
+        wdf = prepare_weather(get_filepath(weather_file))
+
+    return build(wdf)
+
+
+# Cell
+def read_reference_yields(name):
+    """
+    read the seasonal yields (tonne/ha) of the matlab (AquaCrop-OS) and
+    windows (AquaCrop) versions for a bundled reference case
+
+    *Arguments:*\n
+
+    `name` : `str` : key of `REFERENCE_CASES`
+
+    *Returns:*
+
+    `yields` : `pandas.DataFrame` : `matlab` and `windows` yield per season
+    (NaN for seasons only one version simulated)
+
+    """
+
+    matlab = pd.read_csv(get_filepath(name + "_matlab.txt"), delim_whitespace=True, header=None)
+
+    # yield is the 33rd column of the windows season output; the file is not utf-8
+    windows = pd.read_csv(
+        get_filepath(name + "_windows.OUT"),
+        skiprows=5,
+        delim_whitespace=True,
+        header=None,
+        encoding="latin-1",
+    )
+
+    # the versions may end after different numbers of seasons
+    return pd.DataFrame({"matlab": pd.Series(matlab[6].values), "windows": pd.Series(windows[32].values)})
+
+
+# Cell
+def run_reference(name, wdf=None):
+    """
+    run a bundled reference case to termination
+
+    *Arguments:*\n
+
+    `name` : `str` : key of `REFERENCE_CASES`
+
+    `wdf` : `pandas.DataFrame` : weather data (default: read the case's weather file)
+
+    *Returns:*
+
+    `model` : `AquaCropModel` : finished model
+
+    """
+
+    model = reference_model(name, wdf)
+    model.initialize()
+    model.step(till_termination=True)
+
+    return model
+
+
+# Cell
+def validate_case(name):
+    """
+    run a bundled reference case and compare its seasonal yields with the
+    matlab and windows versions
+
+    *Arguments:*\n
+
+    `name` : `str` : key of `REFERENCE_CASES`
+
+    *Returns:*
+
+    `result` : `dict` : `Case`, `Seasons`, `MAEWindows` and `MAEMatlab`
+    (mean absolute yield error, tonne/ha, over the seasons each version
+    simulated), `Time` (s, `initialize` and run), `Calibration` (s, see
+    `calibration_time`, measured just before the run) and `Score`
+    (`Time / Calibration`, comparable across machines)
+
+    """
+
+    wdf = prepare_weather(get_filepath(REFERENCE_CASES[name][0]))
+    calibration = calibration_time()
+
+    start = time.perf_counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        model = run_reference(name, wdf)
+    run_time = time.perf_counter() - start
+
+    Y = model.Outputs.Final["Yield (tonne/ha)"].values.astype(float)
+    reference = read_reference_yields(name)
+    n = min(len(Y), len(reference))
+
+    return {
+        "Case": name,
+        "Seasons": len(Y),
+        "MAEWindows": float(np.nanmean(np.abs(Y[:n] - reference.windows.values[:n]))),
+        "MAEMatlab": float(np.nanmean(np.abs(Y[:n] - reference.matlab.values[:n]))),
+        "Time": run_time,
+        "Calibration": calibration,
+        "Score": run_time / calibration,
+    }
+
+
+def _warm_up():
+    """
+    short run so the timed runs of a worker do not pay for first-use costs
+    """
+    model = reference_model("tunis_test_1")
+    model.SimEndTime = "1980/07/31"
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        model.initialize()
+    model.step(till_termination=True)
+
+
+def validate_all(cases=None, processes=None):
+    """
+    run the bundled reference cases in parallel and compare them with the
+    matlab and windows versions (see `validate_case`); nothing is plotted
+
+    Times are measured in the worker processes, so they include contention
+    between cases when `processes` > 1; the calibration of each case is
+    measured in the same worker, so scores are less affected.
+
+    *Arguments:*\n
+
+    `cases` : `list` : names of `REFERENCE_CASES` to run (default: all)
+
+    `processes` : `int` : number of worker processes (default: one per cpu, 1 runs in this process)
+
+    *Returns:*
+
+    `report` : `pandas.DataFrame` : one row per case (see `validate_case`)
+
+    """
+
+    if cases is None:
+        cases = list(REFERENCE_CASES)
+
+    if processes == 1:
+        _warm_up()
+        results = [validate_case(name) for name in cases]
+    else:
+        with ProcessPoolExecutor(processes, initializer=_warm_up) as pool:
+            results = list(pool.map(validate_case, cases))
+
+    return pd.DataFrame(results)
+
+
+def check_validation(report, baseline, mae_tolerance=0.005, time_threshold=0.5, normalise=True):
+    """
+    compare a `validate_all` report with a baseline report
+
+    A case regresses in accuracy when either MAE exceeds its baseline by more
+    than `mae_tolerance`, and in speed when its score (run time over the
+    calibration time, see `validate_case`) exceeds the baseline by more than
+    `time_threshold` (fraction). With `normalise=False` run times in seconds
+    are compared instead, which is only meaningful when the baseline was
+    made on the same machine.
+
+    *Arguments:*\n
+
+    `report` : `pandas.DataFrame` : report of `validate_all`
+
+    `baseline` : `pandas.DataFrame` : baseline report (cases not in it are not checked)
+
+    `mae_tolerance` : `float` : allowed increase of the MAE (tonne/ha)
+
+    `time_threshold` : `float` : allowed slow down (fraction)
+
+    `normalise` : `bool` : compare scores rather than seconds
+
+    *Returns:*
+
+    `report` : `pandas.DataFrame` : `report` with the baseline values
+    (`Baseline...` columns) and boolean `AccuracyRegression` and `SpeedRegression`
+
+    """
+
+    speed = "Score" if normalise else "Time"
+    base = baseline.set_index("Case")[["MAEWindows", "MAEMatlab", speed]].add_prefix("Baseline")
+    checked = report.join(base, on="Case")
+
+    checked["AccuracyRegression"] = (
+        checked.MAEWindows > checked.BaselineMAEWindows + mae_tolerance
+    ) | (checked.MAEMatlab > checked.BaselineMAEMatlab + mae_tolerance)
+    checked["SpeedRegression"] = checked[speed] > checked["Baseline" + speed] * (1 + time_threshold)
+
+    return checked
+
+
+# Cell
+def main(argv=None):
+    """
+    `python -m aquacrop.validation`: validate all reference cases, exit with
+    status 1 on accuracy or speed regressions against a baseline report
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="python -m aquacrop.validation",
+        description="validate the bundled reference cases against matlab and windows outputs",
+    )
+    parser.add_argument("cases", nargs="*", help="cases to run (default: all)")
+    parser.add_argument("--processes", type=int, help="worker processes (default: one per cpu)")
+    parser.add_argument("--baseline", help="baseline report (json) to check against")
+    parser.add_argument("--save", help="save the report (json), e.g. as a new baseline")
+    parser.add_argument("--mae-tolerance", type=float, default=0.005, help="allowed MAE increase (tonne/ha)")
+    parser.add_argument("--time-threshold", type=float, default=0.5, help="allowed slow down (fraction)")
+    parser.add_argument(
+        "--seconds", action="store_true", help="compare run times in seconds rather than calibrated scores"
+    )
+    args = parser.parse_args(argv)
+
+    for name in args.cases:
+        assert name in REFERENCE_CASES, f"unknown reference case {name}"
+
+    start = time.perf_counter()
+    report = validate_all(args.cases or None, args.processes)
+    wall_time = time.perf_counter() - start
+
+    if args.save:
+        report.to_json(args.save, orient="records", indent=1)
+
+    status = 0
+    if args.baseline:
+        baseline = pd.read_json(args.baseline, orient="records")
+        report = check_validation(
+            report, baseline, args.mae_tolerance, args.time_threshold, normalise=not args.seconds
+        )
+        status = int(report.AccuracyRegression.any() or report.SpeedRegression.any())
+
+    print(report.to_string(index=False, float_format=lambda x: f"{x:.4f}"))
+    print(f"\n{len(report)} cases in {wall_time:.1f} s")
+    if status:
+        print("regressions:", ", ".join(report.Case[report.AccuracyRegression | report.SpeedRegression]))
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,459 @@
+__all__ = [
+    "WEATHER_DTYPE",
+    "WEATHER_COLUMNS",
+    "parse_weather",
+    "load_weather_array",
+    "weather_array_to_df",
+    "weather_df_to_array",
+    "WeatherStore",
+    "StationWeather",
+]
+
+# Cell
+import hashlib
+import json
+import numpy as np
+import os
+import pandas as pd
+
+
+# Cell
+# compact on-disk layout of a daily weather record: day ordinal
+# (days since 1970-01-01) followed by the four model forcings
+WEATHER_DTYPE = np.dtype(
+    [
+        ("Date", "<i8"),
+        ("MinTemp", "<f8"),
+        ("MaxTemp", "<f8"),
+        ("Precipitation", "<f8"),
+        ("ReferenceET", "<f8"),
+    ]
+)
+
+# order of the forcing columns in the daily weather array used by the model
+WEATHER_COLUMNS = ["MinTemp", "MaxTemp", "Precipitation", "ReferenceET"]
+
+
+# Cell
+def parse_weather(weatherFilePath):
+    """
+    parse an AquaCrop daily weather file
+    (Day Month Year MinTemp MaxTemp Precipitation ReferenceET, one header line)
+    straight into a structured numpy array
+
+    *Arguments:*\n
+
+    `weatherFilePath` : `str` :  file location of weather data
+
+    *Returns:*
+
+    `weather` : `numpy.ndarray` : structured array with dtype `WEATHER_DTYPE`
+
+    """
+
+    raw = np.loadtxt(weatherFilePath, skiprows=1, ndmin=2, dtype=np.float64)
+
+    assert raw.shape[1] == 7
+
+    day = raw[:, 0].astype(np.int64)
+    month = raw[:, 1].astype(np.int64)
+    year = raw[:, 2].astype(np.int64)
+
+    # build day ordinals without going through datetime objects
+    months = (year - 1970) * 12 + (month - 1)
+    dates = months.astype("datetime64[M]").astype("datetime64[D]") + (day - 1)
+
+    # datetime64 arithmetic silently rolls invalid days (e.g. 30 Feb) into
+    # the next month, so check the month survived the round trip
+    assert np.all(dates.astype("datetime64[M]").astype(np.int64) == months)
+
+    weather = np.empty(raw.shape[0], dtype=WEATHER_DTYPE)
+    weather["Date"] = dates.astype(np.int64)
+    weather["MinTemp"] = raw[:, 3]
+    weather["MaxTemp"] = raw[:, 4]
+    weather["Precipitation"] = raw[:, 5]
+    # set limit on ET0 to avoid divide by zero errors
+    weather["ReferenceET"] = np.maximum(raw[:, 6], 0.1)
+
+    return weather
+
+
+# Cell
+# the sidecar is the `.npy` of the parsed array followed by this stamp of
+# the source file (magic, size in bytes, mtime in ns), which `np.load`
+# ignores
+_STAMP_MAGIC = b"AQWSTAMP"
+_STAMP_SIZE = len(_STAMP_MAGIC) + 16
+
+
+def _sidecar_path(weatherFilePath, cache_dir=None):
+    """
+    location of the binary cache for a weather file: next to it, or in
+    `cache_dir` under its name and a hash of its real path, so files of the
+    same name in different directories do not share a sidecar
+    """
+    if cache_dir is None:
+        return weatherFilePath + ".npy"
+
+    key = hashlib.sha1(os.path.realpath(weatherFilePath).encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{os.path.basename(weatherFilePath)}.{key}.npy")
+
+
+def _source_stamp(weatherFilePath):
+    stat = os.stat(weatherFilePath)
+    return _STAMP_MAGIC + np.array([stat.st_size, stat.st_mtime_ns], dtype="<i8").tobytes()
+
+
+def _read_stamp(sidecar):
+    with open(sidecar, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() < _STAMP_SIZE:
+            return None
+        f.seek(-_STAMP_SIZE, os.SEEK_END)
+        return f.read(_STAMP_SIZE)
+
+
+# Cell
+def load_weather_array(weatherFilePath, cache=False, cache_dir=None):
+    """
+    read a weather file as a structured array, using a binary `.npy`
+    sidecar when available
+
+    On the first read the text file is parsed and written to
+    `<file>.npy` (or into `cache_dir`) together with the size and
+    modification time of the text file. Subsequent reads memory-map the
+    sidecar as long as both still match. If the sidecar cannot be written
+    the parsed array is returned as normal.
+
+    *Arguments:*\n
+
+    `weatherFilePath` : `str` :  file location of weather data
+
+    `cache` : `bool` :  read/write the binary sidecar (off by default, as in `prepare_weather`)
+
+    `cache_dir` : `str` :  directory for the sidecar (default: next to the weather file)
+
+    *Returns:*
+
+    `weather` : `numpy.ndarray` : structured array with dtype `WEATHER_DTYPE`
+    (read-only memmap when loaded from the sidecar)
+
+    """
+
+    weatherFilePath = os.fspath(weatherFilePath)
+
+    if not cache:
+        return parse_weather(weatherFilePath)
+
+    sidecar = _sidecar_path(weatherFilePath, cache_dir)
+
+    # stamp taken before parsing, so a file changed meanwhile is parsed again
+    stamp = _source_stamp(weatherFilePath)
+    if os.path.exists(sidecar) and _read_stamp(sidecar) == stamp:
+        weather = np.load(sidecar, mmap_mode="r")
+        if weather.dtype == WEATHER_DTYPE:
+            return weather
+
+    weather = parse_weather(weatherFilePath)
+
+    # write to a temporary file first so concurrent readers never see a
+    # partially written sidecar
+    tmp = f"{sidecar}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            np.save(f, weather)
+            f.write(stamp)
+        os.replace(tmp, sidecar)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    return weather
+
+
+# Cell
+def weather_array_to_df(weather):
+    """
+    convert a structured weather array into the dataframe layout
+    expected by `AquaCropModel`
+
+    *Arguments:*\n
+
+    `weather` : `numpy.ndarray` : structured array with dtype `WEATHER_DTYPE`
+
+    *Returns:*
+
+    `weather_df`: `pandas.DataFrame` :  weather data
+
+    """
+
+    return pd.DataFrame(
+        {
+            "MinTemp": weather["MinTemp"],
+            "MaxTemp": weather["MaxTemp"],
+            "Precipitation": weather["Precipitation"],
+            "ReferenceET": weather["ReferenceET"],
+            "Date": weather["Date"].astype("datetime64[D]").astype("datetime64[ns]"),
+        }
+    )
+
+
+# Cell
+def weather_df_to_array(weather_df):
+    """
+    convert a weather dataframe (as returned by `prepare_weather`) into a
+    structured array
+
+    *Arguments:*\n
+
+    `weather_df`: `pandas.DataFrame` :  weather data
+
+    *Returns:*
+
+    `weather` : `numpy.ndarray` : structured array with dtype `WEATHER_DTYPE`
+
+    """
+
+    weather = np.empty(len(weather_df), dtype=WEATHER_DTYPE)
+    weather["Date"] = weather_df.Date.values.astype("datetime64[D]").astype(np.int64)
+    for col in WEATHER_COLUMNS:
+        weather[col] = weather_df[col].values
+
+    return weather
+
+
+# Cell
+class StationWeather:
+    """
+    Zero-copy view of one station's weather in a `WeatherStore`.
+
+    Can be passed to `AquaCropModel` in place of a weather dataframe;
+    the model then reads its daily forcings straight from the
+    memory-mapped store. Pickling only transfers the store path and the
+    station name, so views can be handed to worker processes cheaply.
+
+    **Attributes:**\n
+
+    `store` : `WeatherStore` : store holding the data
+
+    `name` : `str` : station name
+
+    `values` : `numpy.ndarray` : read-only (days, 4) view ordered as `WEATHER_COLUMNS`
+
+    `first_day` : `int` : day ordinal (days since 1970-01-01) of the first row
+
+    """
+
+    def __init__(self, store, name, start=None, end=None):
+        self.store = store
+        self.name = name
+        row0, row1 = store._rows(name, start, end)
+        offset, _, first_day = store.index[name]
+        self.first_day = first_day + row0
+        self.values = store._values[offset + row0 : offset + row1]
+
+    def __len__(self):
+        return len(self.values)
+
+    def __reduce__(self):
+        return (_open_station, (self.store.path, self.name, self.start_date, self.end_date))
+
+    @property
+    def dates(self):
+        """
+        simulation dates of each row as `datetime64[D]`
+        """
+        return np.arange(self.first_day, self.first_day + len(self.values)).astype(
+            "datetime64[D]"
+        )
+
+    @property
+    def start_date(self):
+        return pd.Timestamp(np.datetime64(self.first_day, "D"))
+
+    @property
+    def end_date(self):
+        return pd.Timestamp(np.datetime64(self.first_day + len(self.values) - 1, "D"))
+
+    def clip(self, start, end):
+        """
+        view of this station restricted to `start`..`end` (inclusive)
+        """
+        return StationWeather(self.store, self.name, start, end)
+
+    def to_df(self):
+        """
+        weather dataframe in the layout returned by `prepare_weather`.
+        The forcing columns wrap the memory-mapped data without copying.
+        """
+        weather_df = pd.DataFrame(self.values, columns=WEATHER_COLUMNS, copy=False)
+        weather_df["Date"] = self.dates.astype("datetime64[ns]")
+        return weather_df
+
+
+def _open_station(path, name, start, end):
+    return WeatherStore(path).station(name, start, end)
+
+
+# Cell
+class WeatherStore:
+    """
+    Memory-mapped, read-only store of daily weather for many stations.
+
+    All stations are packed one after another into a single binary file
+    `values.f8` holding a (days, 4) float64 array in `WEATHER_COLUMNS`
+    order, with an `index.json` mapping each station to its row offset,
+    length and first day. Each station must be a gap-free daily series,
+    so date lookups are plain arithmetic.
+
+    Models get zero-copy views via `station()`, and processes opening
+    the same store share its pages through the OS page cache.
+
+    Build a store with `WeatherStore.create(path, {name: source, ...})`
+    where each source is a weather file path, a structured array from
+    `load_weather_array` or a dataframe from `prepare_weather`.
+
+    **Attributes:**\n
+
+    `path` : `str` : store directory
+
+    `index` : `dict` : station name -> [row offset, number of days, first day ordinal]
+
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+
+        with open(os.path.join(self.path, "index.json")) as f:
+            meta = json.load(f)
+
+        assert meta["columns"] == WEATHER_COLUMNS
+
+        self.index = meta["stations"]
+        self._values = np.memmap(
+            os.path.join(self.path, "values.f8"),
+            dtype="<f8",
+            mode="r",
+            shape=(meta["nrows"], len(WEATHER_COLUMNS)),
+        ).view(np.ndarray)
+
+    def __reduce__(self):
+        return (WeatherStore, (self.path,))
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __getitem__(self, name):
+        return self.station(name)
+
+    @property
+    def stations(self):
+        return list(self.index)
+
+    @classmethod
+    def create(cls, path, stations, cache=False):
+        """
+        pack weather for many stations into a new store
+
+        Stations are converted and appended one at a time, so memory use is
+        bounded by the largest single station.
+
+        *Arguments:*\n
+
+        `path` : `str` : directory to write the store to (created if needed)
+
+        `stations` : `dict` : station name -> weather file path, structured array or dataframe
+
+        `cache` : `bool` : use `.npy` sidecars when parsing weather files
+
+        *Returns:*
+
+        `store` : `WeatherStore` : the opened store
+
+        """
+
+        path = os.fspath(path)
+        os.makedirs(path, exist_ok=True)
+
+        index = {}
+        nrows = 0
+        with open(os.path.join(path, "values.f8"), "wb") as f:
+            for name, source in stations.items():
+                if isinstance(source, pd.DataFrame):
+                    weather = weather_df_to_array(source)
+                elif isinstance(source, np.ndarray):
+                    weather = source
+                else:
+                    weather = load_weather_array(source, cache=cache)
+
+                assert len(weather) > 0, f"no weather data for station {name}"
+                assert np.all(
+                    np.diff(weather["Date"]) == 1
+                ), f"weather for station {name} is not a gap-free daily series"
+
+                block = np.empty((len(weather), len(WEATHER_COLUMNS)), dtype="<f8")
+                for i, col in enumerate(WEATHER_COLUMNS):
+                    block[:, i] = weather[col]
+                block.tofile(f)
+
+                index[str(name)] = [nrows, len(weather), int(weather["Date"][0])]
+                nrows += len(weather)
+
+        assert nrows > 0
+
+        # write the index last; a store is only valid once it exists
+        with open(os.path.join(path, "index.json"), "w") as f:
+            json.dump({"columns": WEATHER_COLUMNS, "nrows": nrows, "stations": index}, f)
+
+        return cls(path)
+
+    def _rows(self, name, start=None, end=None):
+        """
+        row range (relative to the station) covering `start`..`end` inclusive
+        """
+        _, length, first_day = self.index[name]
+
+        row0 = 0
+        row1 = length
+        if start is not None:
+            row0 = _day_ordinal(start) - first_day
+        if end is not None:
+            row1 = _day_ordinal(end) - first_day + 1
+
+        assert 0 <= row0, f"station {name} has no weather before {start}"
+        assert row1 <= length, f"station {name} has no weather after {end}"
+        assert row0 < row1
+
+        return row0, row1
+
+    def station(self, name, start=None, end=None):
+        """
+        zero-copy `StationWeather` view of a station, optionally clipped
+        to `start`..`end` (inclusive)
+        """
+        return StationWeather(self, name, start, end)
+
+    def values(self, name, start=None, end=None):
+        """
+        read-only (days, 4) array view of a station's forcings
+        """
+        return self.station(name, start, end).values
+
+    def to_df(self, name, start=None, end=None):
+        """
+        station weather as a dataframe in the layout returned by `prepare_weather`
+        """
+        return self.station(name, start, end).to_df()
+
+
+def _day_ordinal(date):
+    """
+    days since 1970-01-01 of a date-like value
+    """
+    return int(np.datetime64(pd.Timestamp(date), "D").astype(np.int64))
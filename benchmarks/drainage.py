@@ -0,0 +1,73 @@
+"""
+Microbenchmark of the compiled drainage routine (`_drainage`) on soil
+profiles with 12, 50 and 200 compartments.
+
+Each profile is 1.2 m of SandyLoam split into equal compartments, with
+water content half way between field capacity and saturation so every
+compartment drains.
+
+    python benchmarks/drainage.py
+"""
+import time
+import warnings
+
+import numpy as np
+
+from aquacrop.classes import LOOP_COUNTERS, CropClass, InitWCClass, SoilClass
+from aquacrop.core import AquaCropModel, get_filepath, prepare_weather
+from aquacrop.solution_aot import _drainage
+
+
+def drainage_profile(ncomp, wdf=None):
+    """
+    soil profile, water content and adjusted field capacity for a
+    1.2 m SandyLoam profile with `ncomp` compartments
+    """
+    if wdf is None:
+        wdf = prepare_weather(get_filepath("tunis_climate.txt"))
+
+    model = AquaCropModel(
+        "1979/10/01",
+        "1980/05/31",
+        wdf,
+        SoilClass("SandyLoam", dz=[1.2 / ncomp] * ncomp),
+        CropClass("Wheat", PlantingDate="10/01"),
+        InitWCClass(value=["FC"]),
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        model.initialize()
+
+    prof = model.ParamStruct.Soil.Profile
+    th = 0.5 * (prof.th_fc + prof.th_s)
+
+    return prof, th, model.InitCond.th_fc_Adj
+
+
+def bench_drainage(ncomps=(12, 50, 200), number=2000, repeat=5):
+    """
+    best time (us) per `_drainage` call for each number of compartments
+    """
+    wdf = prepare_weather(get_filepath("tunis_climate.txt"))
+
+    results = {}
+    for ncomp in ncomps:
+        prof, th, th_fc_Adj = drainage_profile(ncomp, wdf)
+        counts = np.zeros(len(LOOP_COUNTERS), dtype=np.int64)
+        _drainage(prof, th, th_fc_Adj, counts)
+
+        best = np.inf
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                _drainage(prof, th, th_fc_Adj, counts)
+            best = min(best, (time.perf_counter() - start) / number)
+
+        results[ncomp] = best * 1e6
+
+    return results
+
+
+if __name__ == "__main__":
+    for ncomp, t in bench_drainage().items():
+        print(f"{ncomp:4d} compartments: {t:8.2f} us/call  {1000 * t / ncomp:7.1f} ns/compartment")
@@ -0,0 +1,128 @@
+"""
+Replay benchmark of the compiled kernels on recorded inputs.
+
+`record` runs reference simulations with a `KernelRecorder` and saves the
+arguments and results of every kernel call to
+`benchmarks/corpus/<case>/<kernel>.npz`. `replay` calls each kernel on its
+corpus, checks every result bit for bit against the recording and reports
+the best time per call.
+
+    python benchmarks/kernels.py record
+    python benchmarks/kernels.py replay -o kernels.json
+    python benchmarks/kernels.py replay -k _drainage
+
+Replay results are saved in the format of `benchmarks/suite.py`, so two runs
+can be compared with `python benchmarks/suite.py compare old.json new.json`.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+from suite import ROOT, metadata
+
+from aquacrop import solution_aot
+from aquacrop.profiling import KernelRecorder, load_kernel_calls, save_kernel_calls
+from aquacrop.validation import reference_model
+
+CORPUS_DIR = os.path.join(ROOT, "benchmarks", "corpus")
+
+# tunis wheat, paddy rice with bunds and a shallow water table
+CASES = {
+    "tunis": ("tunis_test_1", "1986/05/31"),
+    "paddyrice": ("paddyrice_hyderabad", "2004/12/31"),
+    "groundwater": ("tunis_wheat_gw15", "1986/05/31"),
+}
+
+
+def record(cases=CASES, corpus_dir=CORPUS_DIR):
+    """
+    record the kernel calls of the reference `cases` (name -> (reference case, end date))
+    """
+    for case, (name, end) in cases.items():
+        model = reference_model(name)
+        model.SimEndTime = end
+        recorder = KernelRecorder()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            model.initialize(profile=recorder)
+        model.step(till_termination=True)
+
+        os.makedirs(os.path.join(corpus_dir, case), exist_ok=True)
+        for kernel, calls in recorder.calls.items():
+            if len(calls) == 0:
+                continue
+            path = os.path.join(corpus_dir, case, kernel + ".npz")
+            save_kernel_calls(path, calls)
+            print(f"{case:12s} {kernel:24s} {len(calls):6d} calls {os.path.getsize(path) / 1024:8.1f} KiB")
+
+
+def _same(a, b):
+    """
+    bit for bit equality of kernel results
+    """
+    if isinstance(a, tuple):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    a, b = np.asarray(a), np.asarray(b)
+    return (a.shape == b.shape) and (a.tobytes() == b.tobytes())
+
+
+def replay(pattern=None, repeat=5, corpus_dir=CORPUS_DIR):
+    """
+    best time (s) per call of each kernel over its corpus, by `<case>.<kernel>`
+    """
+    results = {}
+    for path in sorted(glob.glob(os.path.join(corpus_dir, "*", "*.npz"))):
+        case = os.path.basename(os.path.dirname(path))
+        kernel = os.path.basename(path)[: -len(".npz")]
+        name = f"{case}.{kernel}"
+        if pattern is not None and pattern not in name:
+            continue
+        func = getattr(solution_aot, kernel)
+
+        # arguments are loaded as fresh copies for every repeat (kernels may
+        # update array arguments in place)
+        calls = load_kernel_calls(path)
+        for args, expected in calls:
+            assert _same(func(*args), expected), f"{name}: result differs from recording"
+
+        times = []
+        for _ in range(repeat):
+            args = [args for args, _ in load_kernel_calls(path)]
+            start = time.perf_counter()
+            for a in args:
+                func(*a)
+            times.append((time.perf_counter() - start) / len(args))
+
+        results[name] = {"times": times, "best": min(times), "median": float(np.median(times))}
+        print(f"{name:36s} {len(calls):6d} calls {1e6 * min(times):10.2f} us/call", flush=True)
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("record", help="record kernel calls of the reference cases")
+    run = commands.add_parser("replay", help="time kernels on the recorded calls")
+    run.add_argument("-k", dest="pattern", help="only kernels whose <case>.<kernel> contains this")
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("-o", "--output", help="save results (suite.py format)")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record()
+        sys.exit(0)
+
+    if not glob.glob(os.path.join(CORPUS_DIR, "*", "*.npz")):
+        record()
+    results = {f"kernel.{name}": result for name, result in replay(args.pattern, args.repeat).items()}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"meta": metadata(), "results": results}, f, indent=1)
+        print(f"saved {args.output}")
@@ -0,0 +1,127 @@
+"""
+Memory benchmark: peak memory of a model across run lengths and numbers of
+soil compartments.
+
+Each configuration (tunis wheat on SandyLoam split into equal compartments)
+is run in fresh interpreters so peaks do not carry over:
+
+- `peak_rss`: growth of the peak resident set size over initialize() and the
+  full run, relative to the peak after imports and reading the weather
+- `tracemalloc`: peak python allocations over initialize() and the run
+- `report`: total of `model.memory_report()` at the end of the run
+
+    python benchmarks/memory.py
+    python benchmarks/memory.py --years 1 20 --ncomps 12 -o memory.json
+
+Results are saved in the format of `benchmarks/suite.py` (unit `bytes`), so
+two runs can be compared with `python benchmarks/suite.py compare old.json
+new.json`, but not with `--normalise`, which only applies to times.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tracemalloc
+import warnings
+
+from suite import ROOT, metadata
+
+from aquacrop.classes import CropClass, InitWCClass, SoilClass
+from aquacrop.core import AquaCropModel, get_filepath, prepare_weather
+
+MEASURES = ["peak_rss", "tracemalloc"]
+
+
+def peak_rss():
+    """
+    peak resident set size (bytes) of this process
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on linux, bytes on macos
+    return peak if sys.platform == "darwin" else 1024 * peak
+
+
+def measure(years, ncomp, how):
+    """
+    memory of one configuration, measured in this process
+    """
+    wdf = prepare_weather(get_filepath("tunis_climate.txt"))
+    model = AquaCropModel(
+        "1979/10/01",
+        f"{1979 + years}/07/31",
+        wdf,
+        SoilClass("SandyLoam", dz=[1.2 / ncomp] * ncomp),
+        CropClass("Wheat", PlantingDate="10/01"),
+        InitWCClass(value=["FC"]),
+    )
+
+    start = peak_rss()
+    if how == "tracemalloc":
+        tracemalloc.start()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        model.initialize()
+    model.step(till_termination=True)
+
+    if how == "tracemalloc":
+        result = {"tracemalloc": tracemalloc.get_traced_memory()[1]}
+        tracemalloc.stop()
+    else:
+        result = {"peak_rss": peak_rss() - start}
+    result["report"] = int(model.memory_report().Bytes.sum())
+
+    return result
+
+
+def bench_memory(years=(1, 5, 20), ncomps=(12, 50, 200)):
+    """
+    memory (bytes) of each configuration, by measure
+    """
+    results = {}
+    for y in years:
+        for ncomp in ncomps:
+            result = {}
+            for how in MEASURES:
+                out = subprocess.run(
+                    [sys.executable, __file__, "--one", str(y), str(ncomp), how],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                    cwd=ROOT,
+                )
+                result.update(json.loads(out.stdout.splitlines()[-1]))
+            results[(y, ncomp)] = result
+            print(
+                f"{y:4d} years {ncomp:4d} compartments: "
+                + "  ".join(f"{name} {value / 2**20:8.2f} MiB" for name, value in result.items()),
+                flush=True,
+            )
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--ncomps", type=int, nargs="+", default=[12, 50, 200])
+    parser.add_argument("-o", "--output", help="save results (suite.py format)")
+    parser.add_argument("--one", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.one:
+        y, ncomp, how = args.one
+        print(json.dumps(measure(int(y), int(ncomp), how)))
+        sys.exit(0)
+
+    results = bench_memory(args.years, args.ncomps)
+    if args.output:
+        saved = {
+            f"memory.{y}y.{ncomp}comp.{name}": {"unit": "bytes", "times": [value], "best": value, "median": value}
+            for (y, ncomp), result in results.items()
+            for name, value in result.items()
+        }
+        with open(args.output, "w") as f:
+            json.dump({"meta": metadata(), "results": saved}, f, indent=1)
+        print(f"saved {args.output}")
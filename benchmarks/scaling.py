@@ -0,0 +1,180 @@
+"""
+Scaling benchmark: cost of a simulation against run length, number of soil
+compartments and ensemble size.
+
+All runs are wheat on tunis weather. Runs longer than the weather record use
+its 23 full years (1979-2001) repeated. For each configuration the
+throughput in field-days per second (calendar days of the simulation
+period, summed over ensemble members) and the memory held by one model
+(`model.memory_report()`) are reported.
+
+    python benchmarks/scaling.py
+    python benchmarks/scaling.py --sweep ensemble --sizes 1 100 10000
+    python benchmarks/scaling.py --plot scaling/ -o scaling.json
+
+Results are saved in the format of `benchmarks/suite.py` (unit
+`s/field-day`), so two runs can be compared with `suite.py compare`, but not
+with `--normalise`: the runs are not paired with calibration runs.
+"""
+import argparse
+import json
+import os
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from suite import metadata
+
+from aquacrop.classes import CropClass, InitWCClass, SoilClass
+from aquacrop.core import AquaCropModel, get_filepath, prepare_weather
+from aquacrop.weather import WEATHER_COLUMNS
+
+FIRST_YEAR = 1979
+RECORD_YEARS = 23
+
+
+def long_weather(years):
+    """
+    tunis weather from 1979 for `years` + 1 years, repeating 1979-2001
+    """
+    wdf = prepare_weather(get_filepath("tunis_climate.txt")).set_index("Date")
+
+    dates = pd.date_range(f"{FIRST_YEAR}/01/01", f"{FIRST_YEAR + years + 1}/12/31")
+    source = pd.DataFrame(
+        {
+            "year": FIRST_YEAR + (dates.year - FIRST_YEAR) % RECORD_YEARS,
+            "month": dates.month,
+            "day": dates.day,
+        }
+    )
+    # 29 February of a leap year takes 28 February of a common year
+    leap = (source.month == 2) & (source.day == 29)
+    common = source.year % 4 != 0
+    source.loc[leap & common, "day"] = 28
+
+    values = wdf.loc[pd.to_datetime(source), WEATHER_COLUMNS].to_numpy()
+    weather = pd.DataFrame(values, columns=WEATHER_COLUMNS)
+    weather["Date"] = dates
+
+    return weather
+
+
+def model(wdf, years=1, ncomp=12, soil="SandyLoam", planting="10/01", first_year=FIRST_YEAR):
+    return AquaCropModel(
+        f"{first_year}/10/01",
+        f"{first_year + years}/07/31",
+        wdf,
+        SoilClass(soil, dz=[1.2 / ncomp] * ncomp),
+        CropClass("Wheat", PlantingDate=planting),
+        InitWCClass(value=["FC"]),
+    )
+
+
+def run(members):
+    """
+    run models to termination; returns (field-days per second, bytes held by the last model)
+    """
+    days = 0
+    start = time.perf_counter()
+    for member in members:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            member.initialize()
+        member.step(till_termination=True)
+        days += len(member.ClockStruct.TimeSpan)
+    elapsed = time.perf_counter() - start
+
+    return days / elapsed, int(member.memory_report().Bytes.sum())
+
+
+def sweep_years(years=(1, 10, 50, 100), ncomp=12):
+    wdf = long_weather(max(years))
+    return [(y, *run([model(wdf, y, ncomp)])) for y in years]
+
+
+def sweep_compartments(ncomps=(12, 25, 50, 100, 200), years=10):
+    wdf = long_weather(years)
+    return [(ncomp, *run([model(wdf, years, ncomp)])) for ncomp in ncomps]
+
+
+def sweep_ensemble(sizes=(1, 10, 100, 1000), ncomp=12):
+    """
+    single-season members over soils, planting dates and years
+    """
+    wdf = long_weather(RECORD_YEARS)
+    soils = ["SandyLoam", "Loam", "Clay", "Sand"]
+    plantings = ["10/01", "10/15", "11/01", "11/15", "12/01", "12/15"]
+
+    rows = []
+    for size in sizes:
+        members = [
+            model(wdf, 1, ncomp, soils[i % 4], plantings[(i // 4) % 6], FIRST_YEAR + (i // 24) % 22)
+            for i in range(size)
+        ]
+        rows.append((size, *run(members)))
+    return rows
+
+
+SWEEPS = {
+    "years": ("run length (years)", sweep_years, "--years"),
+    "compartments": ("compartments", sweep_compartments, "--ncomps"),
+    "ensemble": ("ensemble members", sweep_ensemble, "--sizes"),
+}
+
+
+def plot(results, directory):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    os.makedirs(directory, exist_ok=True)
+    for sweep, rows in results.items():
+        label = SWEEPS[sweep][0]
+        x, rate, nbytes = np.array(rows, dtype=float).T
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
+        ax1.loglog(x, rate, "o-")
+        ax1.set_xlabel(label)
+        ax1.set_ylabel("field-days / s")
+        ax2.loglog(x, nbytes / 2**20, "o-")
+        ax2.set_xlabel(label)
+        ax2.set_ylabel("model memory (MiB)")
+        fig.tight_layout()
+        fig.savefig(os.path.join(directory, f"scaling_{sweep}.png"))
+        plt.close(fig)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sweep", nargs="+", choices=list(SWEEPS), default=list(SWEEPS))
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 10, 50, 100])
+    parser.add_argument("--ncomps", type=int, nargs="+", default=[12, 25, 50, 100, 200])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--plot", metavar="DIR", help="save plots to this directory")
+    parser.add_argument("-o", "--output", help="save results (suite.py format)")
+    args = parser.parse_args()
+
+    results = {}
+    for sweep in args.sweep:
+        label, func, option = SWEEPS[sweep]
+        rows = func(getattr(args, option[2:]))
+        results[sweep] = rows
+
+        print(f"{label:>20s} {'field-days/s':>14s} {'us/field-day':>14s} {'memory (MiB)':>14s}")
+        for x, rate, nbytes in rows:
+            print(f"{x:20d} {rate:14.0f} {1e6 / rate:14.2f} {nbytes / 2**20:14.2f}")
+        print(flush=True)
+
+    if args.plot:
+        plot(results, args.plot)
+    if args.output:
+        saved = {
+            f"scaling.{sweep}.{x}": {"unit": "s/field-day", "times": [1 / rate], "best": 1 / rate, "median": 1 / rate}
+            for sweep, rows in results.items()
+            for x, rate, _ in rows
+        }
+        with open(args.output, "w") as f:
+            json.dump({"meta": metadata(), "results": saved}, f, indent=1)
+        print(f"saved {args.output}")
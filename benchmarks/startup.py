@@ -0,0 +1,198 @@
+"""
+Startup benchmark: cold import, first-call JIT latency and first against
+steady-state runs, each measured in fresh interpreters.
+
+Each repeat starts a new interpreter that times, in order:
+
+- `import.dependencies`: import of numpy, pandas and numba
+- `import.solution_aot`: load of the ahead-of-time compiled kernels
+- `import.aquacrop`: import of `aquacrop.core` (the rest of the package)
+- `first.initialize` / `first.run`: `initialize()` and the full run of tunis
+  wheat (the configuration of `tests/test_time.py`) in the fresh interpreter
+- `steady.initialize` / `steady.run`: the same on a second model in the
+  same interpreter
+- `jit.<kernel>`: compilation of each jit kernel of `aquacrop.solution` for
+  the signature of its ahead-of-time export, i.e. the latency of its first
+  call from python (the daily calculation itself calls the exports)
+
+`process` is the wall time of the whole interpreter and `interpreter` that
+of `python -c pass`. The best of the repeats is reported.
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --repeat 5 -o startup.json
+    python benchmarks/startup.py history
+
+Every run is also appended to `benchmarks/results/startup.jsonl`, which
+`history` prints as a table of the main measures by commit.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+HISTORY = os.path.join(ROOT, "benchmarks", "results", "startup.jsonl")
+HISTORY_COLUMNS = [
+    "interpreter",
+    "import.aquacrop",
+    "jit",
+    "first.run",
+    "steady.run",
+    "process",
+]
+
+
+def child():
+    """
+    measures of one fresh interpreter (run with `--child`)
+    """
+    results = {}
+
+    start = time.perf_counter()
+    import numba
+    import numpy
+    import pandas
+
+    results["import.dependencies"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    from aquacrop import solution_aot
+
+    results["import.solution_aot"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    import aquacrop.core
+
+    results["import.aquacrop"] = time.perf_counter() - start
+
+    import warnings
+
+    from numba.core.registry import CPUDispatcher
+
+    from aquacrop import solution
+    from aquacrop.classes import CropClass, InitWCClass, SoilClass
+    from aquacrop.core import AquaCropModel, get_filepath, prepare_weather
+
+    wdf = prepare_weather(get_filepath("tunis_climate.txt"))
+
+    for stage in ["first", "steady"]:
+        model = AquaCropModel(
+            "1979/10/01",
+            "1985/05/30",
+            wdf,
+            SoilClass("SandyLoam"),
+            CropClass("Wheat", PlantingDate="10/01"),
+            InitWCClass(value=["FC"]),
+        )
+        start = time.perf_counter()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            model.initialize()
+        results[f"{stage}.initialize"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        model.step(till_termination=True)
+        results[f"{stage}.run"] = time.perf_counter() - start
+
+    # the daily calculation calls the ahead-of-time exports; the jit versions
+    # of the same kernels compile on their first call from python. kernels
+    # are compiled in module order, so callees compiled earlier are reused
+    exports = {entry.function: entry.signature for entry in solution.cc._exported_functions.values()}
+    jit = {}
+    for name, value in vars(solution).items():
+        if isinstance(value, CPUDispatcher) and value.py_func in exports:
+            start = time.perf_counter()
+            value.compile(exports[value.py_func])
+            jit[f"jit.{name}"] = time.perf_counter() - start
+    results["jit"] = sum(jit.values())
+    results.update(jit)
+
+    return results
+
+
+def bench_startup(repeat=3):
+    """
+    best time (s) of each measure over `repeat` fresh interpreters
+    """
+
+    def wall(args):
+        start = time.perf_counter()
+        out = subprocess.run(args, check=True, capture_output=True, text=True, cwd=ROOT)
+        return time.perf_counter() - start, out.stdout
+
+    times = {}
+    for _ in range(repeat):
+        results = {"interpreter": wall([sys.executable, "-c", "pass"])[0]}
+        elapsed, stdout = wall([sys.executable, __file__, "--child"])
+        results.update(json.loads(stdout.splitlines()[-1]))
+        results["process"] = elapsed
+        for name, value in results.items():
+            times.setdefault(name, []).append(value)
+
+    for name, values in times.items():
+        print(f"{name:40s} {min(values):10.4f} s", flush=True)
+
+    return times
+
+
+def append_history(meta, times, path=HISTORY):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    best = {name: min(values) for name, values in times.items()}
+    with open(path, "a") as f:
+        f.write(json.dumps({"meta": meta, "best": best}) + "\n")
+
+
+def print_history(path=HISTORY):
+    if not os.path.exists(path):
+        print(f"no startup history in {path}")
+        return
+    print(f"{'date':20s} {'commit':10s}" + "".join(f" {name:>16s}" for name in HISTORY_COLUMNS))
+    with open(path) as f:
+        for line in f:
+            entry = json.loads(line)
+            best = entry["best"]
+            print(
+                f"{entry['meta']['date']:20s} {entry['meta']['commit']:10s}"
+                + "".join(f" {best.get(name, float('nan')):16.4f}" for name in HISTORY_COLUMNS)
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("command", nargs="?", choices=["run", "history"], default="run")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters")
+    parser.add_argument("-o", "--output", help="save results (suite.py format)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child()))
+        sys.exit(0)
+
+    if args.command == "history":
+        print_history()
+        sys.exit(0)
+
+    # suite imports aquacrop, so not in the measured interpreters
+    from suite import metadata
+
+    times = bench_startup(args.repeat)
+    meta = metadata()
+    append_history(meta, times)
+    if args.output:
+        saved = {
+            f"startup.{name}": {
+                "unit": "s",
+                "times": values,
+                "best": min(values),
+                "median": sorted(values)[len(values) // 2],
+            }
+            for name, values in times.items()
+        }
+        with open(args.output, "w") as f:
+            json.dump({"meta": meta, "results": saved}, f, indent=1)
+        print(f"saved {args.output}")
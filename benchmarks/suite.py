@@ -0,0 +1,421 @@
+"""
+Benchmark suite for the simulation engine.
+
+Times import, `initialize()`, single time steps, full runs of each bundled
+reference case and ensemble throughput. Results are written as JSON so runs
+on different commits can be compared.
+
+    python benchmarks/suite.py run                      # all benchmarks
+    python benchmarks/suite.py run -k run. --repeat 3   # only full runs
+    python benchmarks/suite.py compare benchmarks/baselines/baseline.json new.json
+
+`compare` prints the ratio of the best values for every benchmark in both
+files and exits with status 1 when any benchmark is slower (or larger) than
+the baseline by more than `--threshold` (default 10 %). Each result has a
+`unit`: `s` here, other units for the files of `memory.py` and `scaling.py`.
+
+Every timed repeat is paired with a run of a fixed calibration workload,
+so results can be compared across machines as scores (median over the
+repeats of time / calibration time) with `compare --normalise`. `check`
+(`make bench-check`) runs the key paths in `CHECK_BENCHMARKS` and compares
+their scores with the baseline (default threshold `CHECK_THRESHOLD`):
+
+    python benchmarks/suite.py check --threshold 0.3
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import warnings
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from aquacrop.classes import CropClass, InitWCClass, IrrMngtClass, SoilClass
+from aquacrop.core import AquaCropModel, get_filepath, prepare_weather
+from aquacrop.profiling import calibration_time
+from aquacrop.validation import REFERENCE_CASES, reference_model
+
+BASELINE = os.path.join(ROOT, "benchmarks", "baselines", "baseline.json")
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+# name -> (function, default repeats, warm-up call). each function does its
+# own setup and returns the measured time in seconds (setup is not timed)
+BENCHMARKS = {}
+
+# key paths checked by `check` -> timed repeats. scores are medians over the
+# repeats, so short benchmarks get many
+CHECK_BENCHMARKS = {"initialize.tunis": 21, "step.season.tunis": 21, "ensemble.tunis.1000": 3}
+
+# default allowed slow down of `check`. with no code change, scores of the key
+# paths moved by up to 8 % between back-to-back checks on the baseline machine
+# (initialize.tunis 0.455-0.491, step.season.tunis 0.811-0.843,
+# ensemble.tunis.1000 1.466-1.541); under load from another process,
+# initialize.tunis reached 35 % above its quietest median
+CHECK_THRESHOLD = 0.25
+
+
+def benchmark(name, repeat=5, warmup=True):
+    """
+    register a benchmark function under `name`
+    """
+
+    def register(func):
+        BENCHMARKS[name] = (func, repeat, warmup)
+        return func
+
+    return register
+
+
+_WEATHER = {}
+
+
+def weather(filename):
+    """
+    cached weather data for a bundled weather file
+    """
+    if filename not in _WEATHER:
+        _WEATHER[filename] = prepare_weather(get_filepath(filename))
+    return _WEATHER[filename]
+
+
+def tunis_model(start="1979/10/01", end="1985/05/30", soil="SandyLoam", planting="10/01"):
+    """
+    wheat on tunis weather, the configuration of `tests/test_time.py`
+    """
+    return AquaCropModel(
+        start,
+        end,
+        weather("tunis_climate.txt"),
+        SoilClass(soil),
+        CropClass("Wheat", PlantingDate=planting),
+        InitWCClass(value=["FC"]),
+    )
+
+
+def champion_model():
+    """
+    irrigated maize on champion weather
+    """
+    return AquaCropModel(
+        "1982/05/01",
+        "2018/10/30",
+        weather("champion_climate.txt"),
+        SoilClass("SandyLoam"),
+        CropClass("Maize", PlantingDate="05/01"),
+        InitWCClass(value=["FC"]),
+        IrrMngt=IrrMngtClass(IrrMethod=1, SMT=[70] * 4),
+    )
+
+
+def initialized(model):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        model.initialize()
+    return model
+
+
+def time_run(model):
+    model = initialized(model)
+    start = time.perf_counter()
+    model.step(till_termination=True)
+    return time.perf_counter() - start
+
+
+@benchmark("calibration", repeat=7)
+def bench_calibration():
+    """
+    fixed workload that scales with the machine like the simulation does
+    (see `aquacrop.profiling.calibration_time`)
+    """
+    return calibration_time(repeat=1)
+
+
+@benchmark("import", repeat=3)
+def bench_import():
+    """
+    import of `aquacrop.core` in a fresh interpreter, less interpreter startup
+    """
+
+    def run(code):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=ROOT)
+        return time.perf_counter() - start
+
+    return run("import aquacrop.core") - run("pass")
+
+
+@benchmark("initialize.tunis")
+def bench_initialize():
+    model = tunis_model()
+    start = time.perf_counter()
+    initialized(model)
+    return time.perf_counter() - start
+
+
+@benchmark("timestep.tunis")
+def bench_timestep(ndays=365):
+    """
+    mean time of `perform_timestep` over the first `ndays` days
+    """
+    model = initialized(tunis_model())
+    start = time.perf_counter()
+    model.step(ndays)
+    return (time.perf_counter() - start) / ndays
+
+
+@benchmark("step.season.tunis")
+def bench_step_season():
+    """
+    `step` through one season (tunis wheat, October to July)
+    """
+    model = initialized(tunis_model("1979/10/01", "1980/07/31"))
+    start = time.perf_counter()
+    model.step(till_termination=True)
+    return time.perf_counter() - start
+
+
+@benchmark("run.tunis")
+def bench_run_tunis():
+    return time_run(tunis_model())
+
+
+@benchmark("run.champion_maize", repeat=3)
+def bench_run_champion():
+    return time_run(champion_model())
+
+
+def _reference_benchmark(name):
+    weather_file = REFERENCE_CASES[name][0]
+
+    def run():
+        return time_run(reference_model(name, weather(weather_file)))
+
+    benchmark(f"run.{name}", repeat=3)(run)
+
+
+for _name in REFERENCE_CASES:
+    _reference_benchmark(_name)
+
+
+@benchmark("ensemble.tunis", repeat=3)
+def bench_ensemble(size=24, chunk=None):
+    """
+    mean time per member of an ensemble of single-season runs over soils and
+    planting dates
+
+    with `chunk`, the calibration workload is run (untimed) before every
+    `chunk` members and `(time, score)` is returned, the score being the
+    median over the chunks of time per member / calibration time: a single
+    calibration cannot follow the machine over a long ensemble
+    """
+    soils = ["SandyLoam", "Loam", "Clay", "Sand"]
+    plantings = ["10/01", "10/15", "11/01", "11/15", "12/01", "12/15"]
+    members = [(soils[i % 4], plantings[(i // 4) % 6], 1979 + (i // 24) % 22) for i in range(size)]
+
+    elapsed = 0.0
+    scores = []
+    for first in range(0, size, chunk or size):
+        chunk_members = members[first : first + (chunk or size)]
+        calibration = calibration_time(repeat=1) if chunk else None
+        start = time.perf_counter()
+        for soil, planting, year in chunk_members:
+            model = tunis_model(f"{year}/10/01", f"{year + 1}/07/31", soil, planting)
+            initialized(model)
+            model.step(till_termination=True)
+        chunk_time = time.perf_counter() - start
+        elapsed += chunk_time
+        if chunk:
+            scores.append(chunk_time / len(chunk_members) / calibration)
+
+    if chunk:
+        return elapsed / size, float(np.median(scores))
+    return elapsed / size
+
+
+# the members of a large ensemble warm up on each other
+benchmark("ensemble.tunis.1000", repeat=1, warmup=False)(lambda: bench_ensemble(1000, chunk=25))
+
+
+def run_benchmarks(pattern=None, repeat=None, names=None):
+    """
+    run the registered benchmarks whose name contains `pattern` (or whose
+    name is a key of `names`, a dict of name -> repeats)
+
+    Every timed repeat is preceded by a short calibration run, and its score
+    is its time over that calibration time, so drifts in machine speed
+    during a run affect both. Benchmarks that return `(time, score)` score
+    themselves. The score of a benchmark is the median of its
+    repeats.
+
+    returns a dict of `{"meta": ..., "results": {name: {"unit", "times", "best", "median", "scores", "score"}}}`
+    """
+    results = {}
+    for name, (func, default_repeat, warmup) in BENCHMARKS.items():
+        if name != "calibration":
+            if pattern is not None and pattern not in name:
+                continue
+            if names is not None and name not in names:
+                continue
+        nrepeat = repeat or (names or {}).get(name) or default_repeat
+
+        # first call warms caches and compiled code
+        if warmup:
+            func()
+        times = []
+        scores = []
+        for _ in range(nrepeat):
+            calibration = calibration_time(repeat=3) if name != "calibration" else None
+            measured = func()
+            # long benchmarks may score themselves
+            if isinstance(measured, tuple):
+                measured, score = measured
+            else:
+                score = measured / (calibration or measured)
+            times.append(measured)
+            scores.append(score)
+        results[name] = {
+            "unit": "s",
+            "times": times,
+            "best": min(times),
+            "median": float(np.median(times)),
+            "scores": scores,
+            "score": float(np.median(scores)),
+        }
+        print(f"{name:32s} {min(times):12.6f} s  score {results[name]['score']:10.4f}", flush=True)
+
+    return {"meta": metadata(), "results": results}
+
+
+def metadata():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+
+    import numba
+    import pandas
+
+    return {
+        "commit": commit,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": platform.node(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "numba": numba.__version__,
+        "pandas": pandas.__version__,
+    }
+
+
+def scores(results):
+    """
+    median score of each benchmark (time over the calibration time, see `run_benchmarks`)
+    """
+    # byte counts and rates of memory.py and scaling.py have no calibration
+    not_times = [name for name, result in results["results"].items() if result.get("unit", "s") != "s"]
+    assert not not_times, f"only times can be normalised, not {', '.join(not_times)}"
+    unscored = [name for name, result in results["results"].items() if "score" not in result]
+    assert not unscored, f"no scores (runs not paired with calibration runs): {', '.join(unscored)}"
+    return {name: result["score"] for name, result in results["results"].items()}
+
+
+def compare(baseline, new, threshold=0.1, normalise=False):
+    """
+    compare two result dicts by best time, or by score (see `scores`) when
+    `normalise` is set
+
+    returns a list of `(name, baseline value, new value, ratio, status)` with
+    status `"slower"`, `"faster"` or `""`, for benchmarks in both
+    """
+    if normalise:
+        base_values, new_values = scores(baseline), scores(new)
+    else:
+        base_values = {name: result["best"] for name, result in baseline["results"].items()}
+        new_values = {name: result["best"] for name, result in new["results"].items()}
+
+    rows = []
+    for name, value in new_values.items():
+        if name not in base_values or (normalise and name == "calibration"):
+            continue
+        base = base_values[name]
+        ratio = value / base
+        status = ""
+        if ratio > 1 + threshold:
+            status = "slower"
+        elif ratio < 1 - threshold:
+            status = "faster"
+        rows.append((name, base, value, ratio, status))
+
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run benchmarks and save the results")
+    run.add_argument("-k", dest="pattern", help="only run benchmarks whose name contains this")
+    run.add_argument("--repeat", type=int, help="timed repeats per benchmark")
+    run.add_argument("-o", "--output", help="results file (default: benchmarks/results/<commit>.json)")
+
+    cmp = commands.add_parser("compare", help="compare results with a baseline")
+    cmp.add_argument("baseline", nargs="?", default=BASELINE)
+    cmp.add_argument("new")
+    cmp.add_argument("--threshold", type=float, default=0.1, help="allowed slow down (fraction)")
+    cmp.add_argument("--normalise", action="store_true", help="compare scores relative to the calibration")
+
+    check = commands.add_parser("check", help="run the key paths and compare their scores with a baseline")
+    check.add_argument("--baseline", default=BASELINE)
+    check.add_argument("--threshold", type=float, default=CHECK_THRESHOLD, help="allowed slow down (fraction)")
+
+    args = parser.parse_args(argv)
+
+    if args.command in ["run", "check"]:
+        if args.command == "run":
+            results = run_benchmarks(args.pattern, args.repeat)
+            output = args.output
+        else:
+            results = run_benchmarks(names=CHECK_BENCHMARKS)
+            output = None
+        if output is None:
+            os.makedirs(RESULTS_DIR, exist_ok=True)
+            prefix = "check-" if args.command == "check" else ""
+            output = os.path.join(RESULTS_DIR, f"{prefix}{results['meta']['commit'] or 'results'}.json")
+        with open(output, "w") as f:
+            json.dump(results, f, indent=1)
+        print(f"saved {output}")
+        if args.command == "run":
+            return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if args.command == "check":
+        new = results
+        normalise = True
+    else:
+        with open(args.new) as f:
+            new = json.load(f)
+        normalise = args.normalise
+
+    rows = compare(baseline, new, args.threshold, normalise)
+    print(f"\n{'benchmark':32s} {'baseline':>12s} {'new':>12s} {'ratio':>7s}" + (" (scores)" if normalise else ""))
+    for name, base, best, ratio, status in rows:
+        print(f"{name:32s} {base:12.6f} {best:12.6f} {ratio:7.3f} {status}")
+
+    slower = [row[0] for row in rows if row[4] == "slower"]
+    if slower:
+        print(f"{len(slower)} benchmark(s) slower than baseline by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from aquacrop.classes import CropClass, InitWCClass, SoilClass
+from aquacrop.core import AquaCropModel, get_filepath, prepare_weather
+from aquacrop.initialize import (
+    compute_crop_calendars,
+    gdd_calendar_days,
+    growing_degree_days,
+)
+
+
+def test_gdd_calendar_days_matches_cumsum():
+    weather_df = prepare_weather(get_filepath("tunis_climate.txt"))
+    GDD = growing_degree_days(weather_df.MinTemp.values, weather_df.MaxTemp.values, 0, 26, 3)
+
+    # integer thresholds are regularly hit exactly by cumulative GDD's
+    thresholds = np.array([150.0, 864.0, 1000.0, 1700.0, 2400.0, 1e9])
+    plant_idx = np.arange(0, len(GDD) - 400, 37)
+
+    CD = gdd_calendar_days(GDD, plant_idx, thresholds)
+
+    for row, p in enumerate(plant_idx):
+        GDDcum = np.cumsum(GDD[p:])
+        for col, threshold in enumerate(thresholds):
+            above = GDDcum > threshold
+            expected = above.argmax() + 1 if above.any() else 0
+            assert CD[row, col] == expected
+
+
+def test_compute_crop_calendars():
+    weather_df = prepare_weather(get_filepath("tunis_climate.txt"))
+    model = AquaCropModel(
+        SimStartTime="1979/10/01",
+        SimEndTime="1985/05/30",
+        wdf=weather_df,
+        Soil=SoilClass(soilType="SandyLoam"),
+        Crop=CropClass("Wheat", PlantingDate="10/01"),
+        InitWC=InitWCClass(value=["FC"]),
+    )
+    model.initialize()
+    model.step(till_termination=False, num_steps=1)
+
+    planting_dates = pd.date_range("1979/10/01", "1983/12/31", freq="7D")
+    calendars = compute_crop_calendars(model.ParamStruct.CropList[0], weather_df, planting_dates)
+
+    assert len(calendars) == len(planting_dates)
+    crop = model.ParamStruct.Seasonal_Crop_List[0]
+    first = calendars.loc[pd.Timestamp("1979/10/01")]
+    for name in ["MaturityCD", "MaxCanopyCD", "CanopyDevEndCD", "HIstartCD", "HIendCD", "YldFormCD", "FloweringCD"]:
+        assert first[name] == getattr(crop, name)
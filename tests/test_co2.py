@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from aquacrop.classes import CropClass, InitWCClass, SoilClass
+from aquacrop.core import AquaCropModel, get_filepath, prepare_weather
+from aquacrop.initialize import calculate_fCO2, co2_concentration, load_co2_record
+from aquacrop.lars import read_lars_co2
+
+
+def test_co2_record_cached():
+    years, ppm = load_co2_record()
+    again = load_co2_record()
+    assert again[0] is years and again[1] is ppm
+    assert co2_concentration([1902])[0] == ppm[0]
+
+
+def test_co2_trajectory():
+    trajectory = {2000: 370.0, 2100: 570.0}
+    np.testing.assert_allclose(co2_concentration([2000, 2050, 2100], trajectory), [370, 470, 570])
+    assert read_lars_co2(get_filepath("CP_EC-EARTH[CP,RCP45,2041-2060]WG.st")) == 487.0
+
+
+def test_fCO2_vectorised():
+    # C3, intermediate and C4 crops above and below the reference concentration
+    for WP in [15.0, 33.7, 45.0]:
+        for CO2conc in [300.0, 400.0, 600.0]:
+            if CO2conc <= 369.41:
+                fw = 0
+            elif CO2conc >= 550:
+                fw = 1
+            else:
+                fw = 1 - ((550 - CO2conc) / (550 - 369.41))
+            fCO2 = (CO2conc / 369.41) / (
+                1 + (CO2conc - 369.41) * ((1 - fw) * 0.000138 + fw * ((0.000138 * 0.5) + (0.001165 * 0.5)))
+            )
+            ftype = 0 if WP >= 40 else (1 if WP <= 20 else (40 - WP) / 20)
+            assert calculate_fCO2(CO2conc, 369.41, 0.000138, 0.001165, 0.5, WP) == 1 + ftype * (fCO2 - 1)
+
+
+def test_seasonal_co2_trajectory():
+    weather_data = prepare_weather(get_filepath("tunis_climate.txt"))
+
+    def run(CO2conc):
+        model = AquaCropModel(
+            SimStartTime="1979/10/01",
+            SimEndTime="1982/05/30",
+            wdf=weather_data,
+            Soil=SoilClass(soilType="SandyLoam"),
+            Crop=CropClass("Wheat", PlantingDate="10/01"),
+            InitWC=InitWCClass(value=["FC"]),
+            CO2conc=CO2conc,
+        )
+        model.initialize()
+        model.step(till_termination=True)
+        return model
+
+    # a flat trajectory behaves like a constant concentration
+    flat = run({1900: 500.0, 2100: 500.0})
+    constant = run(500.0)
+    pd.testing.assert_frame_equal(flat.Outputs.Final, constant.Outputs.Final)
+    np.testing.assert_array_equal(flat.ParamStruct.SeasonalCO2conc, [500.0, 500.0, 500.0])
+
+    rising = run({1979: 400.0, 1981: 600.0})
+    np.testing.assert_array_equal(rising.ParamStruct.SeasonalCO2conc, [400.0, 500.0, 600.0])
+    assert np.all(np.diff(rising.ParamStruct.SeasonalfCO2) > 0)
+
+    # a trajectory file behaves like the same trajectory given as a mapping
+    years, ppm = load_co2_record()
+    from_file = run(get_filepath("MaunaLoaCO2.txt"))
+    bundled = run(dict(zip(years, ppm)))
+    np.testing.assert_array_equal(from_file.ParamStruct.SeasonalCO2conc, bundled.ParamStruct.SeasonalCO2conc)
+    pd.testing.assert_frame_equal(from_file.Outputs.Final, bundled.Outputs.Final)
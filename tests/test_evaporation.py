@@ -0,0 +1,56 @@
+import numpy as np
+
+from aquacrop.classes import CropClass, InitWCClass, SoilClass
+from aquacrop.core import AquaCropModel, get_filepath, prepare_weather
+from aquacrop.solution_aot import _evap_layer_water_content, _expand_evap_layer
+
+
+def _expand_stepping(th, EvapZ, Wstage2, Wrel, Wcheck, prof, EvapZmin, EvapZmax, REW, fWrelExp):
+    # reference: original 1 mm stepping with a full profile scan
+    while (Wrel < Wcheck) and (EvapZ < EvapZmax):
+        EvapZ = EvapZ + 0.001
+        Sat, Fc, Wp, Dry, Act = _evap_layer_water_content(th, EvapZ, prof)
+        Wupper = Wstage2 * (Sat - (Fc - REW)) + (Fc - REW)
+        Wrel = (Act - Dry) / (Wupper - Dry)
+        Wcheck = fWrelExp * ((EvapZmax - EvapZ) / (EvapZmax - EvapZmin))
+    return EvapZ, Wrel
+
+
+def test_expand_evap_layer_matches_stepping():
+    wdf = prepare_weather(get_filepath("tunis_climate.txt"))
+    for soil in ["SandyLoam", "Clay", "SiltLoam"]:
+        model = AquaCropModel(
+            "1979/10/01",
+            "1980/05/31",
+            wdf,
+            SoilClass(soil),
+            CropClass("Wheat", PlantingDate="10/01"),
+            InitWCClass(value=["FC"]),
+        )
+        model.initialize()
+        Soil = model.ParamStruct.Soil
+        prof = Soil.Profile
+
+        rng = np.random.default_rng(0)
+        for _ in range(50):
+            frac = rng.uniform(0, 1, len(prof.th_fc))
+            th = prof.th_dry + frac * (prof.th_fc - prof.th_dry)
+            EvapZ = Soil.EvapZmin
+            Wstage2 = rng.uniform(0, 1)
+            Sat, Fc, Wp, Dry, Act = _evap_layer_water_content(th, EvapZ, prof)
+            Wupper = Wstage2 * (Sat - (Fc - Soil.REW)) + (Fc - Soil.REW)
+            Wrel = (Act - Dry) / (Wupper - Dry)
+            args = (
+                th,
+                EvapZ,
+                Wstage2,
+                Wrel,
+                Soil.fWrelExp,
+                prof,
+                Soil.EvapZmin,
+                Soil.EvapZmax,
+                Soil.REW,
+                Soil.fWrelExp,
+            )
+            assert _expand_evap_layer(*args) == _expand_stepping(*args)
+
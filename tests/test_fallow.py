@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from aquacrop.classes import CropClass, FieldMngtClass, InitWCClass, IrrMngtClass, SoilClass
+from aquacrop.core import AquaCropModel, get_filepath, prepare_weather
+
+
+def _model(weather_data, FallowFieldMngt):
+    return AquaCropModel(
+        SimStartTime="1982/01/01",
+        SimEndTime="1984/12/31",
+        wdf=weather_data,
+        Soil=SoilClass(soilType="SandyLoam"),
+        Crop=CropClass("Maize", PlantingDate="05/01"),
+        InitWC=InitWCClass(value=["WP"]),
+        IrrMngt=IrrMngtClass(IrrMethod=1, SMT=[70] * 4),
+        FallowFieldMngt=FallowFieldMngt,
+    )
+
+
+def test_fast_forward_to_first_planting():
+    weather_data = prepare_weather(get_filepath("champion_climate.txt"))
+
+    fast = _model(weather_data, FieldMngtClass(Bunds=True, zBund=0.1))
+    fast.initialize()
+    assert fast.ClockStruct.SeasonCounter == -1
+    fast.step()
+    planting = fast.ClockStruct.TimeSpan.get_loc(fast.ClockStruct.PlantingDates[0])
+    assert fast.ClockStruct.TimeStepCounter == planting
+    assert fast.ClockStruct.SeasonCounter == 0
+    fast.step(till_termination=True)
+
+    # mulches and bunds on the fallow field need the surface storage of every
+    # fallow day, so those days are stepped through (0 % mulch cover changes
+    # nothing else)
+    stepped = _model(weather_data, FieldMngtClass(Bunds=True, zBund=0.1, Mulches=True, MulchPct=0))
+    stepped.initialize()
+    stepped.step()
+    assert stepped.ClockStruct.TimeStepCounter == 1
+    stepped.step(till_termination=True)
+
+    pd.testing.assert_frame_equal(fast.Outputs.Final, stepped.Outputs.Final)
+    for name in ["Water", "Flux", "Growth"]:
+        fast_out = getattr(fast.Outputs, name).values
+        stepped_out = getattr(stepped.Outputs, name).values
+        np.testing.assert_array_equal(fast_out[planting:], stepped_out[planting:])
+        # skipped fallow days are left as zeros
+        assert not fast_out[1:planting].any()
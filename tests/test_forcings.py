@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+from aquacrop.classes import CropClass, CropStructNT, InitWCClass, SoilClass
+from aquacrop.core import AquaCropModel, get_filepath, prepare_weather
+from aquacrop.solution_aot import (
+    _growing_degree_day,
+    _reference_harvest_index,
+    _temperature_stress,
+    _water_stress,
+)
+
+
+def test_season_forcings_match_daily():
+    weather_data = prepare_weather(get_filepath("tunis_climate.txt"))
+    model = AquaCropModel(
+        SimStartTime="1979/10/15",
+        SimEndTime="1981/05/30",
+        wdf=weather_data,
+        Soil=SoilClass(soilType="SandyLoam"),
+        Crop=CropClass("Wheat", PlantingDate="10/15"),
+        InitWC=InitWCClass(value=["FC"]),
+    )
+    model.initialize()
+
+    crop = model.ParamStruct.Seasonal_Crop_List[0]
+    Crop = CropStructNT(**crop.__dict__)
+    forcings = model.ParamStruct.SeasonForcings
+    assert forcings.Start == 0
+    assert len(forcings.GDD) == len(forcings.Kst_PolH) == len(forcings.p_up)
+
+    Dr, TAW = 40.0, 100.0
+    for day, (Tmin, Tmax, _, Et0) in enumerate(model.weather[: len(forcings.GDD)]):
+        GDD = _growing_degree_day(crop.GDDmethod, crop.Tupp, crop.Tbase, Tmax, Tmin)
+        assert forcings.GDD[day] == GDD
+        assert (forcings.Kst_PolH[day], forcings.Kst_PolC[day]) == _temperature_stress(
+            Crop, Tmax, Tmin
+        )
+
+        # precomputed thresholds give the same stress as adjusting them on the day
+        for tEarlySen, beta in [(0.0, True), (5.0, True), (5.0, False)]:
+            expected = _water_stress(
+                crop.p_up, crop.p_lo, crop.ETadj, crop.beta, crop.fshape_w, tEarlySen, Dr, TAW, Et0, beta
+            )
+            Ksw = _water_stress(
+                forcings.p_up[day],
+                forcings.p_lo[day],
+                0,
+                crop.beta,
+                crop.fshape_w,
+                tEarlySen,
+                Dr,
+                TAW,
+                Et0,
+                beta,
+            )
+            assert Ksw == expected
+
+    # later seasons are set up when they start
+    model.step(till_termination=True)
+    assert model.ParamStruct.SeasonForcings.Start == model.ClockStruct.TimeSpan.get_loc(
+        model.ClockStruct.PlantingDates[1]
+    )
+
+
+def test_season_curves_match_daily():
+    weather_data = prepare_weather(get_filepath("tunis_climate.txt"))
+
+    def run(value, tables):
+        model = AquaCropModel(
+            SimStartTime="1979/10/15",
+            SimEndTime="1980/07/30",
+            wdf=weather_data,
+            Soil=SoilClass(soilType="SandyLoam"),
+            Crop=CropClass("Wheat", PlantingDate="10/15"),
+            InitWC=InitWCClass(value=[value]),
+        )
+        model.initialize()
+        if not tables:
+            # daily calculation only
+            forcings = model.ParamStruct.SeasonForcings
+            for name in ["tCC", "dtCC", "CC_NS", "CCxAct_NS", "CCxW_NS", "HIref", "PctLagPhase"]:
+                setattr(forcings, name, getattr(forcings, name)[:0])
+        model.step(till_termination=True)
+        return model
+
+    # germination on the planting day (FC) and delayed germination (WP)
+    for value in ["FC", "WP"]:
+        tabulated, daily = run(value, True), run(value, False)
+        pd.testing.assert_frame_equal(tabulated.Outputs.Final, daily.Outputs.Final)
+        for name in ["Water", "Flux", "Growth"]:
+            np.testing.assert_array_equal(
+                getattr(tabulated.Outputs, name), getattr(daily.Outputs, name)
+            )
+
+    crop = tabulated.ParamStruct.Seasonal_Crop_List[0]
+    forcings = tabulated.ParamStruct.SeasonForcings
+    HIref, PctLagPhase = forcings.HIref, forcings.PctLagPhase
+    for HIt in range(1, len(HIref)):
+        assert (HIref[HIt], PctLagPhase[HIt]) == _reference_harvest_index(
+            CropStructNT(**crop.__dict__), HIt
+        )
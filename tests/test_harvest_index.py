@@ -0,0 +1,50 @@
+import numpy as np
+
+from aquacrop.initialize import solve_HI_linear, solve_HIGC
+
+
+def _HIGC_stepping(HIini, HI0, tHI):
+    # reference: original iterative estimate of HIGC
+    HIGC = 0.001
+    HIest = 0
+    while HIest <= (0.98 * HI0):
+        HIGC = HIGC + 0.001
+        HIest = (HIini * HI0) / (HIini + (HI0 - HIini) * np.exp(-HIGC * tHI))
+    if HIest >= HI0:
+        HIGC = HIGC - 0.001
+    return HIGC
+
+
+def _HI_linear_stepping(HIini, HI0, HIGC, tmax):
+    # reference: original day-by-day search for the linear switch point
+    ti = 0
+    HIest = 0
+    HIprev = HIini
+    while (HIest <= HI0) and (ti < tmax):
+        ti = ti + 1
+        HInew = (HIini * HI0) / (HIini + (HI0 - HIini) * np.exp(-HIGC * ti))
+        HIest = HInew + (tmax - ti) * (HInew - HIprev)
+        HIprev = HInew
+    tSwitch = ti - 1
+    if tSwitch > 0:
+        HIest = (HIini * HI0) / (HIini + (HI0 - HIini) * np.exp(-HIGC * tSwitch))
+    else:
+        HIest = 0
+    return tSwitch, (HI0 - HIest) / (tmax - tSwitch)
+
+
+def test_harvest_index_solvers_match_stepping():
+    rng = np.random.default_rng(42)
+    n = 500
+    HIini = rng.choice([0.005, 0.01, 0.02], n)
+    HI0 = rng.uniform(0.1, 0.9, n)
+    tHI = rng.integers(1, 150, n)
+
+    HIGC = solve_HIGC(HIini, HI0, tHI)
+    expected = [_HIGC_stepping(*args) for args in zip(HIini, HI0, tHI)]
+    np.testing.assert_array_equal(HIGC, expected)
+
+    tSwitch, dHILinear = solve_HI_linear(HIini, HI0, HIGC, tHI)
+    expected = [_HI_linear_stepping(*args) for args in zip(HIini, HI0, HIGC, tHI)]
+    np.testing.assert_array_equal(tSwitch, [e[0] for e in expected])
+    np.testing.assert_array_equal(dHILinear, [e[1] for e in expected])
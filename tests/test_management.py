@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from aquacrop.classes import GwClass, IrrMngtClass, ParamStructClass
+from aquacrop.initialize import (
+    groundwater_depth,
+    read_clock_paramaters,
+    read_groundwater_table,
+    read_irrigation_management,
+)
+
+
+def _dense_constant_zGW(TimeSpan, dates, values):
+    # daily depths as built before the compressed representation
+    zGW = pd.Series(np.nan * np.ones(len(TimeSpan)), index=TimeSpan)
+    for row, (date, depth) in enumerate(zip(pd.DatetimeIndex(dates), values)):
+        zGW.loc[zGW.index >= date] = depth
+        if row == 0:
+            zGW.loc[zGW.index <= date] = depth
+    return zGW.values
+
+
+def test_constant_groundwater_steps():
+    ClockStruct = read_clock_paramaters("2000/01/01", "2001/12/31")
+    cases = [
+        (["2000/01/01"], [1.5]),
+        (["2000/03/01", "2000/09/01", "2001/02/01"], [2.0, 1.0, 2.0]),
+        # unsorted, repeated depths and dates outside the simulation
+        (["2000/06/01", "1999/01/01", "2000/06/01", "2003/01/01"], [1.0, 3.0, 3.0, 0.5]),
+        (["2000/05/01", "2000/05/02"], [1.2, 1.2]),
+    ]
+    for dates, values in cases:
+        ParamStruct = read_groundwater_table(
+            ParamStructClass(), GwClass("Y", dates=dates, values=values), ClockStruct
+        )
+        assert np.all(np.diff(ParamStruct.zGW_steps) > 0)
+        daily = [groundwater_depth(ParamStruct, t) for t in range(len(ClockStruct.TimeSpan))]
+        if len(dates) > 1:
+            expected = _dense_constant_zGW(ClockStruct.TimeSpan, dates, values)
+        else:
+            expected = np.full(len(ClockStruct.TimeSpan), values[0])
+        np.testing.assert_array_equal(daily, expected)
+
+    assert len(ParamStruct.zGW) == 1
+
+    ParamStruct = read_groundwater_table(ParamStructClass(), GwClass("N"), ClockStruct)
+    assert ParamStruct.WaterTable == 0 and len(ParamStruct.zGW) == 1
+
+
+def test_irrigation_schedule_events():
+    ClockStruct = read_clock_paramaters("2000/01/01", "2000/12/31")
+    schedule = pd.DataFrame(
+        {
+            "Date": pd.to_datetime(["2000/06/01", "1999/06/01", "2000/03/15", "2000/12/31"]),
+            "Depth": [30, 10, 25.5, 5],
+        }
+    )
+    IrrMngt = IrrMngtClass(IrrMethod=3, Schedule=schedule)
+    ParamStruct = read_irrigation_management(ParamStructClass(), IrrMngt, ClockStruct)
+
+    # dense daily schedule as built before
+    df = schedule.copy()
+    df.index = pd.DatetimeIndex(df.Date)
+    dense = df.reindex(ClockStruct.TimeSpan, fill_value=0).Depth.values.astype(float)
+
+    irr = ParamStruct.IrrMngt
+    np.testing.assert_array_equal(irr.ScheduleDays, np.flatnonzero(dense))
+    np.testing.assert_array_equal(irr.ScheduleDepths, dense[dense > 0])
+    # the input schedule is left unchanged
+    assert IrrMngt.Schedule is schedule
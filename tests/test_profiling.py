@@ -0,0 +1,174 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from aquacrop import solution_aot, timestep
+from aquacrop.classes import LOOP_COUNTERS
+from aquacrop.profiling import (
+    SOLUTION_STAGES,
+    KernelRecorder,
+    StageProfiler,
+    load_kernel_calls,
+    object_nbytes,
+    save_kernel_calls,
+)
+from aquacrop.validation import reference_model
+
+
+def test_profile_report():
+    solution = timestep.solution
+
+    models = []
+    for profile in [True, False]:
+        model = reference_model("tunis_wheat_gw15")
+        model.SimEndTime = "1982/05/31"
+        model.initialize(profile=profile)
+        model.step(till_termination=True)
+        models.append(model)
+    profiled, plain = models
+
+    # profiling does not change results or the module functions
+    assert timestep.solution is solution
+    pd.testing.assert_frame_equal(profiled.Outputs.Final, plain.Outputs.Final)
+    for name in ["Water", "Flux", "Growth"]:
+        np.testing.assert_array_equal(getattr(profiled.Outputs, name), getattr(plain.Outputs, name))
+
+    report = profiled.profile_report().set_index(["Section", "Name"])
+    # days simulated (off-season days are skipped)
+    ndays = report.loc[("step", "solution"), "Calls"]
+    assert 0 < ndays <= profiled.ClockStruct.TimeStepCounter + 1
+    assert report.loc[("step", "update_time"), "Calls"] == ndays
+    for stage in SOLUTION_STAGES.values():
+        assert report.loc[("stage", stage), "Calls"] == ndays
+    assert report.loc[("season", "reset_initial_conditions"), "Calls"] == 2
+    assert report.loc[("kernel", "_drainage"), "Calls"] == ndays
+    assert report.loc[("kernel", "_water_stress"), "Calls"] > 0
+
+    stages = report.loc["stage"]
+    assert np.isclose(stages.Time.sum(), report.loc[("step", "solution"), "Time"])
+
+    with pytest.raises(AssertionError):
+        plain.profile_report()
+
+
+def test_loop_counts():
+    models = []
+    for count_loops in [True, False]:
+        model = reference_model("paddyrice_hyderabad")
+        model.SimEndTime = "2002/12/31"
+        model.initialize(count_loops=count_loops)
+        model.step(till_termination=True)
+        models.append(model)
+    counted, plain = models
+
+    pd.testing.assert_frame_equal(counted.Outputs.Final, plain.Outputs.Final)
+    np.testing.assert_array_equal(counted.Outputs.Water, plain.Outputs.Water)
+
+    loops = counted.Outputs.Loops
+    assert list(loops.columns[2:]) == LOOP_COUNTERS
+    assert (loops[LOOP_COUNTERS] >= 0).all().all()
+    # only simulated days: the fallow days between seasons are skipped
+    assert loops.TimeStepCounter.is_unique and (loops.TimeStepCounter >= 0).all()
+    assert len(loops) < len(counted.ClockStruct.TimeSpan)
+    # bunded paddy fields back up water above saturated compartments
+    assert loops.DrainageExcess.sum() > 0
+    assert loops.TrExtraction.sum() > 0
+
+    seasons = counted.Outputs.SeasonLoops
+    assert list(seasons.index) == list(range(len(counted.Outputs.Final)))
+    np.testing.assert_array_equal(
+        seasons.sum().values, loops[loops.SeasonCounter >= 0][LOOP_COUNTERS].sum().values
+    )
+    assert len(plain.Outputs.Loops) == 0
+
+
+def test_memory_report():
+    model = reference_model("tunis_test_1")
+    model.SimEndTime = "1981/05/31"
+    model.initialize()
+    model.step(till_termination=True)
+
+    report = model.memory_report().set_index("Component").Bytes
+    assert report["weather"] >= model.weather.nbytes
+    assert report["outputs (Water)"] >= model.Outputs.Water.values.nbytes
+    assert (report >= 0).all()
+
+    # shared objects and views are counted once
+    a = np.zeros(1000)
+    assert object_nbytes([a, a[10:], a]) < 2 * a.nbytes
+    seen = set()
+    assert object_nbytes(a, seen) >= a.nbytes
+    assert object_nbytes({"a": a}, seen) < a.nbytes
+
+
+def test_profile_argument():
+    model = reference_model("tunis_wheat_gw15")
+    model.SimEndTime = "1980/05/31"
+    for profile in [1, "yes", object()]:
+        with pytest.raises(AssertionError, match="profile must be"):
+            model.initialize(profile=profile)
+
+    model.initialize(profile=np.True_)
+    assert isinstance(model.Profiler, StageProfiler)
+
+
+def test_kernel_recorder_roundtrip(tmp_path):
+    model = reference_model("paddyrice_hyderabad")
+    model.SimEndTime = "2001/12/31"
+    recorder = KernelRecorder(["_drainage", "_infiltration", "_HIref_current_day"])
+    model.initialize(profile=recorder)
+    model.step(till_termination=True)
+
+    report = model.profile_report().set_index("Name").Calls
+    assert report["_drainage"] > 0
+
+    for kernel, calls in recorder.calls.items():
+        path = tmp_path / f"{kernel}.npz"
+        save_kernel_calls(path, calls)
+        loaded = load_kernel_calls(path)
+        assert len(loaded) == len(calls)
+        for (args, result), (_, expected) in zip(loaded, calls):
+            replayed = getattr(solution_aot, kernel)(*args)
+            for value, value_expected in zip(replayed, expected):
+                assert np.asarray(value).tobytes() == np.asarray(value_expected).tobytes()
+
+
+@pytest.mark.parametrize("mode", ["sampling", "deterministic"])
+def test_flame_graph_export(tmp_path, mode):
+    from aquacrop.profile import main, profile_model, write_collapsed, write_speedscope
+
+    model = reference_model("tunis_wheat_gw15")
+    model.SimEndTime = "1981/05/31"
+    stacks = profile_model(model, mode, interval=0.0005)
+
+    assert len(stacks) > 0 and all(seconds >= 0 for seconds in stacks.values())
+    assert all(stack[0] == "aquacrop.core:AquaCropModel.step" for stack in stacks)
+    labels = {label for stack in stacks for label in stack}
+    assert any(label.startswith("[stage] ") for label in labels)
+    if mode == "deterministic":
+        # every stage and the kernels called directly by the daily calculation
+        for stage in SOLUTION_STAGES.values():
+            assert f"[stage] {stage}" in labels
+        assert "[kernel] _drainage" in labels
+
+    write_collapsed(tmp_path / "stacks.txt", stacks)
+    lines = (tmp_path / "stacks.txt").read_text().splitlines()
+    assert len(lines) > 0
+    for line in lines:
+        stack, weight = line.rsplit(" ", 1)
+        assert int(weight) > 0 and stack.split(";")[0] == "aquacrop.core:AquaCropModel.step"
+
+    write_speedscope(tmp_path / "stacks.json", stacks)
+    document = json.loads((tmp_path / "stacks.json").read_text())
+    frames = document["shared"]["frames"]
+    profile = document["profiles"][0]
+    assert len(profile["samples"]) == len(profile["weights"])
+    assert all(0 <= i < len(frames) for sample in profile["samples"] for i in sample)
+    assert np.isclose(profile["endValue"], sum(profile["weights"]))
+
+    if mode == "sampling":
+        output = tmp_path / "cli.collapsed"
+        assert main(["tunis_test_1", "--end", "1980/12/31", "--format", "collapsed", "-o", str(output)]) == 0
+        assert output.exists()
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from aquacrop.classes import CropClass, InitWCClass, SoilClass
+from aquacrop.core import AquaCropModel, get_filepath, prepare_weather
+from aquacrop.initialize import water_table_adjustment
+from aquacrop.solution_aot import _comp_above_depth, _comp_within_depth
+
+
+def test_depth_lookup_matches_scan():
+    wdf = prepare_weather(get_filepath("tunis_climate.txt"))
+    for soil in ["SandyLoam", "Paddy", "ac_TunisLocal"]:
+        model = AquaCropModel(
+            "1979/10/01",
+            "1980/05/31",
+            wdf,
+            SoilClass(soil),
+            CropClass("Wheat", PlantingDate="10/01"),
+            InitWCClass(value=["FC"]),
+        )
+        model.initialize()
+        prof = model.ParamStruct.Soil.Profile
+
+        depths = np.concatenate(
+            [
+                np.linspace(0, prof.dzsum[-1] + 0.5, 1001),
+                prof.dzsum,
+                np.nextafter(prof.dzsum, 0),
+                np.nextafter(prof.dzsum, 10),
+                np.round(np.arange(0.001, 0.5, 0.001), 3),
+            ]
+        )
+        for z in depths:
+            assert _comp_above_depth(prof, z) == np.sum(prof.dzsum < z)
+            assert _comp_within_depth(prof, z) == np.sum(prof.dzsum <= z)
+
+        np.testing.assert_array_equal(prof.Wfc_cum, np.cumsum(1000 * prof.th_fc * prof.dz))
+
+
+def test_water_table_adjustment_cache():
+    from aquacrop.classes import GwClass
+    from aquacrop.solution_aot import _check_groundwater_table
+
+    wdf = prepare_weather(get_filepath("tunis_climate.txt"))
+    model = AquaCropModel(
+        "1979/10/15",
+        "1981/05/31",
+        wdf,
+        SoilClass("SandyLoam"),
+        CropClass("Wheat", PlantingDate="10/15"),
+        InitWCClass(value=["FC"]),
+        Groundwater=GwClass(
+            "Y", "Variable", dates=["1979/10/15", "1981/05/31"], values=[2.0, 0.5]
+        ),
+    )
+    model.initialize()
+    ParamStruct = model.ParamStruct
+    prof = ParamStruct.Soil.Profile
+
+    # every depth of the run is precomputed
+    assert len(ParamStruct.zGW_adjustments) == len(np.unique(ParamStruct.zGW))
+
+    for zGW in list(ParamStruct.zGW[::50]) + [0.05, 3.0]:
+        th = prof.th_wp.copy()
+        expected, _ = _check_groundwater_table(prof, 0.0, th, prof.th_fc_Adj.copy(), 1, zGW)
+        th_fc_Adj, comp = water_table_adjustment(ParamStruct, zGW)
+        np.testing.assert_array_equal(th_fc_Adj, expected)
+        np.testing.assert_array_equal(th[comp:], prof.th_s[comp:])
+        np.testing.assert_array_equal(th[:comp], prof.th_wp[:comp])
+
+
+@pytest.mark.parametrize(
+    "case, end",
+    [
+        # net irrigation, water table, bunded paddy
+        ("tunis_test_6", "1981/07/30"),
+        ("tunis_wheat_gw15", "1981/05/31"),
+        ("paddyrice_hyderabad", "2001/12/31"),
+    ],
+)
+def test_root_zone_summary(monkeypatch, case, end):
+    from aquacrop import solution, timestep
+    from aquacrop.solution_aot import _root_zone_water
+    from aquacrop.validation import reference_model
+
+    shared = solution.root_zone_summary
+    calls = {"reads": 0, "scans": 0}
+
+    def scan(*args):
+        calls["scans"] += 1
+        return _root_zone_water(*args)
+
+    def read(prof, Soil_zTop, Crop, NewCond):
+        # every read matches a scan of the current soil water
+        calls["reads"] += 1
+        summary = shared(prof, Soil_zTop, Crop, NewCond)
+        fresh = _root_zone_water(prof, float(NewCond.Zroot), NewCond.th, Soil_zTop, float(Crop.Zmin), Crop.Aer)
+        assert summary == fresh
+        return summary
+
+    monkeypatch.setattr(solution, "_root_zone_water", scan)
+    monkeypatch.setattr(solution, "root_zone_summary", read)
+    monkeypatch.setattr(timestep, "root_zone_summary", read)
+
+    model = reference_model(case)
+    model.SimEndTime = end
+    model.initialize()
+    model.step(till_termination=True)
+
+    assert 0 < calls["scans"] < calls["reads"]
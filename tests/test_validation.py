@@ -0,0 +1,37 @@
+import numpy as np
+
+from aquacrop.validation import check_validation, main, read_reference_yields, validate_all
+
+
+def test_reference_yields_unequal_seasons():
+    # the matlab outputs end one season before the windows outputs
+    yields = read_reference_yields("tunis_test_2_long")
+    assert len(yields) == 23
+    assert yields.matlab.isna().sum() == 1 and yields.windows.notna().all()
+
+
+def test_validate_all(tmp_path):
+    report = validate_all(["paddyrice_hyderabad"], processes=1)
+    assert list(report.Case) == ["paddyrice_hyderabad"]
+    row = report.iloc[0]
+    assert row.Seasons == 11
+    assert 0 <= row.MAEWindows < 0.1 and 0 <= row.MAEMatlab < 0.1
+    assert row.Time > 0 and np.isclose(row.Score, row.Time / row.Calibration)
+
+    checked = check_validation(report, report)
+    assert not checked.AccuracyRegression.any() and not checked.SpeedRegression.any()
+
+    # scores are compared by default, seconds on request
+    baseline = report.copy()
+    baseline["MAEMatlab"] -= 0.01
+    baseline["Score"] /= 2
+    checked = check_validation(report, baseline, mae_tolerance=0.005, time_threshold=0.5)
+    assert checked.AccuracyRegression.all() and checked.SpeedRegression.all()
+    assert np.isclose(checked.BaselineScore.iloc[0], report.Score.iloc[0] / 2)
+    checked = check_validation(report, baseline, normalise=False)
+    assert not checked.SpeedRegression.any()
+
+    # the command line exits with status 1 on regressions
+    baseline_file = tmp_path / "baseline.json"
+    baseline.to_json(baseline_file, orient="records")
+    assert main(["paddyrice_hyderabad", "--processes", "1", "--baseline", str(baseline_file)]) == 1
@@ -0,0 +1,139 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from aquacrop.core import get_filepath, prepare_weather
+from aquacrop.initialize import read_clock_paramaters, read_weather_inputs
+from aquacrop.weather import WEATHER_DTYPE, load_weather_array
+
+
+def _prepare_weather_pandas(weatherFilePath):
+    # reference implementation: the original pandas based reader
+    weather_df = pd.read_csv(weatherFilePath, header=0, sep=r"\s+")
+    weather_df.columns = str("Day Month Year MinTemp MaxTemp Precipitation ReferenceET").split()
+    weather_df["Date"] = pd.to_datetime(weather_df[["Year", "Month", "Day"]])
+    weather_df = weather_df.drop(["Day", "Month", "Year"], axis=1)
+    weather_df["ReferenceET"] = weather_df.ReferenceET.clip(lower=0.1)
+    return weather_df
+
+
+def test_prepare_weather_matches_pandas():
+    for name in ["tunis_climate.txt", "hyderabad_climate.txt"]:
+        filepath = get_filepath(name)
+        pd.testing.assert_frame_equal(
+            prepare_weather(filepath), _prepare_weather_pandas(filepath)
+        )
+
+
+def test_weather_sidecar_cache(tmp_path):
+    filepath = str(tmp_path / "tunis_climate.txt")
+    shutil.copy(get_filepath("tunis_climate.txt"), filepath)
+
+    assert not isinstance(load_weather_array(filepath), np.memmap)
+    assert not os.path.exists(filepath + ".npy")
+
+    first = load_weather_array(filepath, cache=True)
+    assert os.path.exists(filepath + ".npy")
+    assert not isinstance(first, np.memmap)
+
+    second = load_weather_array(filepath, cache=True)
+    assert isinstance(second, np.memmap)
+    assert second.dtype == WEATHER_DTYPE
+    np.testing.assert_array_equal(first, second)
+
+    # a sidecar in a separate cache directory
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    load_weather_array(filepath, cache=True, cache_dir=str(cache_dir))
+    assert len(list(cache_dir.glob("tunis_climate.txt.*.npy"))) == 1
+
+    pd.testing.assert_frame_equal(
+        prepare_weather(filepath, cache=True), _prepare_weather_pandas(filepath)
+    )
+
+
+def test_weather_sidecar_cache_keys(tmp_path):
+    # files of the same name in different directories share a cache directory
+    cache_dir = str(tmp_path / "cache")
+    os.mkdir(cache_dir)
+    with open(get_filepath("tunis_climate.txt")) as f:
+        lines = f.readlines()
+    paths = []
+    for name, nlines in [("d1", len(lines)), ("d2", 50)]:
+        os.mkdir(tmp_path / name)
+        paths.append(str(tmp_path / name / "station.txt"))
+        with open(paths[-1], "w") as f:
+            f.writelines(lines[:nlines])
+    # d2 is older than the sidecar of d1
+    os.utime(paths[1], (0, 0))
+
+    long, short = [load_weather_array(path, cache=True, cache_dir=cache_dir) for path in paths]
+    assert len(long) == len(lines) - 1 and len(short) == 49
+    assert len(load_weather_array(paths[1], cache=True, cache_dir=cache_dir)) == 49
+
+    # a source changed after its sidecar was written, even to an older
+    # modification time, is parsed again
+    with open(paths[0], "w") as f:
+        f.writelines(lines[:11])
+    os.utime(paths[0], (0, 0))
+    assert len(load_weather_array(paths[0], cache=True, cache_dir=cache_dir)) == 10
+
+
+def test_read_weather_inputs_clip():
+    weather_df = prepare_weather(get_filepath("tunis_climate.txt"))
+    ClockStruct = read_clock_paramaters("1979/10/01", "1985/05/30")
+    clipped = read_weather_inputs(ClockStruct, weather_df)
+
+    mask = (weather_df.Date >= ClockStruct.SimulationStartDate) & (
+        weather_df.Date <= ClockStruct.SimulationEndDate
+    )
+    pd.testing.assert_frame_equal(clipped, weather_df[mask])
+    assert len(clipped) == ClockStruct.nSteps
+
+
+def test_weather_store(tmp_path):
+    import pickle
+
+    from aquacrop.classes import CropClass, InitWCClass, SoilClass
+    from aquacrop.core import AquaCropModel
+    from aquacrop.weather import StationWeather, WeatherStore
+
+    tunis = prepare_weather(get_filepath("tunis_climate.txt"))
+    store = WeatherStore.create(
+        tmp_path / "store",
+        {"tunis": tunis, "hyderabad": get_filepath("hyderabad_climate.txt")},
+    )
+    assert store.stations == ["tunis", "hyderabad"]
+
+    # views share memory with the store and match the source data
+    station = store.station("tunis", "1979/10/01", "1980/05/30")
+    assert np.shares_memory(station.values, store._values)
+    assert not station.values.flags.writeable
+    assert station.start_date == pd.Timestamp("1979/10/01")
+    assert station.end_date == pd.Timestamp("1980/05/30")
+    pd.testing.assert_frame_equal(store.to_df("tunis"), tunis)
+
+    # views are pickled by reference
+    clone = pickle.loads(pickle.dumps(station))
+    assert isinstance(clone, StationWeather)
+    assert len(pickle.dumps(station)) < 1000
+    np.testing.assert_array_equal(clone.values, station.values)
+
+    def run(wdf):
+        model = AquaCropModel(
+            SimStartTime="1979/10/01",
+            SimEndTime="1981/05/30",
+            wdf=wdf,
+            Soil=SoilClass(soilType="SandyLoam"),
+            Crop=CropClass("Wheat", PlantingDate="10/01"),
+            InitWC=InitWCClass(value=["FC"]),
+        )
+        model.initialize()
+        model.step(till_termination=True)
+        return model
+
+    model = run(store["tunis"])
+    assert np.shares_memory(model.weather, store._values)
+    pd.testing.assert_frame_equal(model.Outputs.Final, run(tunis).Outputs.Final)